@@ -0,0 +1,143 @@
+"""
+Board cache serialization benchmark
+
+Compares bytes stored and encode / decode time of the default `django-redis`
+pickle serializer with the compact ones, on synthetic board cache values.
+
+Usage:
+    PYTHONPATH=src python benchmarks/cache_serialization.py [--issues 2000]
+
+MessagePack results are only included if 'msgpack' package is installed.
+"""
+import argparse
+import random
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from django_redis.compressors.identity import IdentityCompressor
+from django_redis.serializers.pickle import PickleSerializer
+
+from zenboard import cache
+from zenboard.cache import MsgPackSerializer, ZlibCompressor
+
+
+CODECS = [
+    ('pickle', PickleSerializer, IdentityCompressor),
+    ('pickle + zlib', PickleSerializer, ZlibCompressor),
+    ('msgpack', MsgPackSerializer, IdentityCompressor),
+    ('msgpack + zlib', MsgPackSerializer, ZlibCompressor),
+]
+
+
+def synthetic_values(issues_count):
+    """Generate synthetic board cache values"""
+    now = datetime(2017, 11, 1, tzinfo=timezone.utc)
+    pipelines_names = [
+        'New Issues', 'Backlog', 'In Progress', 'Review', 'Done',
+    ]
+
+    filtered_issues = {
+        number: {
+            'number': number,
+            'title': 'Issue #{} with a reasonably long title'.format(number),
+            'state': random.choice(['open', 'closed']),
+        }
+        for number in range(1, issues_count + 1)
+    }
+
+    pipelines = [
+        {
+            'name': name,
+            'issues': [
+                dict(
+                    issue,
+                    is_epic=False,
+                    details_url='https://zenboard.example.com/api/boards/'
+                                'client-board/issues/{}/'.format(number),
+                )
+                for number, issue in filtered_issues.items()
+                if number % len(pipelines_names) == index
+            ],
+        }
+        for index, name in enumerate(pipelines_names)
+    ]
+
+    issue_details = {
+        'number': 1,
+        'title': 'Issue #1',
+        'author': 'octocat',
+        'assignee': 'octocat',
+        'state': 'open',
+        'labels': ['client', 'bug'],
+        'body': '<p>' + 'Issue description. ' * 50 + '</p>',
+        'created_at': now,
+        'updated_at': now + timedelta(days=1),
+        'closed_at': None,
+        'comments': [
+            {
+                'id': comment_id,
+                'url': 'https://github.com/owner/repo/issues/1#issuecomment-'
+                       '{}'.format(comment_id),
+                'body': '<p>' + 'Comment <strong>body</strong>. ' * 20 +
+                        '</p>',
+                'created_at': now,
+                'updated_at': now,
+            }
+            for comment_id in range(50)
+        ],
+        'progress': 50,
+    }
+
+    return {
+        'pipelines': {'value': pipelines, 'stale_at': None},
+        'filtered_issues': {'value': filtered_issues, 'stale_at': None},
+        'issue details': {'value': issue_details, 'stale_at': None},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--issues', type=int, default=2000)
+    parser.add_argument('--number', type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(0)
+    values = synthetic_values(args.issues)
+    options = {}
+
+    print('{:<16} {:<16} {:>12} {:>12} {:>12}'.format(
+        'value', 'codec', 'bytes', 'encode ms', 'decode ms',
+    ))
+    for name, value in values.items():
+        for codec, serializer_class, compressor_class in CODECS:
+            if serializer_class is MsgPackSerializer and not cache.msgpack:
+                continue
+
+            serializer = serializer_class(options)
+            compressor = compressor_class(options)
+
+            def encode():
+                return compressor.compress(serializer.dumps(value))
+
+            def decode():
+                try:
+                    data = compressor.decompress(encoded)
+                except Exception:
+                    data = encoded
+                return serializer.loads(data)
+
+            encoded = encode()
+            assert decode() == value
+
+            encode_time = timeit.timeit(encode, number=args.number)
+            decode_time = timeit.timeit(decode, number=args.number)
+
+            print('{:<16} {:<16} {:>12} {:>12.3f} {:>12.3f}'.format(
+                name, codec, len(encoded),
+                encode_time / args.number * 1000,
+                decode_time / args.number * 1000,
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Board pipelines assembly benchmark
+
+Compares `Board._get_pipelines` with the previous, per issue assembly (which
+resolved issue API endpoint URL and mutated cached issues data for every
+issue) on a synthetic board.
+
+Usage:
+    SECRET_KEY=... PYTHONPATH=src python benchmarks/pipelines_assembly.py \
+        [--issues 5000]
+"""
+import argparse
+import os
+import random
+import timeit
+from unittest import mock
+
+import django
+
+
+def synthetic_data(issues_count):
+    """Generate synthetic raw ZenHub board and filtered issues data"""
+    pipelines_names = [
+        'New Issues', 'Backlog', 'In Progress', 'Review', 'Done',
+    ]
+
+    filtered_issues = {
+        number: {
+            'number': number,
+            'title': 'Issue #{} with a reasonably long title'.format(number),
+            'state': random.choice(['open', 'closed']),
+        }
+        for number in range(1, issues_count + 1)
+    }
+
+    zenhub_board = {
+        'version': 1,
+        'pipelines': [
+            {
+                'name': name,
+                'issues': [
+                    {
+                        'issue_number': number,
+                        'position': position,
+                        'is_epic': number % 50 == 0,
+                    }
+                    for position, number in enumerate(range(
+                        index + 1, issues_count + 1, len(pipelines_names),
+                    ))
+                ],
+            }
+            for index, name in enumerate(pipelines_names)
+        ],
+    }
+
+    return zenhub_board, filtered_issues
+
+
+def legacy_get_pipelines(board, zenhub_board, filtered_issues):
+    """Previous `Board._get_pipelines` implementation"""
+    from boards.issues import BoardIssue
+
+    pipelines = list()
+    zenhub_pipelines = list(zenhub_board['pipelines'])
+
+    if board.show_closed_pipeline:
+        zenhub_pipelines.append({
+            'name': 'Closed',
+            'issues': [
+                {'issue_number': issue_number}
+                for issue_number, issue in filtered_issues.items()
+                if issue['state'] == 'closed'
+            ],
+        })
+
+    for pipeline in zenhub_pipelines:
+        pipeline_issues = list()
+        for issue in pipeline['issues']:
+            issue_number = issue['issue_number']
+
+            if issue_number not in filtered_issues:
+                continue
+
+            if not board.include_epics and issue.get('is_epic', False):
+                continue
+
+            issue_data = filtered_issues[issue_number]
+            issue_data['is_epic'] = issue.get('is_epic', False)
+            issue_data['details_url'] = BoardIssue(
+                board=board, issue_number=issue_number,
+            ).get_api_endpoint()
+
+            pipeline_issues.append(issue_data)
+
+        pipelines.append({
+            'name': pipeline['name'],
+            'issues': pipeline_issues
+        })
+
+    return pipelines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--issues', type=int, default=5000)
+    parser.add_argument('--number', type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'zenboard.settings')
+    django.setup()
+
+    from django.contrib.sites.models import Site
+
+    from boards.models import Board
+    from boards.repositories import Repository
+
+    random.seed(0)
+    zenhub_board, filtered_issues = synthetic_data(args.issues)
+    board = Board(pk=1, github_repository='owner/repo')
+
+    # Only the assembly itself is measured, without any cache or database
+    # access (Django caches current site anyway)
+    site = Site(domain='zenboard.example.com')
+    with mock.patch.object(Site.objects, 'get_current', return_value=site), \
+            mock.patch.object(Repository, 'zenhub_board',
+                              return_value=zenhub_board), \
+            mock.patch.object(Repository, 'filtered_issues',
+                              side_effect=lambda **kwargs: {
+                                  number: dict(issue) for number, issue
+                                  in filtered_issues.items()
+                              }):
+        def legacy():
+            return legacy_get_pipelines(
+                board, zenhub_board, board.filtered_issues(),
+            )
+
+        assert legacy() == board._get_pipelines()
+
+        print('{:<12} {:>12}'.format('assembly', 'ms'))
+        for name, function in [
+                ('legacy', legacy), ('current', board._get_pipelines)]:
+            duration = timeit.timeit(function, number=args.number)
+            print('{:<12} {:>12.3f}'.format(
+                name, duration / args.number * 1000,
+            ))
+
+
+if __name__ == '__main__':
+    main()
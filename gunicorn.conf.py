@@ -0,0 +1,23 @@
+"""
+Gunicorn config
+
+Board live updates streams (see `boards.views.BoardEventsView`) stay open for
+minutes, so requests are served by gevent workers, where an open stream only
+holds a greenlet (and not one of a few worker threads).
+"""
+pythonpath = 'src'
+
+worker_class = 'gevent'
+
+# Maximum number of simultaneous clients (including open streams) per worker
+worker_connections = 1000
+
+
+def post_fork(server, worker):
+    """
+    Make psycopg2 cooperative, so database queries don't block the whole
+    worker.
+    """
+    from psycogreen.gevent import patch_psycopg
+
+    patch_psycopg()
@@ -4,6 +4,7 @@ boards module Django Admin integration
 from django.contrib import admin
 
 from boards import models
+from boards.repositories import Repository
 
 
 @admin.register(models.Board)
@@ -21,8 +22,43 @@ class BoardAdmin(admin.ModelAdmin):
     )
     prepopulated_fields = {'slug': ('name',)}
     search_fields = ('name', 'github_repository')
+    actions = ('reset_cache',)
 
     def get_users(self, obj):
         """Helper method for getting a string of whitelisted users"""
         users = [str(u) for u in obj.whitelisted_users.all()]
         return ', '.join(users) or '-'
+
+    def reset_cache(self, request, queryset):
+        """
+        Admin action for resetting selected boards cache, together with
+        their (shared with other boards) repositories cache and snapshots.
+        """
+        repositories = set()
+        for board in queryset:
+            board.invalidate_cache()
+            repositories.add(board.repository.full_name)
+
+        for full_name in repositories:
+            Repository(full_name).invalidate_cache()
+
+        self.message_user(
+            request,
+            "Reset cache of {boards} board(s) and {repositories} "
+            "repository(ies).".format(
+                boards=len(queryset),
+                repositories=len(repositories),
+            ),
+        )
+    reset_cache.short_description = "Reset cache (including repositories)"
+
+
+@admin.register(models.RepositorySnapshot)
+class RepositorySnapshotAdmin(admin.ModelAdmin):
+    """
+    Django Admin integration for `boards.RepositorySnapshot` model.
+    """
+    list_display = ('pk', 'github_repository', 'resource', 'modified')
+    list_filter = ('github_repository', 'modified')
+    search_fields = ('github_repository', 'resource')
+    exclude = ('data',)
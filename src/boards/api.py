@@ -1,11 +1,18 @@
 """
 boards module API views
 """
+from http import HTTPStatus
+
 from django.http import Http404
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
 from rest_framework import viewsets
 from rest_framework.decorators import detail_route
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
+from boards import changes
+from boards.caching import get_etag_entry, is_stale, make_etag
 from boards.issues import BoardIssue
 from boards.models import Board
 from boards.serializers import BoardSerializer
@@ -15,15 +22,29 @@ class BoardViewSet(viewsets.ReadOnlyModelViewSet):
     """
     This endpoint returns boards available to currently logged in user.
 
-    It's readonly and has four simple methods:
+    It's readonly and has five simple methods:
 
     - `/`: Returns a list of boards available to currently logged in user.
     - `/:pk/`: Returns specified board details.
-    - `/:pk/pipelines/`: Returns board pipelines details.
+    - `/:pk/pipelines/`: Returns board pipelines details. With `since`
+      parameter, returns only changes since passed version (see below).
     - `/:pk/issue/:issue_number/`: Returns board issue details.
+    - `/:pk/issues/?numbers=1,2,3`: Returns multiple board issues details,
+      keyed by issue number.
+
+    Board pipelines and issue details responses have strong ETags, so they
+    can be requested conditionally, with `If-None-Match` header.
+
+    Board pipelines can also be polled incrementally - `?since=0` returns
+    a full snapshot together with its `version`, and `?since=<version>`
+    returns only `changes` since then (or a full snapshot, if they aren't
+    available anymore).
     """
     serializer_class = BoardSerializer
 
+    # Maximum number of issues that can be requested at once
+    max_issues = 250
+
     def get_queryset(self):
         """
         Filter the boards queryset and only return user available boards.
@@ -39,6 +60,60 @@ class BoardViewSet(viewsets.ReadOnlyModelViewSet):
 
         return qs
 
+    def get_cached_response(self, cache_key, load):
+        """
+        Helper method for creating a response with cached data and its
+        cached ETag, which clients have to revalidate every time.
+
+        If the data didn't change since client last requested it, it isn't
+        sent again. It isn't even read, unless it's stale - then it's
+        refreshed in the background like when it's served.
+
+        The ETag is read before the data, so it's never newer than the data
+        (at worst, unchanged data is sent again).
+
+        :param cache_key: cache key of the data
+        :type cache_key: str
+        :param load: callable that reads the data
+        :type load: callable
+        :returns: response
+        :rtype: rest_framework.response.Response
+        """
+        entry = get_etag_entry(cache_key)
+        if entry is None:
+            return self.get_conditional_response(load())
+
+        etag = quote_etag(entry['value'])
+        if_none_match = self.request.META.get('HTTP_IF_NONE_MATCH', '')
+        if etag not in parse_etags(if_none_match):
+            return self.get_conditional_response(load(), etag=etag)
+
+        if is_stale(entry):
+            load()
+
+        response = Response(status=HTTPStatus.NOT_MODIFIED)
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+
+        return response
+
+    def get_conditional_response(self, data, etag=None):
+        """
+        Helper method for creating a response with an ETag, which clients
+        have to revalidate every time.
+
+        :param data: response data
+        :param etag: quoted response data ETag (computed if not passed)
+        :type etag: str
+        :returns: response
+        :rtype: rest_framework.response.Response
+        """
+        response = Response(data)
+        response['ETag'] = etag or quote_etag(make_etag(data))
+        patch_cache_control(response, private=True, no_cache=True)
+
+        return response
+
     def list(self, request, *args, **kwargs):
         """
         Returns a list of boards available to currently logged in user.
@@ -58,15 +133,35 @@ class BoardViewSet(viewsets.ReadOnlyModelViewSet):
 
         Uses cached data by default - to force refresh you can pass a
         `force_refresh` GET parameter.
+
+        If `since` GET parameter is passed, only changes since that version
+        are returned (if available).
         """
         board = self.get_object()
 
         # Check if user wants to force refresh
         if 'force_refresh' in self.request.GET:
-            board.invalidate_cache('filtered_issues')
-            board.invalidate_cache('pipelines')
+            board.refresh_cache('filtered_issues', 'pipelines')
+
+        if 'since' in self.request.GET:
+            try:
+                since = int(self.request.GET['since'])
+            except ValueError:
+                raise ValidationError({
+                    'since': "A valid integer is required.",
+                })
+
+            # Make sure that the latest changes are recorded
+            board.pipelines()
+
+            return self.get_conditional_response(
+                changes.get_changes(board, since) or
+                changes.get_snapshot(board)
+            )
 
-        return Response(board.pipelines())
+        return self.get_cached_response(
+            board.get_cache_key('pipelines'), board.pipelines,
+        )
 
     @detail_route(methods=['get'], suffix='issue details',
                   url_name='issue', url_path='issue/(?P<issue_number>\d+)')
@@ -83,12 +178,47 @@ class BoardViewSet(viewsets.ReadOnlyModelViewSet):
 
         # Check if user wants to force refresh
         if 'force_refresh' in self.request.GET:
-            board.invalidate_cache('filtered_issues')
-            issue.invalidate_cache()
+            board.refresh_cache('filtered_issues', issue.get_cache_resource())
 
         # User should only be able to access the issue data if he has access
         # to a board that this issue belongs to
-        if issue_number not in board.filtered_issues():
+        if issue_number not in board.issue_numbers():
             raise Http404
 
-        return Response(issue.details())
+        return self.get_cached_response(issue.get_cache_key(), issue.details)
+
+    @detail_route(methods=['get'], suffix='issues details')
+    def issues(self, request, pk=None):
+        """
+        Returns multiple board issues details, keyed by issue number. Issue
+        numbers are passed as a comma separated `numbers` GET parameter.
+
+        Issues that don't belong to the board are skipped. Cached details
+        are read in one batch and missing ones are fetched concurrently.
+        """
+        board = self.get_object()
+
+        try:
+            issue_numbers = {
+                int(number)
+                for number in self.request.GET.get('numbers', '').split(',')
+                if number.strip()
+            }
+        except ValueError:
+            raise ValidationError({
+                'numbers': "A comma separated list of integers is required.",
+            })
+
+        if len(issue_numbers) > self.max_issues:
+            raise ValidationError({
+                'numbers': "At most {max} issues can be requested at "
+                           "once.".format(max=self.max_issues),
+            })
+
+        # User should only be able to access the issues data if he has access
+        # to a board that these issues belong to
+        issue_numbers &= set(board.issue_numbers())
+
+        issues_details = BoardIssue.details_many(board, sorted(issue_numbers))
+
+        return self.get_conditional_response(issues_details)
@@ -0,0 +1,581 @@
+"""
+boards module cache related helpers
+"""
+import hashlib
+import json
+import logging
+import time
+from contextlib import contextmanager
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+
+from redis.exceptions import LockError
+
+from boards.local_cache import local_cache
+from zenboard.utils import call_concurrently, upstream_executor
+
+
+logger = logging.getLogger(__name__)
+
+# How often should we check whether someone else finished computing the value
+LOCK_POLL_INTERVAL = 0.1
+
+# How long should we wait for the lock when updating cached values in place
+UPDATE_LOCK_TIMEOUT = 1
+
+
+def get_lock_key(key):
+    """
+    Helper function for generating a lock key for passed cache key.
+
+    :param key: cache key
+    :type key: str
+    :returns: lock cache key
+    :rtype: str
+    """
+    return 'lock:{key}'.format(key=key)
+
+
+def get_lock(key):
+    """
+    Helper function for getting a Redis lock for passed cache key.
+
+    :param key: cache key
+    :type key: str
+    :returns: Redis lock
+    :rtype: redis.lock.Lock
+    """
+    return cache.lock(
+        get_lock_key(key),
+        timeout=settings.BOARDS_CACHE_LOCK_TIMEOUT,
+        sleep=LOCK_POLL_INTERVAL,
+    )
+
+
+def release_lock(lock):
+    """
+    Helper function for releasing a Redis lock that could have already
+    expired.
+
+    :param lock: Redis lock
+    :type lock: redis.lock.Lock
+    """
+    try:
+        lock.release()
+    except LockError:
+        logger.warning(
+            "Lock '{}' expired before it was released".format(lock.name)
+        )
+
+
+def get_timeout():
+    """
+    Helper function for getting board cache entries timeout. Cache keys are
+    versioned with generation numbers, so entries from old generations are
+    never read (or deleted) again - that's why they always have to expire.
+
+    :returns: cache timeout
+    :rtype: int
+    """
+    return settings.BOARDS_CACHE_TIMEOUT or settings.BOARDS_CACHE_MAX_TIMEOUT
+
+
+def get_generation_key(namespace):
+    """
+    Helper function for generating a generation number key for passed cache
+    keys namespace.
+
+    :param namespace: cache keys namespace
+    :type namespace: str
+    :returns: generation number cache key
+    :rtype: str
+    """
+    return 'gen:{namespace}'.format(namespace=namespace)
+
+
+def get_generation(namespace):
+    """
+    Get current generation number of passed cache keys namespace.
+
+    New counters start from current timestamp, so generation numbers used
+    before the counter was lost (i.e. evicted) aren't reused.
+
+    :param namespace: cache keys namespace
+    :type namespace: str
+    :returns: generation number
+    :rtype: int
+    """
+    key = get_generation_key(namespace)
+
+    generation = local_cache.get(key)
+    if generation is not None:
+        return generation
+
+    epoch = local_cache.epoch
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, int(time.time()), timeout=None)
+        generation = cache.get(key)
+
+    local_cache.set(key, generation, epoch)
+
+    return generation
+
+
+def bump_generation(namespace):
+    """
+    Bump generation number of passed cache keys namespace, which invalidates
+    all its cache entries at once.
+
+    :param namespace: cache keys namespace
+    :type namespace: str
+    :returns: new generation number
+    :rtype: int
+    """
+    key = get_generation_key(namespace)
+
+    try:
+        generation = cache.incr(key)
+    except ValueError:
+        generation = None
+
+    local_cache.invalidate(key)
+
+    return generation or get_generation(namespace)
+
+
+def get_etag_key(key):
+    """
+    Helper function for generating an ETag key for passed cache key.
+
+    :param key: cache key
+    :type key: str
+    :returns: ETag cache key
+    :rtype: str
+    """
+    return 'etag:{key}'.format(key=key)
+
+
+def make_etag(value):
+    """
+    Helper function for generating a strong ETag for passed value. It's
+    a hash of the value JSON representation, so it's the same for the same
+    content, regardless of where it was read from.
+
+    :param value: value that's going to be sent in the response
+    :returns: ETag
+    :rtype: str
+    """
+    content = json.dumps(value, cls=DjangoJSONEncoder, sort_keys=True)
+    return hashlib.sha1(content.encode()).hexdigest()
+
+
+def get_etag_entry(key):
+    """
+    Get ETag of cached value, without reading (and deserializing) the value
+    itself. It's wrapped in a cache entry with the same soft expiry time as
+    the value, so it's known whether the value is stale (see `pack`).
+
+    :param key: cache key
+    :type key: str
+    :returns: ETag cache entry (if available)
+    :rtype: dict or None
+    """
+    return cache.get(get_etag_key(key))
+
+
+def get_etag(key):
+    """
+    Get ETag of cached value, without reading (and deserializing) the value
+    itself.
+
+    :param key: cache key
+    :type key: str
+    :returns: ETag (if available)
+    :rtype: str or None
+    """
+    entry = get_etag_entry(key)
+    return entry['value'] if entry is not None else None
+
+
+def get_etags(keys):
+    """
+    Batched version of `get_etag`.
+
+    :param keys: cache keys
+    :type keys: list of str
+    :returns: ETags (if available), keyed by cache keys
+    :rtype: dict
+    """
+    entries = cache.get_many([get_etag_key(key) for key in keys])
+
+    etags = dict()
+    for key in keys:
+        entry = entries.get(get_etag_key(key))
+        etags[key] = entry['value'] if entry is not None else None
+
+    return etags
+
+
+def pack(value, stale=False):
+    """
+    Helper function for wrapping a value in a cache entry, which also holds
+    its soft expiry time (if `BOARDS_CACHE_SOFT_TIMEOUT` is set).
+
+    :param value: cached value
+    :param stale: whether the value is already stale
+    :type stale: bool
+    :returns: cache entry
+    :rtype: dict
+    """
+    soft_timeout = settings.BOARDS_CACHE_SOFT_TIMEOUT
+
+    if stale:
+        stale_at = 0
+    elif soft_timeout:
+        stale_at = time.time() + soft_timeout
+    else:
+        stale_at = None
+
+    return {
+        'value': value,
+        'stale_at': stale_at,
+    }
+
+
+def is_stale(entry):
+    """
+    Helper function for checking if a cache entry passed its soft expiry time.
+
+    :param entry: cache entry
+    :type entry: dict
+    :returns: whether the cache entry is stale
+    :rtype: bool
+    """
+    return entry['stale_at'] is not None and entry['stale_at'] < time.time()
+
+
+def set_value(key, value, stale=False, etag=False):
+    """
+    Cache passed value (optionally together with its ETag) with board cache
+    timeouts.
+
+    ETags are only needed for values that are served to clients (i.e.
+    pipelines and issue details), so computing them is opt in.
+
+    :param key: cache key
+    :type key: str
+    :param value: value to cache
+    :param stale: whether the value is already stale
+    :type stale: bool
+    :param etag: whether to also cache the value ETag
+    :type etag: bool
+    """
+    entry = pack(value, stale=stale)
+
+    entries = {key: entry}
+    if etag:
+        entries[get_etag_key(key)] = dict(entry, value=make_etag(value))
+
+    cache.set_many(entries, timeout=get_timeout())
+    local_cache.invalidate(key)
+
+
+def delete_value(key):
+    """
+    Delete cached value.
+
+    :param key: cache key
+    :type key: str
+    """
+    cache.delete_many([key, get_etag_key(key)])
+    local_cache.invalidate(key)
+
+
+def get_value(key):
+    """
+    Get cached value, without computing it if it's missing and regardless of
+    whether it's stale.
+
+    :param key: cache key
+    :type key: str
+    :returns: cached value (if available)
+    """
+    entry = cache.get(key)
+    return entry['value'] if entry is not None else None
+
+
+def compute(key, default, restore=None, etag=False):
+    """
+    Compute a value and cache it, making sure that only one process at a time
+    does that. If someone else is already computing it, we wait for the
+    result instead. If it doesn't show up in `BOARDS_CACHE_LOCK_TIMEOUT`
+    seconds, we give up on waiting and compute it ourselves.
+
+    If the value can be restored (i.e. from a persistent snapshot), it's
+    cached as stale and recomputed in the background instead.
+
+    :param key: cache key
+    :type key: str
+    :param default: callable that returns the value
+    :type default: callable
+    :param restore: callable that returns the last known value (if
+        available)
+    :type restore: callable
+    :param etag: whether to also cache the value ETag
+    :type etag: bool
+    :returns: computed value
+    """
+    deadline = time.monotonic() + settings.BOARDS_CACHE_LOCK_TIMEOUT
+
+    while True:
+        lock = get_lock(key)
+        if lock.acquire(blocking=False):
+            restored = None
+            try:
+                # Someone could have cached it just before we got the lock
+                entry = cache.get(key)
+                if entry is not None and not is_stale(entry):
+                    return entry['value']
+
+                if restore and entry is None:
+                    restored = restore()
+                if restored is not None:
+                    set_value(key, restored, stale=True, etag=etag)
+                    return restored
+
+                value = default()
+                set_value(key, value, etag=etag)
+
+                return value
+            finally:
+                release_lock(lock)
+
+                if restored is not None:
+                    revalidate(key, default, etag=etag)
+
+        if time.monotonic() > deadline:
+            logger.warning(
+                "Timed out waiting for '{}' cache key value".format(key)
+            )
+            value = default()
+            set_value(key, value, etag=etag)
+
+            return value
+
+        time.sleep(LOCK_POLL_INTERVAL)
+
+        entry = cache.get(key)
+        if entry is not None:
+            return entry['value']
+
+
+def revalidate(key, default, etag=False):
+    """
+    Recompute a stale value in the background, unless someone else is already
+    doing that.
+
+    :param key: cache key
+    :type key: str
+    :param default: callable that returns the value
+    :type default: callable
+    :param etag: whether to also cache the value ETag
+    :type etag: bool
+    """
+    def refresh():
+        lock = get_lock(key)
+        if not lock.acquire(blocking=False):
+            return
+
+        try:
+            set_value(key, default(), etag=etag)
+        except Exception:
+            logger.exception(
+                "Background refresh of '{}' cache key failed".format(key)
+            )
+        finally:
+            release_lock(lock)
+            connection.close()
+
+    upstream_executor.submit(refresh)
+
+
+def get_or_set(key, default, local=False, restore=None, etag=False):
+    """
+    Single flight, stale while revalidate version of Django's
+    `cache.get_or_set`.
+
+    If the value isn't cached, only one process computes it while everyone
+    else waits for the result, instead of all of them computing it at the
+    same time. If the value is stale, it's returned right away and one
+    background refresh is triggered.
+
+    :param key: cache key
+    :type key: str
+    :param default: callable that returns the value
+    :type default: callable
+    :param local: whether to also cache the value in process (see
+        `boards.local_cache`), in which case it can't be mutated
+    :type local: bool
+    :param restore: callable that returns the last known value (if
+        available), used when the value isn't cached
+    :type restore: callable
+    :param etag: whether to also cache the value ETag
+    :type etag: bool
+    :returns: cached (if possible) value
+    """
+    return get_or_set_many(
+        defaults={key: default},
+        local=local,
+        restores={key: restore} if restore else None,
+        etag=etag,
+    )[key]
+
+
+def get_or_set_many(defaults, local=False, restores=None, etag=False):
+    """
+    Batched version of `get_or_set`. Cached values are read in one batch and
+    missing ones are computed concurrently.
+
+    :param defaults: callables that return the values, keyed by cache keys
+    :type defaults: dict
+    :param local: whether to also cache the values in process (see
+        `boards.local_cache`), in which case they can't be mutated
+    :type local: bool
+    :param restores: callables that return the last known values (if
+        available), used when the values aren't cached, keyed by cache keys
+    :type restores: dict
+    :param etag: whether to also cache the values ETags
+    :type etag: bool
+    :returns: cached (if possible) values, keyed by cache keys
+    :rtype: dict
+    """
+    restores = restores or dict()
+
+    entries = local_cache.get_many(defaults.keys()) if local else dict()
+
+    remote_keys = [key for key in defaults if key not in entries]
+    if remote_keys:
+        epoch = local_cache.epoch
+        remote_entries = cache.get_many(remote_keys)
+
+        if local:
+            for key, entry in remote_entries.items():
+                local_cache.set(key, entry, epoch)
+
+        entries.update(remote_entries)
+
+    values = dict()
+    missing = list()
+    for key, default in defaults.items():
+        if key not in entries:
+            missing.append(key)
+            continue
+
+        values[key] = entries[key]['value']
+        if is_stale(entries[key]):
+            revalidate(key, default, etag=etag)
+
+    if len(missing) == 1:
+        key = missing[0]
+        values[key] = compute(
+            key, defaults[key], restores.get(key), etag=etag,
+        )
+    elif missing:
+        # Computing values can use the database (i.e. snapshots), so it's
+        # run the same way as other concurrent upstream calls
+        values.update(zip(missing, call_concurrently(*(
+            partial(compute, key, defaults[key], restores.get(key), etag=etag)
+            for key in missing
+        ))))
+
+    return values
+
+
+def refresh_value(key, default, etag=False):
+    """
+    Recompute and cache a value, without invalidating the current one first,
+    so everyone else can still use it in the meantime. Concurrent refreshes
+    collapse into one.
+
+    :param key: cache key
+    :type key: str
+    :param default: callable that returns the value
+    :type default: callable
+    :param etag: whether to also cache the value ETag
+    :type etag: bool
+    :returns: refreshed value
+    """
+    with single_flight(key) as acquired:
+        if acquired:
+            value = default()
+            set_value(key, value, etag=etag)
+
+            return value
+
+    return get_or_set(key, default, etag=etag)
+
+
+def update_value(key, update, etag=False):
+    """
+    Update cached value in place (if it's cached at all), making sure that
+    no one else is computing or updating it at the same time.
+
+    We don't wait for the lock for long, as this is meant to be used for
+    cheap updates that have a fallback - i.e. refetching the data.
+
+    :param key: cache key
+    :type key: str
+    :param update: callable that takes current value and returns updated one
+    :type update: callable
+    :param etag: whether to also cache the value ETag
+    :type etag: bool
+    :returns: whether the cache is up to date, which is only `False` if we
+        couldn't get the lock in time
+    :rtype: bool
+    """
+    lock = get_lock(key)
+    if not lock.acquire(blocking=True, blocking_timeout=UPDATE_LOCK_TIMEOUT):
+        return False
+
+    try:
+        entry = cache.get(key)
+        if entry is not None:
+            set_value(key, update(entry['value']), etag=etag)
+
+        return True
+    finally:
+        release_lock(lock)
+
+
+@contextmanager
+def single_flight(key):
+    """
+    Context manager that makes sure the wrapped block is executed by only one
+    process at a time. It yields whether the lock was acquired; if it wasn't,
+    it first waits for the current lock holder to finish.
+
+    :param key: cache key
+    :type key: str
+    :returns: whether the lock was acquired
+    :rtype: bool
+    """
+    lock = get_lock(key)
+
+    if lock.acquire(blocking=False):
+        try:
+            yield True
+        finally:
+            release_lock(lock)
+    else:
+        # Wait for the current lock holder to finish
+        if lock.acquire(
+                blocking=True,
+                blocking_timeout=settings.BOARDS_CACHE_LOCK_TIMEOUT):
+            release_lock(lock)
+
+        yield False
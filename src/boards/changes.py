@@ -0,0 +1,276 @@
+"""
+boards module pipelines change log related code
+
+Every time board pipelines are rebuilt, they're compared with the last
+recorded state and the differences are appended to a bounded, per board
+change log. Each change gets its own, monotonically increasing version, so
+clients can only fetch what changed since the version they already have.
+
+Changes describe the new state (and not how to get there), so applying the
+same change twice is harmless.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from boards.caching import (
+    UPDATE_LOCK_TIMEOUT, get_lock, get_timeout, release_lock,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_log_key(board):
+    """
+    Helper function for getting board change log cache key. It's not part of
+    any cache generation, as the log outlives cache invalidations.
+
+    :param board: board instance
+    :type board: boards.models.Board
+    :returns: board change log cache key
+    :rtype: str
+    """
+    return '{namespace}:changes'.format(namespace=board.get_cache_namespace())
+
+
+def get_state_key(board):
+    """
+    Helper function for getting board last recorded pipelines cache key.
+
+    :param board: board instance
+    :type board: boards.models.Board
+    :returns: board last recorded pipelines cache key
+    :rtype: str
+    """
+    return '{namespace}:changes:state'.format(
+        namespace=board.get_cache_namespace(),
+    )
+
+
+def get_version_key(board):
+    """
+    Helper function for getting board last recorded pipelines version cache
+    key, so the version can be read without the pipelines data.
+
+    :param board: board instance
+    :type board: boards.models.Board
+    :returns: board last recorded pipelines version cache key
+    :rtype: str
+    """
+    return '{namespace}:changes:version'.format(
+        namespace=board.get_cache_namespace(),
+    )
+
+
+def diff_pipelines(old, new):
+    """
+    Get changes between two versions of board pipelines data.
+
+    Changes have one of the following types:
+
+    - 'removed': issue is no longer on the board
+    - 'added': issue was added to the board (with its data and pipeline)
+    - 'moved': issue was moved to another pipeline
+    - 'updated': issue data (i.e. title or state) changed
+    - 'reordered': pipeline issues (or their order) changed
+
+    :param old: previous board pipelines data
+    :type old: list
+    :param new: current board pipelines data
+    :type new: list
+    :returns: changes, or `None` if pipelines themselves changed
+    :rtype: list of dict or None
+    """
+    if [p['name'] for p in old] != [p['name'] for p in new]:
+        return None
+
+    old_issues = {
+        issue['number']: (pipeline['name'], issue)
+        for pipeline in old for issue in pipeline['issues']
+    }
+
+    new_numbers = set()
+    changes = list()
+    reordered = list()
+
+    for old_pipeline, pipeline in zip(old, new):
+        numbers = [issue['number'] for issue in pipeline['issues']]
+        new_numbers.update(numbers)
+
+        for issue in pipeline['issues']:
+            if issue['number'] not in old_issues:
+                changes.append({
+                    'type': 'added',
+                    'number': issue['number'],
+                    'pipeline': pipeline['name'],
+                    'issue': issue,
+                })
+                continue
+
+            old_pipeline_name, old_issue = old_issues[issue['number']]
+            if old_pipeline_name != pipeline['name']:
+                changes.append({
+                    'type': 'moved',
+                    'number': issue['number'],
+                    'from_pipeline': old_pipeline_name,
+                    'to_pipeline': pipeline['name'],
+                })
+            if old_issue != issue:
+                changes.append({
+                    'type': 'updated',
+                    'number': issue['number'],
+                    'issue': issue,
+                })
+
+        if numbers != [issue['number'] for issue in old_pipeline['issues']]:
+            reordered.append({
+                'type': 'reordered',
+                'pipeline': pipeline['name'],
+                'issues': numbers,
+            })
+
+    removed = [
+        {'type': 'removed', 'number': number}
+        for number in sorted(old_issues.keys() - new_numbers)
+    ]
+
+    return removed + changes + reordered
+
+
+def record(board, pipelines):
+    """
+    Record changes between the last recorded and passed board pipelines
+    data. If the log was lost (or the pipelines themselves changed), it's
+    started again, with a version higher than any of the previous ones.
+
+    It's safe to skip recording (i.e. if someone else is recording at the
+    same time), as changes are always computed against the last recorded
+    state.
+
+    :param board: board instance
+    :type board: boards.models.Board
+    :param pipelines: current board pipelines data
+    :type pipelines: list
+    :returns: last recorded state (if available)
+    :rtype: dict or None
+    """
+    log_key = get_log_key(board)
+    state_key = get_state_key(board)
+
+    lock = get_lock(log_key)
+    if not lock.acquire(blocking=True, blocking_timeout=UPDATE_LOCK_TIMEOUT):
+        logger.warning(
+            "Couldn't record pipelines changes for {!r}".format(board)
+        )
+        return None
+
+    try:
+        state = cache.get(state_key)
+        log = cache.get(log_key)
+
+        changes = None
+        if state is not None and log is not None:
+            changes = diff_pipelines(state['pipelines'], pipelines)
+
+        if changes is None:
+            # Versions have to be higher than the ones clients already have
+            # even if the log was lost, so the new one starts with a timestamp
+            versions = [
+                data['version'] for data in (state, log) if data is not None
+            ]
+            version = max([int(time.time())] + [v + 1 for v in versions])
+            log = {'version': version, 'start': version, 'changes': []}
+        elif not changes:
+            return state
+        else:
+            for change in changes:
+                log['version'] += 1
+                change['version'] = log['version']
+
+            log['changes'] = log['changes'] + changes
+
+            # Clients that are further behind than that get a full snapshot
+            max_length = settings.BOARDS_CHANGE_LOG_MAX_LENGTH
+            if len(log['changes']) > max_length:
+                log['start'] = log['changes'][-max_length - 1]['version']
+                log['changes'] = log['changes'][-max_length:]
+
+        state = {'version': log['version'], 'pipelines': pipelines}
+        cache.set_many(
+            {
+                state_key: state,
+                log_key: log,
+                get_version_key(board): state['version'],
+            },
+            timeout=get_timeout(),
+        )
+
+        return state
+    finally:
+        release_lock(lock)
+
+
+def get_changes(board, since):
+    """
+    Get board pipelines changes since passed version. Only the change log
+    is read, without the board pipelines data.
+
+    :param board: board instance
+    :type board: boards.models.Board
+    :param since: board pipelines version that client already has
+    :type since: int
+    :returns: current version and changes since passed version, or `None`
+        if they aren't available anymore
+    :rtype: dict or None
+    """
+    log = cache.get(get_log_key(board))
+
+    if log is None or not log['start'] <= since <= log['version']:
+        return None
+
+    return {
+        'version': log['version'],
+        'changes': [
+            change for change in log['changes'] if change['version'] > since
+        ],
+    }
+
+
+def get_version(board):
+    """
+    Get last recorded board pipelines version, without reading the
+    pipelines data (or recording them if they weren't recorded yet).
+
+    :param board: board instance
+    :type board: boards.models.Board
+    :returns: last recorded board pipelines version, or 0 (which is never
+        available, so client asks for a full snapshot) if it's unknown
+    :rtype: int
+    """
+    return cache.get(get_version_key(board)) or 0
+
+
+def get_snapshot(board):
+    """
+    Get last recorded board pipelines data, together with its version.
+
+    :param board: board instance
+    :type board: boards.models.Board
+    :returns: current version and board pipelines data
+    :rtype: dict
+    """
+    state = cache.get(get_state_key(board))
+
+    if state is None:
+        pipelines = board.pipelines()
+        state = record(board, pipelines) or {
+            # Version that is never available, so client asks for a full
+            # snapshot again
+            'version': 0,
+            'pipelines': pipelines,
+        }
+
+    return state
@@ -0,0 +1,129 @@
+"""
+boards module live updates related code
+
+Every time board data changes (i.e. a webhook payload is applied or a
+background refresh finishes), an event is published on a per board Redis
+pub/sub channel. Board page viewers are subscribed to it through a
+Server-Sent Events stream (see `BoardEventsView`) and update changed issue
+cards in place.
+
+Events can be triggered locally by publishing to the board channel directly:
+
+    $ redis-cli PUBLISH boards:events:1 '{"event": "pipelines", "data": {}}'
+"""
+import json
+import logging
+import time
+
+from django.conf import settings
+
+from django_redis import get_redis_connection
+
+
+logger = logging.getLogger(__name__)
+
+# How often (in seconds) should we send a comment to idle streams, so proxies
+# don't close them and disconnected clients are noticed
+HEARTBEAT_INTERVAL = 15
+
+# How long (in milliseconds) should clients wait before reconnecting
+RETRY_INTERVAL = 3000
+
+
+def get_channel(board_pk):
+    """
+    Helper function for getting board events channel name.
+
+    :param board_pk: board primary key
+    :type board_pk: int
+    :returns: board events channel name
+    :rtype: str
+    """
+    return 'boards:events:{pk}'.format(pk=board_pk)
+
+
+def publish(board, event, **data):
+    """
+    Publish a board event. Failing to do so is only logged, as live updates
+    aren't worth failing the webhook (or task) that triggered them.
+
+    :param board: board instance
+    :type board: boards.models.Board
+    :param event: event type, either 'issue' or 'pipelines'
+    :type event: str
+    :param data: event data
+    """
+    message = json.dumps({'event': event, 'data': data})
+
+    try:
+        get_redis_connection('default').publish(
+            get_channel(board.pk), message,
+        )
+    except Exception:
+        logger.exception(
+            "Couldn't publish '{event}' event for {board!r}".format(
+                event=event,
+                board=board,
+            )
+        )
+
+
+def format_event(event, data):
+    """
+    Helper function for formatting Server-Sent Events message.
+
+    Docs:
+        https://html.spec.whatwg.org/multipage/server-sent-events.html
+
+    :param event: event type
+    :type event: str
+    :param data: event data
+    :type data: dict
+    :returns: Server-Sent Events message
+    :rtype: str
+    """
+    return 'event: {event}\ndata: {data}\n\n'.format(
+        event=event,
+        data=json.dumps(data),
+    )
+
+
+def stream(board):
+    """
+    Stream board events in Server-Sent Events format. The stream is closed
+    after `BOARDS_EVENTS_STREAM_TIMEOUT` seconds (and the client reconnects),
+    so it doesn't hold a web server worker forever.
+
+    :param board: board instance
+    :type board: boards.models.Board
+    :returns: Server-Sent Events messages
+    :rtype: generator of str
+    """
+    pubsub = get_redis_connection('default').pubsub(
+        ignore_subscribe_messages=True,
+    )
+    pubsub.subscribe(get_channel(board.pk))
+
+    try:
+        yield 'retry: {}\n\n'.format(RETRY_INTERVAL)
+
+        closes_at = time.monotonic() + settings.BOARDS_EVENTS_STREAM_TIMEOUT
+        while time.monotonic() < closes_at:
+            message = pubsub.get_message(timeout=HEARTBEAT_INTERVAL)
+
+            if message is None:
+                yield ': heartbeat\n\n'
+                continue
+
+            try:
+                event = json.loads(message['data'].decode())
+                yield format_event(event['event'], event['data'])
+            except (ValueError, KeyError, TypeError):
+                logger.warning(
+                    "Invalid event on '{channel}' channel: {data!r}".format(
+                        channel=get_channel(board.pk),
+                        data=message['data'],
+                    )
+                )
+    finally:
+        pubsub.close()
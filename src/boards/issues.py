@@ -3,17 +3,23 @@ boards module GitHub issue related code
 """
 import re
 
-from django.conf import settings
 from django.contrib.sites.models import Site
-from django.core.cache import cache
 from django.urls import reverse
 from django.utils.functional import cached_property
 
 import attr
 
+from boards.caching import (
+    delete_value, get_etags, get_or_set, get_or_set_many, refresh_value,
+)
+
+
 UNFINISHED_TODO_ITEM = re.compile(r'^\s*- \[ \]', re.MULTILINE)
 FINISHED_TODO_ITEM = re.compile(r'^\s*- \[x\]', re.MULTILINE)
 
+# Issue number used for resolving board issues API endpoint URL format
+API_ENDPOINT_PLACEHOLDER = 9876543210
+
 
 @attr.s
 class BoardIssue:
@@ -21,25 +27,20 @@ class BoardIssue:
     Helper class for organizing GitHub issue related logic. It's board specific
     because it includes description and comments body filtering, which depend
     on `Board.filter_sign` field.
+
+    Raw GitHub issue data is cached per repository (so it's shared between
+    boards), and board specific details are derived from it.
     """
     board = attr.ib()
     issue_number = attr.ib()
 
     @cached_property
-    def gh_issue(self):
+    def raw_issue(self):
         """
-        Helper property that returns GitHub issue API instance
+        Helper property that returns cached (if possible) raw GitHub issue
+        data, shared between all boards using the same repository.
         """
-        return self.board.gh_repo.issue(
-            number=self.issue_number,
-        )
-
-    @cached_property
-    def comments(self):
-        """
-        Helper property for caching issue comments.
-        """
-        return list(self.gh_issue.iter_comments())
+        return self.board.repository.issue(self.issue_number)
 
     def _get_details(self):
         """
@@ -50,21 +51,15 @@ class BoardIssue:
         """
         # Base
         issue_details = {
-            'number': self.gh_issue.number,
-            'title': self.gh_issue.title,
-            'author': self.gh_issue.user.name or self.gh_issue.user.login,
-            'state': self.gh_issue.state,
-            'labels': [l.name for l in self.gh_issue.labels],
-            'created_at': self.gh_issue.created_at,
-            'updated_at': self.gh_issue.updated_at,
-            'closed_at': self.gh_issue.closed_at,
+            key: self.raw_issue[key] for key in [
+                'number', 'title', 'author', 'state', 'labels',
+                'created_at', 'updated_at', 'closed_at',
+            ]
         }
 
         # Assignee
-        if self.gh_issue.assignee:
-            issue_details['assignee'] = (
-                self.gh_issue.assignee.name or self.gh_issue.assignee.login
-            )
+        if self.raw_issue['assignee']:
+            issue_details['assignee'] = self.raw_issue['assignee']
 
         # Custom
         issue_details['body'] = self._get_description()
@@ -81,11 +76,12 @@ class BoardIssue:
         :rtype: dict
         """
         filter_sign = self.board.filter_sign
+        issue = self.raw_issue
 
         if filter_sign is None:
-            body = self.gh_issue.body_html
-        elif filter_sign is not None and filter_sign in self.gh_issue.body:
-            body = self.gh_issue.body_html.replace(filter_sign, '')
+            body = issue['body_html']
+        elif filter_sign is not None and filter_sign in issue['body']:
+            body = issue['body_html'].replace(filter_sign, '')
         else:
             body = ''
 
@@ -101,20 +97,20 @@ class BoardIssue:
         filter_sign = self.board.filter_sign
 
         comments = list()
-        for comment in self.comments:
+        for comment in self.raw_issue['comments']:
             if filter_sign is None:
-                body = comment.body_html
-            elif filter_sign is not None and filter_sign in comment.body:
-                body = comment.body_html.replace(filter_sign, '')
+                body = comment['body_html']
+            elif filter_sign is not None and filter_sign in comment['body']:
+                body = comment['body_html'].replace(filter_sign, '')
             else:
                 continue
 
             comments.append({
-                'id': comment.id,
-                'url': comment.html_url,
+                'id': comment['id'],
+                'url': comment['url'],
                 'body': body,
-                'created_at': comment.created_at,
-                'updated_at': comment.updated_at,
+                'created_at': comment['created_at'],
+                'updated_at': comment['updated_at'],
             })
 
         return comments
@@ -129,12 +125,12 @@ class BoardIssue:
         :returns: issue progress
         :rtype: float or None
         """
-        body = self.gh_issue.body
+        body = self.raw_issue['body']
 
         if include_comments:
-            for comment in self.comments:
+            for comment in self.raw_issue['comments']:
                 body += '\n'
-                body += comment.body
+                body += comment['body']
 
         unfinished = len(UNFINISHED_TODO_ITEM.findall(body))
         finished = len(FINISHED_TODO_ITEM.findall(body))
@@ -144,19 +140,85 @@ class BoardIssue:
         else:
             return None
 
-    def details(self):
+    def details(self, refresh=False):
         """
         Get cached (if possible) GitHub issue details.
 
+        :param refresh: whether to refresh cached data (without invalidating
+            it first)
+        :type refresh: bool
         :returns: GitHub issue data
         :rtype: dict
         """
-        return cache.get_or_set(
+        if refresh:
+            return refresh_value(
+                key=self.get_cache_key(),
+                default=self._get_details,
+                etag=True,
+            )
+
+        return get_or_set(
             key=self.get_cache_key(),
             default=self._get_details,
-            timeout=settings.BOARDS_CACHE_TIMEOUT,
+            local=True,
+            etag=True,
+        )
+
+    @classmethod
+    def details_many(cls, board, issue_numbers):
+        """
+        Get cached (if possible) details of multiple board issues. Cached
+        details are read in one batch and missing ones are fetched
+        concurrently.
+
+        :param board: board instance
+        :type board: boards.models.Board
+        :param issue_numbers: issue numbers
+        :type issue_numbers: list of int
+        :returns: GitHub issues data, keyed by issue number
+        :rtype: dict
+        """
+        issues = {
+            cls(board, issue_number).get_cache_key(): cls(board, issue_number)
+            for issue_number in issue_numbers
+        }
+
+        issues_details = get_or_set_many(
+            defaults={
+                key: issue._get_details for key, issue in issues.items()
+            },
+            local=True,
+            etag=True,
         )
 
+        return {
+            issue.issue_number: issues_details[key]
+            for key, issue in issues.items()
+        }
+
+    @classmethod
+    def etags_many(cls, board, issue_numbers):
+        """
+        Get ETags of cached details of multiple board issues, without reading
+        the details themselves.
+
+        :param board: board instance
+        :type board: boards.models.Board
+        :param issue_numbers: issue numbers
+        :type issue_numbers: list of int
+        :returns: ETags (if available), keyed by issue number
+        :rtype: dict
+        """
+        keys = {
+            issue_number: cls(board, issue_number).get_cache_key()
+            for issue_number in issue_numbers
+        }
+        etags = get_etags(list(keys.values()))
+
+        return {
+            issue_number: etags[key] for issue_number, key in keys.items()
+        }
+
     def get_api_endpoint(self):
         """
         Return full API endpoint URL.
@@ -177,6 +239,32 @@ class BoardIssue:
 
         return issue_api_endpoint
 
+    @classmethod
+    def get_api_endpoint_format(cls, board):
+        """
+        Return full API endpoint URL format string (with `issue_number`
+        field) of all board issues, so it's only resolved once for all of them.
+
+        :param board: board instance
+        :type board: boards.models.Board
+        :returns: full issue details API endpoint format string
+        :rtype: str
+        """
+        api_endpoint = cls(board, API_ENDPOINT_PLACEHOLDER).get_api_endpoint()
+
+        return api_endpoint.replace('{', '{{').replace('}', '}}').replace(
+            str(API_ENDPOINT_PLACEHOLDER), '{issue_number}',
+        )
+
+    def get_cache_resource(self):
+        """
+        Helper method for generating issue board resource path.
+
+        :returns: issue board resource path
+        :rtype: str
+        """
+        return 'issue:{number}'.format(number=self.issue_number)
+
     def get_cache_key(self):
         """
         Helper method for generating a resource cache key.
@@ -184,12 +272,10 @@ class BoardIssue:
         :returns: current issue data unique cache key
         :rtype: str
         """
-        return self.board.get_cache_key(
-            'issue:{number}'.format(number=self.issue_number),
-        )
+        return self.board.get_cache_key(self.get_cache_resource())
 
     def invalidate_cache(self):
         """
         Helper method for invalidating issue cache.
         """
-        cache.delete(self.get_cache_key())
+        delete_value(self.get_cache_key())
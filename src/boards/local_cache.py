@@ -0,0 +1,230 @@
+"""
+boards module in-process cache related code
+
+Hot board cache entries (and cache generation numbers) are also kept in
+a small, per process LRU cache, so they can be served without a Redis round
+trip and deserialization. Whenever a cache entry changes, its key is
+published on a Redis pub/sub channel, so every process drops its local copy.
+"""
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from django_redis import get_redis_connection
+
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'boards:invalidate'
+
+# How long should we wait before reconnecting to the pub/sub channel
+RECONNECT_INTERVAL = 1
+
+
+class LocalCache:
+    """
+    Thread safe LRU cache, bounded by both number of entries and their
+    (pickled) size in bytes, and invalidated through Redis pub/sub.
+
+    It's only used while we're subscribed to the invalidation channel, as
+    otherwise we could miss invalidations. Entries also expire after
+    `BOARDS_LOCAL_CACHE_TIMEOUT` seconds, just to be safe.
+
+    Cached values are shared between threads, so they can't be mutated.
+    """
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.RLock()
+
+        # Bumped on every invalidation, so values read from Redis before the
+        # invalidation aren't cached after it
+        self.epoch = 0
+
+        self._subscribed = False
+        self._subscriber = None
+
+    @property
+    def enabled(self):
+        """
+        Helper property that returns whether local cache is enabled.
+
+        :returns: whether local cache is enabled
+        :rtype: bool
+        """
+        return settings.BOARDS_LOCAL_CACHE_MAX_ENTRIES > 0
+
+    def _subscribe(self):
+        """
+        Start the background thread that listens for invalidations, if it
+        isn't running yet.
+        """
+        with self._lock:
+            if self._subscriber is None:
+                self._subscriber = threading.Thread(
+                    target=self._listen,
+                    name='boards-local-cache',
+                    daemon=True,
+                )
+                self._subscriber.start()
+
+    def _listen(self):
+        """
+        Listen for invalidations and apply them, reconnecting when the
+        connection is lost. Local cache is cleared (and disabled) until we
+        are subscribed again.
+        """
+        while True:
+            try:
+                pubsub = get_redis_connection('default').pubsub()
+                pubsub.subscribe(CHANNEL)
+
+                for message in pubsub.listen():
+                    if message['type'] == 'subscribe':
+                        # Values read before we subscribed could have been
+                        # invalidated in the meantime
+                        self.clear()
+                        self._subscribed = True
+                    elif message['type'] == 'message':
+                        self._evict(message['data'].decode())
+            except Exception:
+                logger.exception(
+                    "Lost connection to '{}' channel".format(CHANNEL)
+                )
+
+            self._subscribed = False
+            self.clear()
+            time.sleep(RECONNECT_INTERVAL)
+
+    def get(self, key):
+        """
+        Get locally cached value.
+
+        :param key: cache key
+        :type key: str
+        :returns: cached value (if available)
+        """
+        if not self.enabled:
+            return None
+
+        if not self._subscribed:
+            self._subscribe()
+            return None
+
+        with self._lock:
+            if key not in self._entries:
+                return None
+
+            value, size, expires_at = self._entries[key]
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+
+            return value
+
+    def get_many(self, keys):
+        """
+        Get multiple locally cached values.
+
+        :param keys: cache keys
+        :type keys: list of str
+        :returns: cached values, keyed by cache keys
+        :rtype: dict
+        """
+        values = dict()
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                values[key] = value
+
+        return values
+
+    def set(self, key, value, epoch):
+        """
+        Cache value locally, unless something was invalidated since `epoch`
+        (as the value could already be outdated) or it's too big.
+
+        :param key: cache key
+        :type key: str
+        :param value: value to cache
+        :param epoch: invalidation epoch from before the value was read
+        :type epoch: int
+        """
+        if not self.enabled or not self._subscribed:
+            return
+
+        size = len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        if size > settings.BOARDS_LOCAL_CACHE_MAX_BYTES:
+            return
+
+        with self._lock:
+            if epoch != self.epoch:
+                return
+
+            self._remove(key)
+            self._entries[key] = (
+                value, size,
+                time.monotonic() + settings.BOARDS_LOCAL_CACHE_TIMEOUT,
+            )
+            self._size += size
+
+            while (len(self._entries) >
+                   settings.BOARDS_LOCAL_CACHE_MAX_ENTRIES or
+                   self._size > settings.BOARDS_LOCAL_CACHE_MAX_BYTES):
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        """
+        Drop locally cached value because it expired, was replaced or
+        didn't fit. The value itself didn't change, so values read before
+        that can still be cached.
+
+        :param key: cache key
+        :type key: str
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._size -= entry[1]
+
+    def _evict(self, key):
+        """
+        Drop locally cached value because it was invalidated.
+
+        :param key: cache key
+        :type key: str
+        """
+        with self._lock:
+            self.epoch += 1
+            self._remove(key)
+
+    def invalidate(self, key):
+        """
+        Drop cached value in all processes.
+
+        :param key: cache key
+        :type key: str
+        """
+        if not self.enabled:
+            return
+
+        self._evict(key)
+        get_redis_connection('default').publish(CHANNEL, key)
+
+    def clear(self):
+        """
+        Drop all locally cached values.
+        """
+        with self._lock:
+            self.epoch += 1
+            self._entries.clear()
+            self._size = 0
+
+
+local_cache = LocalCache()
@@ -0,0 +1,28 @@
+"""
+boards module `process_board_tasks` management command
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from boards import tasks
+
+
+class Command(BaseCommand):
+    """
+    Run scheduled board cache refreshes in a loop.
+    """
+    help = "Run scheduled board cache refreshes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=1,
+            help="How often (in seconds) to check for due tasks.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Processing board tasks...")
+
+        while True:
+            if not tasks.process_due():
+                time.sleep(options['interval'])
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-18 18:11
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0003_auto_20171031_0117'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RepositorySnapshot',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('github_repository', models.CharField(max_length=255, verbose_name='GitHub repository')),
+                ('resource', models.CharField(max_length=255, verbose_name='resource')),
+                ('data', models.BinaryField(verbose_name='data')),
+                ('modified', models.DateTimeField(auto_now=True, verbose_name='modified at')),
+            ],
+            options={
+                'verbose_name': 'Repository snapshot',
+                'verbose_name_plural': 'Repository snapshots',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='repositorysnapshot',
+            unique_together=set([('github_repository', 'resource')]),
+        ),
+    ]
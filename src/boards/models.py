@@ -2,18 +2,24 @@
 boards module models
 """
 import logging
+import pickle
+from functools import partial
 
 from django.conf import settings
 from django.contrib.sites.models import Site
-from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.urls import reverse
 from django.utils.functional import cached_property
 
+from boards.caching import (
+    bump_generation, delete_value, get_generation, get_or_set, refresh_value,
+    single_flight,
+)
 from boards.issues import BoardIssue
 from boards.managers import BoardsQuerySet
-from zenboard.utils import github_api, zenhub_api
+from boards.repositories import Repository
+from zenboard.utils import call_concurrently
 
 
 logger = logging.getLogger(__name__)
@@ -107,126 +113,191 @@ class Board(models.Model):
         ordering = ('-modified', '-created')
 
     @cached_property
+    def repository(self):
+        """
+        Helper method for getting board GitHub repository, which data is
+        shared with other boards.
+
+        :returns: board GitHub repository
+        :rtype: boards.repositories.Repository
+        """
+        return Repository(self.github_repository)
+
+    @property
     def gh_repo(self):
         """
-        Helper method for getting GitHub repository client.
+        Helper method for getting GitHub repository client. It doesn't make
+        any GitHub API calls.
 
         :returns: GitHub repository client
         :rtype: github3.repos.Repository
         """
-        owner, repo = self.github_repository.split('/')
-        gh_repo = github_api.repository(owner, repo)
+        return self.repository.gh_repo
 
-        return gh_repo
-
-    def _get_filtered_issues(self):
+    def get_labels(self):
         """
-        Get uncached filtered list of board GitHub issues. We filter issues
-        based on GitHub labels, so we have to first get the list of allowed
-        issues numbers and then use that to filter data from ZenHub API.
+        Helper method for getting a list of board (lowercase) GitHub labels.
 
-        :returns: filtered GitHub issues
-        :rtype: dict
+        :returns: board GitHub labels
+        :rtype: list of str
         """
-        gh_issues = self.gh_repo.iter_issues(
-            labels=self.github_labels,
-            state='all',
-        )
-
-        filtered_issues = dict()
-        for gh_issue in gh_issues:
-            filtered_issues[gh_issue.number] = {
-                'number': gh_issue.number,
-                'title': gh_issue.title,
-                'state': gh_issue.state,
-            }
-
-        return filtered_issues
+        return [
+            label.strip().lower()
+            for label in self.github_labels.split(',') if label.strip()
+        ]
 
-    def _get_pipelines(self):
+    def _get_pipelines(self, refresh=False):
         """
-        Get uncached board pipelines data from ZenHub API.
+        Get uncached board pipelines data, derived from (shared between
+        boards) raw ZenHub board data.
 
+        Raw ZenHub board and GitHub issues are fetched concurrently, as they
+        come from different services. Everything that's the same for all
+        issues (i.e. their API endpoint URL) is resolved once, and cached data
+        is copied instead of mutated.
+
+        :param refresh: whether to refresh raw ZenHub board data first
+        :type refresh: bool
         :returns: board pipeline list
         :rtype: list
         """
-        pipelines = list()
+        zenhub_board, filtered_issues = call_concurrently(
+            lambda: self.repository.zenhub_board(
+                repository_id=self.github_repository_id,
+                refresh=refresh,
+            ),
+            self.filtered_issues,
+        )
+        details_url = BoardIssue.get_api_endpoint_format(self)
 
-        zenhub_board = zenhub_api.get_board(self.github_repository_id)
+        def get_pipeline(name, zenhub_issues):
+            # Filter pipeline issues and add their GitHub data
+            return {
+                'name': name,
+                'issues': [
+                    dict(
+                        filtered_issues[issue['issue_number']],
+                        is_epic=issue.get('is_epic', False),
+                        details_url=details_url.format(
+                            issue_number=issue['issue_number'],
+                        ),
+                    )
+                    for issue in zenhub_issues
+                    if issue['issue_number'] in filtered_issues and (
+                        self.include_epics or not issue.get('is_epic', False)
+                    )
+                ],
+            }
 
-        filtered_issues = self.filtered_issues()
+        pipelines = [
+            get_pipeline(pipeline['name'], pipeline['issues'])
+            for pipeline in zenhub_board['pipelines']
+        ]
 
         # Zenhub doesn't track closed issues so we have to add them manually
         if self.show_closed_pipeline:
-            closed_filtered_issues_numbers = [
-                issue_number
+            pipelines.append(get_pipeline('Closed', [
+                # This is to mimic ZenHub API response format
+                {'issue_number': issue_number}
                 for issue_number, issue in filtered_issues.items()
                 if issue['state'] == 'closed'
-            ]
-
-            zenhub_board.append({
-                'name': 'Closed',
-                # This is to mimic ZenHub API response format
-                'issues': [
-                    {'issue_number': issue_number}
-                    for issue_number in closed_filtered_issues_numbers
-                ],
-            })
-
-        # Iterate through pipelines and their issues, filter them and get
-        # their title
-        for pipeline in zenhub_board:
-            pipeline_issues = list()
-            for issue in pipeline['issues']:
-                issue_number = issue['issue_number']
+            ]))
 
-                if issue_number not in filtered_issues:
-                    continue
+        return pipelines
 
-                if not self.include_epics and issue.get('is_epic', False):
-                    continue
+    def filtered_issues(self, refresh=False):
+        """
+        Get cached (if possible) filtered list of board GitHub issues. We
+        filter issues based on GitHub labels, so we have to first get the
+        list of allowed issues numbers and then use that to filter data from
+        ZenHub API.
 
-                issue_data = filtered_issues[issue_number]
-                issue_data['is_epic'] = issue.get('is_epic', False)
-                issue_data['details_url'] = BoardIssue(
-                    board=self, issue_number=issue_number,
-                ).get_api_endpoint()
+        Issues are cached per repository and filtered on read, as that's
+        cheap and the same issues are shared between multiple boards.
 
-                pipeline_issues.append(issue_data)
+        :param refresh: whether to refresh cached data (without invalidating
+            it first, so only updated issues are fetched)
+        :type refresh: bool
+        :returns: filtered GitHub issues
+        :rtype: dict
+        """
+        return self.repository.filtered_issues(
+            labels=self.get_labels(),
+            refresh=refresh,
+        )
 
-            pipelines.append({
-                'name': pipeline['name'],
-                'issues': pipeline_issues
-            })
+    def issue_numbers(self):
+        """
+        Get cached (if possible) numbers of board GitHub issues. They're much
+        smaller than the filtered issues themselves, so they're also cached
+        in process and used for checking access to board issues data.
 
-        return pipelines
+        :returns: sorted issue numbers
+        :rtype: list of int
+        """
+        return get_or_set(
+            key=self.get_cache_key('issue_numbers'),
+            default=lambda: sorted(self.filtered_issues()),
+            local=True,
+        )
 
-    def filtered_issues(self):
+    def pipelines(self, refresh=False):
         """
-        Get cached (if possible) filtered list of board GitHub issues.
+        Get cached (if possible) board pipelines data from ZenHub API. Every
+        time it's rebuilt, its changes are also recorded in the board change
+        log (see `boards.changes`).
 
+        :param refresh: whether to refresh cached data (without invalidating
+            it first)
+        :type refresh: bool
         :returns: filtered GitHub issues
         :rtype: dict
         """
-        return cache.get_or_set(
-            key=self.get_cache_key('filtered_issues'),
-            default=self._get_filtered_issues,
-            timeout=settings.BOARDS_CACHE_TIMEOUT,
+        from boards import changes
+
+        def build(refresh=False):
+            pipelines = self._get_pipelines(refresh=refresh)
+            changes.record(self, pipelines)
+            return pipelines
+
+        if refresh:
+            return refresh_value(
+                key=self.get_cache_key('pipelines'),
+                default=lambda: build(refresh=True),
+                etag=True,
+            )
+
+        return get_or_set(
+            key=self.get_cache_key('pipelines'),
+            default=build,
+            local=True,
+            etag=True,
         )
 
-    def pipelines(self):
+    def get_cache_namespace(self):
         """
-        Get cached (if possible) board pipelines data from ZenHub API.
+        Helper method for generating board cache keys namespace.
 
-        :returns: filtered GitHub issues
-        :rtype: dict
+        :returns: current board cache keys namespace
+        :rtype: str
         """
-        return cache.get_or_set(
-            key=self.get_cache_key('pipelines'),
-            default=self._get_pipelines,
-            timeout=settings.BOARDS_CACHE_TIMEOUT,
+        return '{app_label}.{object_name}:{pk}'.format(
+            app_label=self._meta.app_label,
+            object_name=self._meta.object_name,
+            pk=self.pk,
         )
 
+    @cached_property
+    def cache_generation(self):
+        """
+        Helper property that returns current board cache generation number,
+        which is part of all board cache keys.
+
+        :returns: board cache generation number
+        :rtype: int
+        """
+        return get_generation(self.get_cache_namespace())
+
     def get_cache_key(self, resource):
         """
         Helper method for generating a resource cache key.
@@ -236,26 +307,88 @@ class Board(models.Model):
         :returns: current board data unique cache key
         :rtype: str
         """
-        return '{app_label}.{object_name}:{pk}:{resource}'.format(
-            app_label=self._meta.app_label,
-            object_name=self._meta.object_name,
-            pk=self.pk,
+        return '{namespace}:g{generation}:{resource}'.format(
+            namespace=self.get_cache_namespace(),
+            generation=self.cache_generation,
             resource=resource,
         )
 
-    def invalidate_cache(self, resource='*', glob=True):
+    def invalidate_cache(self, resource='*'):
         """
-        Helper method for invalidating all related cache.
+        Helper method for invalidating related cache. Invalidating all of it
+        only bumps board cache generation number, so it doesn't depend on the
+        number of cached keys.
 
-        :param resource: path to resource that we want to invalidate
+        :param resource: path to resource that we want to invalidate, or '*'
+            for all of them
         :type resource: str
-        :param glob: wheter you can use glob syntax to match multiple keys
-        :type glob: bool
         """
-        if glob:
-            cache.delete_pattern(self.get_cache_key(resource))
+        if resource == '*':
+            self.__dict__['cache_generation'] = bump_generation(
+                self.get_cache_namespace(),
+            )
         else:
-            cache.delete(self.get_cache_key(resource))
+            delete_value(self.get_cache_key(resource))
+
+    def refresh_cache(self, *resources):
+        """
+        Helper method for invalidating and rebuilding passed resources cache
+        (or all of it, if none were passed). Concurrent refreshes of the same
+        resources collapse into one - everyone else waits for it to finish
+        and uses its result.
+
+        Repository data is shared with other boards, so it's refreshed in
+        place (and its snapshots are kept) instead of being invalidated -
+        see `Repository.invalidate_cache` for a full reset.
+
+        :param resources: paths to resources that we want to refresh
+        :type resources: str
+        """
+        resources = resources or ('*',)
+
+        # Refresh bumps the cache generation, so it can't be part of the key
+        refresh_key = '{namespace}:refresh:{resources}'.format(
+            namespace=self.get_cache_namespace(),
+            resources=','.join(resources),
+        )
+        with single_flight(refresh_key) as acquired:
+            if acquired:
+                for resource in resources:
+                    self.refresh_repository_cache(resource)
+                    self.invalidate_cache(resource)
+
+                self.pipelines()
+
+    def refresh_repository_cache(self, resource):
+        """
+        Helper method for refreshing (without invalidating) repository data
+        that passed board resource is derived from.
+
+        :param resource: path to board resource that we want to refresh, or
+            '*' for all of them
+        :type resource: str
+        """
+        # Full sync also catches deleted issues
+        if resource in ['*', 'filtered_issues']:
+            self.repository.invalidate_cache('issues:sync')
+            self.repository.issues(refresh=True)
+            self.invalidate_cache('issue_numbers')
+
+        if resource in ['*', 'pipelines']:
+            self.repository.zenhub_board(
+                repository_id=self.github_repository_id,
+                refresh=True,
+            )
+
+        if resource == '*':
+            call_concurrently(*(
+                partial(self.repository.issue, issue_number, refresh=True)
+                for issue_number in self.issue_numbers()
+            ))
+        elif resource.startswith('issue:'):
+            self.repository.issue(
+                int(resource.split(':')[1]), refresh=True,
+            )
 
     def __str__(self):
         return '{0.name} board (PK: {0.pk})'.format(self)
@@ -269,7 +402,7 @@ class Board(models.Model):
         """
         # Make sure that provided GitHub repo is valid and accessible
         try:
-            gh_repo = self.gh_repo
+            gh_repo = self.repository.lookup_gh_repo()
             if not gh_repo:
                 raise ValueError
         except AttributeError:
@@ -325,3 +458,78 @@ class Board(models.Model):
                 )
 
         return super(Board, self).save(*args, **kwargs)
+
+
+class RepositorySnapshot(models.Model):
+    """
+    Model representation of last known GitHub repository cache value. It's
+    used for quickly refilling the cache after it's lost (i.e. on Redis
+    restart), instead of fetching everything from GitHub and ZenHub APIs
+    again at the same time.
+    """
+    github_repository = models.CharField(
+        verbose_name='GitHub repository',
+        max_length=255,
+    )
+
+    resource = models.CharField(
+        verbose_name='resource',
+        max_length=255,
+    )
+
+    data = models.BinaryField(
+        verbose_name='data',
+    )
+
+    modified = models.DateTimeField(
+        verbose_name='modified at',
+        editable=False,
+        auto_now=True,
+    )
+
+    class Meta:
+        verbose_name = "Repository snapshot"
+        verbose_name_plural = "Repository snapshots"
+        unique_together = ('github_repository', 'resource')
+
+    @classmethod
+    def save_value(cls, github_repository, resource, value):
+        """
+        Helper method for saving resource value snapshot.
+
+        :param github_repository: GitHub repository full name
+        :type github_repository: str
+        :param resource: resource type
+        :type resource: str
+        :param value: resource value
+        """
+        cls.objects.update_or_create(
+            github_repository=github_repository,
+            resource=resource,
+            defaults={
+                'data': pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+            },
+        )
+
+    @classmethod
+    def load_value(cls, github_repository, resource):
+        """
+        Helper method for loading resource value snapshot.
+
+        :param github_repository: GitHub repository full name
+        :type github_repository: str
+        :param resource: resource type
+        :type resource: str
+        :returns: resource value (if available)
+        """
+        data = cls.objects.filter(
+            github_repository=github_repository,
+            resource=resource,
+        ).values_list('data', flat=True).first()
+
+        return pickle.loads(data) if data is not None else None
+
+    def __str__(self):
+        return "'{0.resource}' snapshot of '{0.github_repository}'".format(
+            self,
+        )
@@ -0,0 +1,285 @@
+"""
+boards module webhook payloads related code
+
+GitHub and ZenHub webhook payloads are applied directly to cached repository
+data, so (in most cases) nothing has to be refetched.
+
+GitHub doesn't guarantee webhooks delivery order, so GitHub payloads that are
+older than cached issue data (based on issue `updated_at` timestamp) are
+skipped.
+
+Docs:
+    https://developer.github.com/v3/activity/events/types/#issuesevent
+    https://developer.github.com/v3/activity/events/types/#issuecommentevent
+    https://github.com/ZenHubIO/API#webhooks
+"""
+from django.utils.dateparse import parse_datetime
+
+from boards.caching import update_value
+from boards.repositories import Repository
+
+
+class InsufficientPayloadError(Exception):
+    """
+    Raised when a webhook payload doesn't contain all the data needed for
+    updating cached data.
+    """
+
+
+def _parse_datetime(value):
+    """
+    Helper function for parsing (optional) GitHub timestamps.
+
+    :param value: ISO 8601 timestamp
+    :type value: str or None
+    :returns: parsed timestamp
+    :rtype: datetime.datetime or None
+    """
+    return parse_datetime(value) if value else None
+
+
+def _is_outdated(issue, gh_issue):
+    """
+    Helper function for checking if cached issue data is newer than the
+    issue data in GitHub webhook payload.
+
+    :param issue: cached issue data (if available)
+    :type issue: dict or None
+    :param gh_issue: GitHub webhook payload issue data
+    :type gh_issue: dict
+    :returns: whether the payload is outdated
+    :rtype: bool
+    """
+    cached_updated_at = issue.get('updated_at') if issue else None
+    updated_at = _parse_datetime(gh_issue['updated_at'])
+
+    if not cached_updated_at or not updated_at:
+        return False
+
+    return updated_at < cached_updated_at
+
+
+def apply_to_issues_index(index, event, payload):
+    """
+    Apply GitHub webhook payload to repository GitHub issues index.
+
+    :param index: GitHub issues index
+    :type index: dict
+    :param event: GitHub event type
+    :type event: str
+    :param payload: GitHub event payload
+    :type payload: dict
+    :returns: updated GitHub issues index
+    :rtype: dict
+    """
+    gh_issue = payload['issue']
+    issues = dict(index['issues'])
+
+    if event == 'issues' and payload['action'] in ['deleted', 'transferred']:
+        issues.pop(gh_issue['number'], None)
+    elif _is_outdated(issues.get(gh_issue['number']), gh_issue):
+        return index
+    else:
+        issues[gh_issue['number']] = {
+            'number': gh_issue['number'],
+            'title': gh_issue['title'],
+            'state': gh_issue['state'],
+            'labels': [label['name'].lower() for label in gh_issue['labels']],
+            'updated_at': _parse_datetime(gh_issue['updated_at']),
+        }
+
+    return Repository.build_issues_index(issues)
+
+
+def apply_to_issue(issue, event, payload):
+    """
+    Apply GitHub webhook payload to raw GitHub issue data.
+
+    Payloads don't contain rendered Markdown or assignee display name, so
+    body edits, new (or edited) comments and assignee changes can't be
+    applied.
+
+    :param issue: raw GitHub issue data
+    :type issue: dict
+    :param event: GitHub event type
+    :type event: str
+    :param payload: GitHub event payload
+    :type payload: dict
+    :returns: updated raw GitHub issue data
+    :rtype: dict
+    :raises InsufficientPayloadError: if payload can't be applied
+    """
+    action = payload['action']
+    gh_issue = payload['issue']
+
+    # Cached data was fetched (or updated) after this payload was sent
+    if _is_outdated(issue, gh_issue):
+        return issue
+
+    if event == 'issues':
+        if action in ['assigned', 'unassigned']:
+            raise InsufficientPayloadError('No assignee display name')
+        if action == 'edited' and 'body' in payload.get('changes', {}):
+            raise InsufficientPayloadError('No rendered issue body')
+    elif event == 'issue_comment' and action != 'deleted':
+        raise InsufficientPayloadError('No rendered comment body')
+
+    issue = dict(
+        issue,
+        title=gh_issue['title'],
+        state=gh_issue['state'],
+        labels=[label['name'] for label in gh_issue['labels']],
+        updated_at=_parse_datetime(gh_issue['updated_at']),
+        closed_at=_parse_datetime(gh_issue['closed_at']),
+    )
+
+    if event == 'issue_comment':
+        issue['comments'] = [
+            comment for comment in issue['comments']
+            if comment['id'] != payload['comment']['id']
+        ]
+
+    return issue
+
+
+def apply_github_event(repository, event, payload):
+    """
+    Apply GitHub 'issues' or 'issue_comment' event payload to cached
+    repository data. Data that isn't cached is left alone, as it will be
+    fetched on first use anyway.
+
+    :param repository: GitHub repository
+    :type repository: boards.repositories.Repository
+    :param event: GitHub event type
+    :type event: str
+    :param payload: GitHub event payload
+    :type payload: dict
+    :returns: paths to resources that couldn't be updated and need a refetch
+    :rtype: list of str
+    """
+    stale_resources = list()
+
+    updated = update_value(
+        repository.get_cache_key('issues'),
+        lambda index: apply_to_issues_index(index, event, payload),
+    )
+    if not updated:
+        stale_resources.append('issues')
+
+    issue_resource = 'issue:{}'.format(payload['issue']['number'])
+
+    if event == 'issues' and payload['action'] in ['deleted', 'transferred']:
+        repository.invalidate_cache(issue_resource)
+        return stale_resources
+
+    try:
+        updated = update_value(
+            repository.get_cache_key(issue_resource),
+            lambda issue: apply_to_issue(issue, event, payload),
+        )
+    except InsufficientPayloadError:
+        updated = False
+
+    if not updated:
+        stale_resources.append(issue_resource)
+
+    return stale_resources
+
+
+def apply_to_zenhub_board(zenhub_board, event, payload):
+    """
+    Apply ZenHub webhook payload to raw ZenHub board data, by moving the
+    issue between (or inside) pipelines.
+
+    'issue_transfer' payloads don't contain issue position, so (like ZenHub
+    does) the issue is moved to the top of the target pipeline.
+
+    Payloads aren't versioned, so before moving the issue we make sure it's
+    where the payload says it was. If it isn't (i.e. we missed a delivery or
+    got them out of order), the payload can't be applied.
+
+    :param zenhub_board: raw ZenHub board data
+    :type zenhub_board: dict
+    :param event: ZenHub event type
+    :type event: str
+    :param payload: ZenHub event payload
+    :type payload: dict
+    :returns: updated raw ZenHub board data
+    :rtype: dict
+    :raises InsufficientPayloadError: if payload can't be applied
+    """
+    issue_number = int(payload['issue_number'])
+
+    if event == 'issue_transfer':
+        from_pipeline_name = payload['from_pipeline_name']
+        to_position = int(payload.get('to_position') or 0)
+    elif payload.get('to_position') is not None:
+        from_pipeline_name = payload['to_pipeline_name']
+        to_position = int(payload['to_position'])
+    else:
+        raise InsufficientPayloadError('No issue position')
+
+    pipelines = {
+        pipeline['name']: list(pipeline['issues'])
+        for pipeline in zenhub_board['pipelines']
+    }
+    if (from_pipeline_name not in pipelines or
+            payload['to_pipeline_name'] not in pipelines):
+        raise InsufficientPayloadError('Unknown pipeline')
+
+    from_issues = pipelines[from_pipeline_name]
+    for index, moved_issue in enumerate(from_issues):
+        if moved_issue['issue_number'] == issue_number:
+            break
+    else:
+        raise InsufficientPayloadError('Issue not found in source pipeline')
+
+    if payload.get('from_position') is not None and (
+            moved_issue['position'] != int(payload['from_position'])):
+        raise InsufficientPayloadError('Issue not found at source position')
+
+    del from_issues[index]
+    to_issues = pipelines[payload['to_pipeline_name']]
+    to_issues.insert(to_position, moved_issue)
+
+    return {
+        'version': zenhub_board['version'] + 1,
+        'pipelines': [
+            {
+                'name': pipeline['name'],
+                'issues': [
+                    dict(issue, position=position)
+                    for position, issue in enumerate(
+                        pipelines[pipeline['name']]
+                    )
+                ],
+            }
+            for pipeline in zenhub_board['pipelines']
+        ],
+    }
+
+
+def apply_zenhub_event(repository, event, payload):
+    """
+    Apply ZenHub 'issue_transfer' or 'issue_reprioritized' event payload to
+    cached repository data. Data that isn't cached is left alone, as it will
+    be fetched on first use anyway.
+
+    :param repository: GitHub repository
+    :type repository: boards.repositories.Repository
+    :param event: ZenHub event type
+    :type event: str
+    :param payload: ZenHub event payload
+    :type payload: dict
+    :returns: paths to resources that couldn't be updated and need a refetch
+    :rtype: list of str
+    """
+    try:
+        updated = update_value(
+            repository.get_cache_key('zenhub_board'),
+            lambda board: apply_to_zenhub_board(board, event, payload),
+        )
+    except InsufficientPayloadError:
+        updated = False
+
+    return [] if updated else ['zenhub_board']
@@ -0,0 +1,436 @@
+"""
+boards module GitHub repository related code
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import cached_property
+
+import attr
+from github3.repos import Repository as GitHubRepository
+
+from boards.caching import (
+    bump_generation, delete_value, get_generation, get_or_set, get_timeout,
+    get_value, refresh_value, set_value,
+)
+from zenboard.utils import github_api, zenhub_api
+
+
+@attr.s
+class Repository:
+    """
+    Helper class for organizing GitHub repository related logic. It's shared
+    between all boards that use the same GitHub repository, so its data is
+    fetched and cached only once, regardless of the number of boards.
+    """
+    full_name = attr.ib()
+
+    # Only repository wide resources are worth persisting, as they're the
+    # expensive ones to fetch again when the cache is lost
+    snapshot_resources = ('issues', 'zenhub_board')
+
+    @cached_property
+    def gh_repo(self):
+        """
+        Helper method for getting GitHub repository client. It's built from
+        the repository full name, without making any GitHub API calls, so it
+        doesn't check whether the repository exists (see `lookup_gh_repo`).
+
+        :returns: GitHub repository client
+        :rtype: github3.repos.Repository
+        """
+        owner, repo = self.full_name.split('/')
+
+        return GitHubRepository(
+            {
+                'url': github_api._build_url('repos', owner, repo),
+                'name': repo,
+                'full_name': self.full_name,
+                'owner': {'login': owner},
+            },
+            github_api,
+        )
+
+    def lookup_gh_repo(self):
+        """
+        Helper method for getting GitHub repository client, together with
+        all repository data, from GitHub API.
+
+        :returns: GitHub repository client (if repository is accessible)
+        :rtype: github3.repos.Repository or None
+        """
+        owner, repo = self.full_name.split('/')
+
+        return github_api.repository(owner, repo)
+
+    def _get_or_set(self, resource, default, refresh=False):
+        """
+        Helper method for getting cached (if possible) resource value. Every
+        fetched value of `snapshot_resources` is also saved as a persistent
+        snapshot, which is used for refilling the cache (and then refreshing
+        it in the background) if it's lost. Board data derived from the
+        restored value is invalidated once it's refreshed.
+
+        :param resource: resource type
+        :type resource: str
+        :param default: callable that fetches resource value
+        :type default: callable
+        :param refresh: whether to refresh cached data (without invalidating
+            it first)
+        :type refresh: bool
+        :returns: resource value
+        """
+        from boards.models import RepositorySnapshot
+
+        if resource not in self.snapshot_resources:
+            if refresh:
+                return refresh_value(
+                    key=self.get_cache_key(resource),
+                    default=default,
+                )
+
+            return get_or_set(
+                key=self.get_cache_key(resource),
+                default=default,
+            )
+
+        restored = list()
+
+        def fetch():
+            value = default()
+            RepositorySnapshot.save_value(self.full_name, resource, value)
+
+            if restored:
+                # Derived board data has to be invalidated only after the
+                # refreshed value is cached, or it could be derived from the
+                # restored one again
+                set_value(self.get_cache_key(resource), value)
+                self.invalidate_dependents(resource)
+
+            return value
+
+        def restore():
+            value = RepositorySnapshot.load_value(self.full_name, resource)
+            if value is not None:
+                restored.append(resource)
+            return value
+
+        if refresh:
+            return refresh_value(
+                key=self.get_cache_key(resource),
+                default=fetch,
+            )
+
+        return get_or_set(
+            key=self.get_cache_key(resource),
+            default=fetch,
+            restore=restore,
+        )
+
+    def _get_issues(self):
+        """
+        Get uncached repository GitHub issues index. It consists of all issues
+        data, keyed by issue number, and an inverted index of issue numbers,
+        keyed by (lowercase) label name.
+
+        If the index is already cached, only issues updated since the last
+        sync are fetched and merged into it. Full sync, which also catches
+        deleted issues, is still done every `BOARDS_FULL_SYNC_INTERVAL`
+        seconds.
+
+        :returns: GitHub issues index
+        :rtype: dict
+        """
+        sync = cache.get(self.get_cache_key('issues:sync'))
+        issues = get_value(self.get_cache_key('issues'))
+
+        if (sync and sync['updated_at'] and issues is not None and
+                time.time() < sync['full_sync_at'] +
+                settings.BOARDS_FULL_SYNC_INTERVAL):
+            issues = dict(issues['issues'])
+            gh_issues = self.gh_repo.iter_issues(
+                state='all',
+                since=sync['updated_at'],
+            )
+        else:
+            issues = dict()
+            sync = {'updated_at': None, 'full_sync_at': time.time()}
+            gh_issues = self.gh_repo.iter_issues(state='all')
+
+        for gh_issue in gh_issues:
+            issues[gh_issue.number] = {
+                'number': gh_issue.number,
+                'title': gh_issue.title,
+                'state': gh_issue.state,
+                'labels': [label.name.lower() for label in gh_issue.labels],
+                'updated_at': gh_issue.updated_at,
+            }
+
+            if not sync['updated_at'] or (
+                    gh_issue.updated_at > sync['updated_at']):
+                sync['updated_at'] = gh_issue.updated_at
+
+        cache.set(
+            self.get_cache_key('issues:sync'), sync, timeout=get_timeout(),
+        )
+
+        return self.build_issues_index(issues)
+
+    @staticmethod
+    def build_issues_index(issues):
+        """
+        Helper method for building the GitHub issues index.
+
+        :param issues: GitHub issues data, keyed by issue number
+        :type issues: dict
+        :returns: GitHub issues index
+        :rtype: dict
+        """
+        labels = dict()
+        for issue_number, issue in issues.items():
+            for label in issue['labels']:
+                labels.setdefault(label, []).append(issue_number)
+
+        return {
+            'issues': issues,
+            'labels': labels,
+        }
+
+    def issues(self, refresh=False):
+        """
+        Get cached (if possible) repository GitHub issues index.
+
+        :param refresh: whether to refresh cached data (without invalidating
+            it first, so only updated issues are fetched)
+        :type refresh: bool
+        :returns: GitHub issues index
+        :rtype: dict
+        """
+        return self._get_or_set('issues', self._get_issues, refresh=refresh)
+
+    def _get_issue(self, issue_number):
+        """
+        Get uncached raw GitHub issue data, together with its comments.
+
+        :param issue_number: issue number
+        :type issue_number: int
+        :returns: raw GitHub issue data
+        :rtype: dict
+        """
+        gh_issue = self.gh_repo.issue(number=issue_number)
+
+        issue = {
+            'number': gh_issue.number,
+            'title': gh_issue.title,
+            'author': gh_issue.user.name or gh_issue.user.login,
+            'assignee': None,
+            'state': gh_issue.state,
+            'labels': [label.name for label in gh_issue.labels],
+            'body': gh_issue.body or '',
+            'body_html': gh_issue.body_html or '',
+            'created_at': gh_issue.created_at,
+            'updated_at': gh_issue.updated_at,
+            'closed_at': gh_issue.closed_at,
+        }
+
+        if gh_issue.assignee:
+            issue['assignee'] = (
+                gh_issue.assignee.name or gh_issue.assignee.login
+            )
+
+        issue['comments'] = [
+            {
+                'id': comment.id,
+                'url': comment.html_url,
+                'body': comment.body or '',
+                'body_html': comment.body_html or '',
+                'created_at': comment.created_at,
+                'updated_at': comment.updated_at,
+            }
+            for comment in gh_issue.iter_comments()
+        ]
+
+        return issue
+
+    def issue(self, issue_number, refresh=False):
+        """
+        Get cached (if possible) raw GitHub issue data.
+
+        :param issue_number: issue number
+        :type issue_number: int
+        :param refresh: whether to refresh cached data (without invalidating
+            it first)
+        :type refresh: bool
+        :returns: raw GitHub issue data
+        :rtype: dict
+        """
+        return self._get_or_set(
+            resource='issue:{number}'.format(number=issue_number),
+            default=lambda: self._get_issue(issue_number),
+            refresh=refresh,
+        )
+
+    def filtered_issues(self, labels, refresh=False):
+        """
+        Get cached (if possible) GitHub issues that have all passed labels.
+
+        :param labels: (lowercase) label names
+        :type labels: list of str
+        :param refresh: whether to refresh cached data
+        :type refresh: bool
+        :returns: filtered GitHub issues
+        :rtype: dict
+        """
+        index = self.issues(refresh=refresh)
+
+        if labels:
+            issue_numbers = set.intersection(*(
+                set(index['labels'].get(label, ())) for label in labels
+            ))
+        else:
+            issue_numbers = index['issues'].keys()
+
+        filtered_issues = dict()
+        for issue_number in issue_numbers:
+            issue = index['issues'][issue_number]
+            filtered_issues[issue_number] = {
+                'number': issue['number'],
+                'title': issue['title'],
+                'state': issue['state'],
+            }
+
+        return filtered_issues
+
+    def _get_zenhub_board(self, repository_id):
+        """
+        Get uncached raw ZenHub board data, together with its version, which
+        is bumped every time it's refetched or updated in place.
+
+        :param repository_id: GitHub repository ID
+        :type repository_id: str
+        :returns: raw ZenHub board data
+        :rtype: dict
+        """
+        pipelines = zenhub_api.get_board(repository_id)
+        zenhub_board = get_value(self.get_cache_key('zenhub_board'))
+
+        return {
+            'version': zenhub_board['version'] + 1 if zenhub_board else 1,
+            'pipelines': [
+                {
+                    'name': pipeline['name'],
+                    'issues': [
+                        {
+                            'issue_number': issue['issue_number'],
+                            'position': issue.get('position', position),
+                            'is_epic': issue.get('is_epic', False),
+                        }
+                        for position, issue in enumerate(pipeline['issues'])
+                    ],
+                }
+                for pipeline in pipelines
+            ],
+        }
+
+    def zenhub_board(self, repository_id, refresh=False):
+        """
+        Get cached (if possible) raw ZenHub board data.
+
+        :param repository_id: GitHub repository ID
+        :type repository_id: str
+        :param refresh: whether to refresh cached data (without invalidating
+            it first)
+        :type refresh: bool
+        :returns: raw ZenHub board data
+        :rtype: dict
+        """
+        return self._get_or_set(
+            resource='zenhub_board',
+            default=lambda: self._get_zenhub_board(repository_id),
+            refresh=refresh,
+        )
+
+    def get_cache_namespace(self):
+        """
+        Helper method for generating repository cache keys namespace.
+
+        :returns: current repository cache keys namespace
+        :rtype: str
+        """
+        return 'boards.Repository:{full_name}'.format(
+            full_name=self.full_name,
+        )
+
+    @cached_property
+    def cache_generation(self):
+        """
+        Helper property that returns current repository cache generation
+        number, which is part of all repository cache keys.
+
+        :returns: repository cache generation number
+        :rtype: int
+        """
+        return get_generation(self.get_cache_namespace())
+
+    def get_cache_key(self, resource):
+        """
+        Helper method for generating a resource cache key.
+
+        :param resource: resource type
+        :type resource: str
+        :returns: current repository data unique cache key
+        :rtype: str
+        """
+        return '{namespace}:g{generation}:{resource}'.format(
+            namespace=self.get_cache_namespace(),
+            generation=self.cache_generation,
+            resource=resource,
+        )
+
+    def invalidate_dependents(self, resource):
+        """
+        Helper method for invalidating board data derived from passed
+        resource, for all boards that use this repository.
+
+        :param resource: path to resource that changed
+        :type resource: str
+        """
+        from boards.issues import BoardIssue
+        from boards.models import Board
+
+        boards = Board.objects.filter(github_repository=self.full_name)
+
+        for board in boards:
+            if resource.startswith('issue:'):
+                issue_number = int(resource.split(':')[1])
+                BoardIssue(board, issue_number).invalidate_cache()
+            elif resource in ['issues', 'zenhub_board']:
+                if resource == 'issues':
+                    board.invalidate_cache('issue_numbers')
+                board.invalidate_cache('pipelines')
+
+    def invalidate_cache(self, resource='*'):
+        """
+        Helper method for invalidating related cache (and its persistent
+        snapshots). Invalidating all of it only bumps repository cache
+        generation number, so it doesn't depend on the number of cached keys.
+
+        :param resource: path to resource that we want to invalidate, or '*'
+            for all of them
+        :type resource: str
+        """
+        from boards.models import RepositorySnapshot
+
+        snapshots = RepositorySnapshot.objects.filter(
+            github_repository=self.full_name,
+        )
+
+        if resource == '*':
+            snapshots.delete()
+            self.__dict__['cache_generation'] = bump_generation(
+                self.get_cache_namespace(),
+            )
+        else:
+            snapshots.filter(resource=resource).delete()
+            delete_value(self.get_cache_key(resource))
@@ -5,8 +5,11 @@ import logging
 
 from django.dispatch import receiver
 
+from boards import events, tasks
 from boards.issues import BoardIssue
 from boards.models import Board
+from boards.payloads import apply_github_event, apply_zenhub_event
+from boards.repositories import Repository
 from webhooks.signals import github_event, zenhub_event
 
 
@@ -14,49 +17,72 @@ logger = logging.getLogger(__name__)
 
 
 @receiver(github_event)
-def invalidate_issue_details_cache(sender, event, guid, payload, **kwargs):
+def update_issue_cache(sender, event, guid, payload, **kwargs):
     """
-    Invalidate GitHub issue details cache when it changes.
+    Apply GitHub issue changes to cached data (or, if that's not possible,
+    schedule its refresh) when it changes.
     """
     if event in ['issues', 'issue_comment']:
         issue_number = payload['issue']['number']
-        repository = payload['repository']['full_name']
-        boards = Board.objects.filter(github_repository=repository)
+        repository = Repository(payload['repository']['full_name'])
 
+        # Issues are shared between all boards using the same repository, so
+        # they're updated (or refreshed) only once
+        stale_resources = apply_github_event(repository, event, payload)
+        for resource in stale_resources:
+            tasks.schedule(repository, resource)
+
+        # Board specific issue details, issue numbers and pipelines are
+        # derived from the raw data, so they only need to be invalidated
+        boards = Board.objects.filter(
+            github_repository=repository.full_name,
+        )
         for board in boards:
-            board.invalidate_cache('filtered_issues', glob=False)
-            board.filtered_issues()
-
-            board_issue = BoardIssue(board, issue_number)
-            board_issue.invalidate_cache()
-            board_issue.details()
-
-            logger.info(
-                "Updated issue {issue_number} for board {board!r} "
-                "via webhook".format(
-                    issue_number=issue_number,
-                    board=board,
-                )
+            BoardIssue(board, issue_number).invalidate_cache()
+            board.invalidate_cache('issue_numbers')
+            board.invalidate_cache('pipelines')
+            events.publish(board, 'issue', number=issue_number)
+
+        logger.info(
+            "Applied issue {issue_number} changes for repository "
+            "'{repository}' via webhook (scheduled refresh: {stale})".format(
+                issue_number=issue_number,
+                repository=repository.full_name,
+                stale=', '.join(stale_resources) or 'none',
             )
+        )
 
 
 @receiver(zenhub_event)
-def invalidate_board_pipeline_cache(sender, event, payload, **kwargs):
+def update_board_pipeline_cache(sender, event, payload, **kwargs):
     """
-    Invalidate ZenHub board pipelines data when it changes.
+    Apply ZenHub board changes to cached data (or, if that's not possible,
+    schedule its refresh) when it changes.
     """
     if event in ['issue_transfer', 'issue_reprioritized']:
-        repository = '{}/{}'.format(
+        repository = Repository('{}/{}'.format(
             payload['organization'], payload['repo'],
-        )
-        boards = Board.objects.filter(github_repository=repository)
+        ))
+
+        # Raw ZenHub board is shared between all boards using the same
+        # repository, so it's updated (or refreshed) only once
+        stale_resources = apply_zenhub_event(repository, event, payload)
+        for resource in stale_resources:
+            tasks.schedule(repository, resource)
 
+        # Board pipelines are derived from the raw ZenHub board data, so they
+        # only need to be invalidated
+        boards = Board.objects.filter(
+            github_repository=repository.full_name,
+        )
         for board in boards:
             board.invalidate_cache('pipelines')
-            board.pipelines()
+            events.publish(board, 'pipelines')
 
-            logger.info(
-                "Updated pipelines for board {board!r} via webhook".format(
-                    board=board,
-                )
+        logger.info(
+            "Applied ZenHub board changes for repository '{repository}' "
+            "via webhook (scheduled refresh: {stale})".format(
+                repository=repository.full_name,
+                stale=', '.join(stale_resources) or 'none',
             )
+        )
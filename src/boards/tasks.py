@@ -0,0 +1,173 @@
+"""
+boards module background tasks
+
+Webhook handlers that can't apply the payload directly (see
+`boards.payloads`) only schedule board and repository cache refreshes, which
+are then run by a separate worker process (see `process_board_tasks`
+management command). Tasks are deduplicated and debounced per board (or
+repository) and resource, so a burst of webhooks about the same issue results
+in a single refresh.
+"""
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from django_redis import get_redis_connection
+
+from boards import events
+from boards.issues import BoardIssue
+from boards.models import Board
+from boards.repositories import Repository
+
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = 'boards:tasks'
+
+
+def schedule(target, resource):
+    """
+    Schedule a board or repository resource cache refresh. If the same
+    refresh is already scheduled, nothing happens, so all events that arrive
+    within the `BOARDS_TASKS_DEBOUNCE` seconds window result in a single
+    refresh.
+
+    :param target: board or repository instance
+    :type target: boards.models.Board or boards.repositories.Repository
+    :param resource: path to resource that we want to refresh
+    :type resource: str
+    """
+    redis = get_redis_connection('default')
+
+    if isinstance(target, Repository):
+        task = json.dumps(['repository', target.full_name, resource])
+    else:
+        task = json.dumps(['board', target.pk, resource])
+    run_at = time.time() + settings.BOARDS_TASKS_DEBOUNCE
+
+    redis.zadd(QUEUE_KEY, {task: run_at}, nx=True)
+
+
+def run(scope, identifier, resource):
+    """
+    Run a board or repository resource cache refresh.
+
+    :param scope: either 'board' or 'repository'
+    :type scope: str
+    :param identifier: board primary key or repository full name
+    :type identifier: int or str
+    :param resource: path to resource that we want to refresh
+    :type resource: str
+    """
+    if scope == 'repository':
+        target = Repository(identifier)
+
+        boards = Board.objects.filter(github_repository=identifier)
+
+        if resource == 'issues':
+            target.issues(refresh=True)
+
+            # Board issue numbers and pipelines are derived from the issues
+            # index, so they only need to be invalidated
+            for board in boards:
+                board.invalidate_cache('issue_numbers')
+                board.invalidate_cache('pipelines')
+                events.publish(board, 'pipelines')
+        elif resource.startswith('issue:'):
+            issue_number = int(resource.split(':')[1])
+            target.issue(issue_number, refresh=True)
+
+            # Board specific issue details are derived from the raw issue
+            # data, so they only need to be invalidated
+            for board in boards:
+                BoardIssue(board, issue_number).invalidate_cache()
+                events.publish(board, 'issue', number=issue_number)
+        elif resource == 'zenhub_board':
+            if not boards:
+                logger.warning(
+                    "No boards use repository '{}' anymore".format(identifier)
+                )
+                return
+
+            target.zenhub_board(
+                repository_id=boards[0].github_repository_id,
+                refresh=True,
+            )
+
+            # Board pipelines are derived from the raw ZenHub board data, so
+            # they only need to be invalidated
+            for board in boards:
+                board.invalidate_cache('pipelines')
+                events.publish(board, 'pipelines')
+        else:
+            logger.warning(
+                "Unknown repository resource '{}'".format(resource)
+            )
+            return
+    else:
+        try:
+            target = Board.objects.get(pk=identifier)
+        except Board.DoesNotExist:
+            logger.warning(
+                "Board with PK {} doesn't exist anymore".format(identifier)
+            )
+            return
+
+        if resource == 'pipelines':
+            target.pipelines(refresh=True)
+            events.publish(target, 'pipelines')
+        else:
+            logger.warning("Unknown board resource '{}'".format(resource))
+            return
+
+    logger.info(
+        "Refreshed '{resource}' for {target!r}".format(
+            resource=resource,
+            target=target,
+        )
+    )
+
+
+def process_due(limit=100):
+    """
+    Run scheduled tasks that are due. It's safe to run multiple workers at the
+    same time, as each task is claimed by only one of them.
+
+    :param limit: maximum number of tasks to run
+    :type limit: int
+    :returns: number of tasks that were run
+    :rtype: int
+    """
+    redis = get_redis_connection('default')
+
+    tasks = redis.zrangebyscore(
+        QUEUE_KEY, '-inf', time.time(), start=0, num=limit,
+    )
+
+    processed = 0
+    for task in tasks:
+        # Someone else already claimed it
+        if not redis.zrem(QUEUE_KEY, task):
+            continue
+
+        close_old_connections()
+
+        scope, identifier, resource = json.loads(task)
+        try:
+            run(scope, identifier, resource)
+        except Exception:
+            logger.exception(
+                "Refreshing '{resource}' for {scope} '{identifier}' "
+                "failed".format(
+                    resource=resource,
+                    scope=scope,
+                    identifier=identifier,
+                )
+            )
+
+        processed += 1
+
+    return processed
@@ -2,6 +2,7 @@
 board module template tags
 """
 from django import template
+from django.utils.safestring import mark_safe
 
 from boards.issues import BoardIssue
 from boards.models import Board
@@ -26,11 +27,14 @@ def user_available_boards(user):
     return Board.objects.for_user(user)
 
 
-@register.simple_tag
-def issue_details(board, issue_number):
+@register.simple_tag(takes_context=True)
+def issue_details(context, board, issue_number):
     """
-    Get issue details data.
+    Get issue details data. Uses issues details already present in the
+    template context (if possible), so we don't query the cache per issue.
 
+    :param context: template context
+    :type context: django.template.Context
     :param board: board instance
     :type board: boards.models.Board
     :param issue_number: issue number
@@ -38,5 +42,64 @@ def issue_details(board, issue_number):
     :returns: board issue details
     :rtype: dict
     """
+    issues_details = context.get('issues_details') or {}
+    if issue_number in issues_details:
+        return issues_details[issue_number]
+
     issue = BoardIssue(board, issue_number)
     return issue.details()
+
+
+class FragmentNode(template.Node):
+    """
+    Template node of the `fragment` template tag.
+    """
+    def __init__(self, nodelist, data):
+        self.nodelist = nodelist
+        self.data = data
+
+    def render(self, context):
+        data = self.data.resolve(context)
+
+        if data.get('fragment') is not None:
+            return mark_safe(data['fragment'])
+
+        content = self.nodelist.render(context)
+
+        rendered_fragments = context.get('rendered_fragments')
+        if data.get('fragment_timeout') and rendered_fragments is not None:
+            rendered_fragments[data['fragment_key']] = content
+
+        return content
+
+
+@register.tag
+def fragment(parser, token):
+    """
+    Output rendered fragment that was already read from cache (see
+    `boards.views.FragmentCacheMixin`), or render it again, so it's cached
+    once the whole template is rendered.
+
+    Usage::
+
+        {% fragment pipeline %}
+            ...
+        {% endfragment %}
+
+    :param parser: template parser
+    :type parser: django.template.base.Parser
+    :param token: template tag token
+    :type token: django.template.base.Token
+    :returns: template node
+    :rtype: FragmentNode
+    """
+    bits = token.split_contents()
+    if len(bits) != 2:
+        raise template.TemplateSyntaxError(
+            "'{}' tag takes exactly one argument".format(bits[0])
+        )
+
+    nodelist = parser.parse(('endfragment',))
+    parser.delete_first_token()
+
+    return FragmentNode(nodelist, parser.compile_filter(bits[1]))
@@ -12,4 +12,14 @@ urlpatterns = [
         views.BoardDetailView.as_view(),
         name='details',
     ),
+    url(
+        r'^(?P<slug>[-\w]+)/issues/(?P<issue_number>\d+)/card/$',
+        views.BoardIssueCardView.as_view(),
+        name='issue-card',
+    ),
+    url(
+        r'^(?P<slug>[-\w]+)/events/$',
+        views.BoardEventsView.as_view(),
+        name='events',
+    ),
 ]
@@ -1,19 +1,28 @@
 """
 boards module related views
 """
+import hashlib
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.views.generic import DetailView
+from django.core.cache import InvalidCacheBackendError, caches
+from django.core.cache.utils import make_template_fragment_key
+from django.db import connection
+from django.http import Http404, StreamingHttpResponse
+from django.views.generic import DetailView, View
+from django.views.generic.detail import SingleObjectMixin
 
-from boards import models
+from boards import changes, events, models
+from boards.caching import get_etag
+from boards.issues import BoardIssue
 
 
-class BoardDetailView(LoginRequiredMixin, DetailView):
+class UserBoardMixin(LoginRequiredMixin, SingleObjectMixin):
     """
-    Board instance detail view
+    Board instance views mixin, which makes sure that the logged in user
+    should be able to access the board
     """
     model = models.Board
-    template_name = 'boards/details.html'
-    context_object_name = 'board'
 
     def get_queryset(self):
         """
@@ -28,16 +37,287 @@ class BoardDetailView(LoginRequiredMixin, DetailView):
 
         return qs
 
+
+def get_fragment_cache():
+    """
+    Helper function for getting rendered fragments cache, which is the same
+    one that Django's `cache` template tag uses.
+
+    :returns: rendered fragments cache
+    :rtype: django.core.cache.backends.base.BaseCache
+    """
+    try:
+        return caches['template_fragments']
+    except InvalidCacheBackendError:
+        return caches['default']
+
+
+class FragmentCacheMixin:
+    """
+    Views mixin for caching rendered pipelines and issue cards fragments.
+
+    Fragments are read (in batches) before rendering and passed to the
+    template in pipelines (and issues) data, where the `fragment` template
+    tag either outputs them or renders them again. Fragments that were
+    rendered again are cached, all at once, after the whole template is
+    rendered.
+    """
+    def get_context_data(self, **kwargs):
+        """
+        Extends Django's `get_context_data` method and adds a container for
+        rendered fragments.
+        """
+        kwargs['rendered_fragments'] = dict()
+
+        return super().get_context_data(**kwargs)
+
+    def render_to_response(self, context, **response_kwargs):
+        """
+        Extends Django's `render_to_response` method and caches rendered
+        fragments once the response is rendered.
+        """
+        response = super().render_to_response(context, **response_kwargs)
+
+        def cache_fragments(response):
+            if context['rendered_fragments']:
+                get_fragment_cache().set_many(
+                    context['rendered_fragments'],
+                    timeout=settings.BOARDS_FRAGMENT_CACHE_TIMEOUT,
+                )
+
+        response.add_post_render_callback(cache_fragments)
+
+        return response
+
+
+class BoardDetailView(UserBoardMixin, FragmentCacheMixin, DetailView):
+    """
+    Board instance detail view
+    """
+    template_name = 'boards/details.html'
+    context_object_name = 'board'
+
     def get_context_data(self, **kwargs):
         """
         Extends Django's `get_context_data` method and adds board data.
+
+        Rendered pipelines and issue cards are cached, keyed by their data
+        ETags, so only the ones that changed are rendered again. Data that
+        isn't cached yet (so doesn't have an ETag) is always rendered.
+
+        Details of all issues whose cards are going to be rendered are
+        fetched at once, so expired card fragments don't result in a cache
+        round trip per issue card.
         """
         board = self.object
 
         # Check if user wants to force refresh
         if 'force_refresh' in self.request.GET:
-            board.invalidate_cache()
+            board.refresh_cache()
+
+        pipelines = board.pipelines()
+        pipelines_etag = get_etag(board.get_cache_key('pipelines'))
+
+        issue_numbers = [
+            issue['number']
+            for pipeline in pipelines
+            for issue in pipeline['issues']
+        ]
+
+        # Only get details of the issues that aren't cached (all at once),
+        # as cached ones are only needed for rendering changed issue cards
+        issues_etags = BoardIssue.etags_many(board, issue_numbers)
+        missing = [
+            issue_number for issue_number, etag in issues_etags.items()
+            if not etag
+        ]
+        issues_details = dict()
+        if missing:
+            issues_details.update(BoardIssue.details_many(board, missing))
+            issues_etags.update(BoardIssue.etags_many(board, missing))
+
+        # Cached pipelines data is shared, so we work on copies
+        kwargs['pipelines'] = [
+            get_pipeline_fragment_data(
+                board, pipeline, pipelines_etag, issues_etags,
+            )
+            for pipeline in pipelines
+        ]
+
+        # Issue cards that aren't rendered from cache need issue details
+        expired = [
+            issue_number
+            for issue_number in self.prefetch_fragments(kwargs['pipelines'])
+            if issue_number not in issues_details
+        ]
+        if expired:
+            issues_details.update(BoardIssue.details_many(board, expired))
+
+        kwargs['issues_details'] = issues_details
+
+        # Live updates only fetch pipelines changes since this version
+        kwargs['pipelines_version'] = changes.get_version(board)
+
+        return super().get_context_data(**kwargs)
+
+    @staticmethod
+    def prefetch_fragments(pipelines):
+        """
+        Helper method for reading cached pipelines and issue cards fragments
+        into their data. Only cards of pipelines whose own fragments aren't
+        cached are going to be rendered, so only their fragments are read.
+
+        :param pipelines: pipelines data with fragment cache data
+        :type pipelines: list
+        :returns: numbers of issues whose cards are going to be rendered
+        :rtype: list
+        """
+        fragment_cache = get_fragment_cache()
+
+        cached = fragment_cache.get_many([
+            pipeline['fragment_key'] for pipeline in pipelines
+            if pipeline['fragment_timeout']
+        ])
+
+        issues = list()
+        for pipeline in pipelines:
+            pipeline['fragment'] = cached.get(pipeline['fragment_key'])
+            if pipeline['fragment'] is None:
+                issues.extend(pipeline['issues'])
+
+        if not issues:
+            return []
+
+        cached = fragment_cache.get_many([
+            issue['fragment_key'] for issue in issues
+            if issue['fragment_timeout']
+        ])
+
+        for issue in issues:
+            issue['fragment'] = cached.get(issue['fragment_key'])
+
+        return [
+            issue['number'] for issue in issues if issue['fragment'] is None
+        ]
+
+
+def get_pipeline_fragment_data(board, pipeline, pipelines_etag,
+                               issues_etags):
+    """
+    Helper function for adding rendered fragments cache data to pipeline
+    (and its issues) data.
+
+    :param board: board instance
+    :type board: boards.models.Board
+    :param pipeline: pipeline data
+    :type pipeline: dict
+    :param pipelines_etag: board pipelines ETag
+    :type pipelines_etag: str
+    :param issues_etags: issue details ETags, keyed by issue number
+    :type issues_etags: dict
+    :returns: pipeline data copy with fragment cache data
+    :rtype: dict
+    """
+    timeout = settings.BOARDS_FRAGMENT_CACHE_TIMEOUT
+
+    # Card markup depends on whether it's the first one in the pipeline
+    issues = [
+        dict(
+            issue,
+            details_etag=issues_etags.get(issue['number']),
+            fragment_key=make_template_fragment_key('board_issue_card', [
+                board.pk, issue['number'], issue['title'],
+                issues_etags.get(issue['number']), position == 0,
+            ]),
+            fragment_timeout=(
+                timeout if issues_etags.get(issue['number']) else 0
+            ),
+        )
+        for position, issue in enumerate(pipeline['issues'])
+    ]
+
+    fragment_version = None
+    if pipelines_etag and all(issue['details_etag'] for issue in issues):
+        fragment_version = hashlib.sha1(''.join(
+            [pipelines_etag, pipeline['name']] +
+            [issue['details_etag'] for issue in issues]
+        ).encode()).hexdigest()
+
+    return dict(
+        pipeline,
+        issues=issues,
+        fragment_key=make_template_fragment_key(
+            'board_pipeline', [board.pk, fragment_version],
+        ),
+        fragment_timeout=timeout if fragment_version else 0,
+    )
+
+
+class BoardIssueCardView(UserBoardMixin, FragmentCacheMixin, DetailView):
+    """
+    Board issue card view, which renders a single issue card, so it can be
+    updated in place when the issue changes (see `BoardEventsView`)
+    """
+    template_name = 'boards/partials/issue_card.html'
+    context_object_name = 'board'
+
+    def get_context_data(self, **kwargs):
+        """
+        Extends Django's `get_context_data` method and adds issue card data.
+
+        Card is rendered exactly like on the board page, so its cached
+        fragment is shared with it.
+        """
+        board = self.object
+        issue_number = int(self.kwargs['issue_number'])
+
+        for pipeline in board.pipelines():
+            issue_numbers = [issue['number'] for issue in pipeline['issues']]
+            if issue_number in issue_numbers:
+                break
+        else:
+            raise Http404("Issue #{} isn't on the board".format(issue_number))
+
+        pipeline = get_pipeline_fragment_data(
+            board,
+            pipeline,
+            get_etag(board.get_cache_key('pipelines')),
+            BoardIssue.etags_many(board, [issue_number]),
+        )
+        position = issue_numbers.index(issue_number)
 
-        kwargs['pipelines'] = board.pipelines()
+        issue = pipeline['issues'][position]
+        if issue['fragment_timeout']:
+            issue['fragment'] = get_fragment_cache().get(issue['fragment_key'])
+
+        kwargs['issue'] = issue
+        kwargs['forloop'] = {'first': position == 0}
 
         return super().get_context_data(**kwargs)
+
+
+class BoardEventsView(UserBoardMixin, View):
+    """
+    Board instance live updates view, which streams board events in
+    Server-Sent Events format (see `boards.events`)
+    """
+    def get(self, request, *args, **kwargs):
+        """
+        Stream board events until the client disconnects or the stream times
+        out (and the client reconnects).
+        """
+        board = self.get_object()
+
+        # Database connection is otherwise only closed (and returned) when
+        # the whole stream finishes
+        connection.close()
+
+        response = StreamingHttpResponse(
+            events.stream(board),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control'] = 'no-cache'
+        # Make sure that reverse proxies (i.e. nginx) don't buffer the stream
+        response['X-Accel-Buffering'] = 'no'
+
+        return response
@@ -0,0 +1,150 @@
+"""
+webhooks module IP allowlist related code
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+from ipaddress import ip_network
+
+from django.conf import settings
+from django.core.cache import cache
+
+from zenboard.utils import github_api
+
+
+logger = logging.getLogger(__name__)
+
+
+class SubnetIndex:
+    """
+    Precompiled IP subnets lookup structure. Subnets are grouped by IP version
+    and prefix length, so checking an IP address costs one set lookup per
+    distinct prefix length, instead of scanning all subnets.
+    """
+    def __init__(self, subnets):
+        """
+        Initializes the instance with passed subnets.
+
+        :param subnets: IP subnets in CIDR notation
+        :type subnets: list of str
+        """
+        prefixes = defaultdict(set)
+        for subnet in subnets:
+            network = ip_network(subnet)
+            shift = network.max_prefixlen - network.prefixlen
+            prefixes[network.version, shift].add(
+                int(network.network_address) >> shift
+            )
+
+        self._prefixes = defaultdict(list)
+        for (version, shift), networks in prefixes.items():
+            self._prefixes[version].append((shift, frozenset(networks)))
+
+    def __contains__(self, ip):
+        """
+        Check if passed IP address belongs to any of the subnets.
+
+        :param ip: IP address
+        :type ip: ipaddress.IPv4Address or ipaddress.IPv6Address
+        :returns: whether IP address belongs to any of the subnets
+        :rtype: bool
+        """
+        ip_int = int(ip)
+        return any(
+            ip_int >> shift in networks
+            for shift, networks in self._prefixes[ip.version]
+        )
+
+
+class GitHubHooksAllowlist:
+    """
+    GitHub webhooks IP allowlist. It's based on the 'hooks' subnets from
+    GitHub meta API endpoint, which are cached (both in process and in Redis,
+    so it's shared between workers) and refreshed every
+    `GITHUB_HOOKS_REFRESH_INTERVAL` seconds. If the refresh fails, the last
+    good copy is used.
+
+    Docs:
+        https://developer.github.com/v3/meta/
+    """
+    cache_key = 'webhooks:github_hooks'
+    last_good_cache_key = 'webhooks:github_hooks:last_good'
+
+    def __init__(self):
+        self._index = None
+        self._refreshed_at = None
+        self._lock = threading.Lock()
+
+    def _get_subnets(self):
+        """
+        Get cached (if possible) GitHub webhooks subnets.
+
+        :returns: GitHub webhooks subnets (if available)
+        :rtype: list of str or None
+        """
+        subnets = cache.get(self.cache_key)
+        if subnets:
+            return subnets
+
+        try:
+            subnets = github_api.meta().get('hooks')
+        except Exception:
+            logger.exception("Couldn't get GitHub webhooks subnets")
+            subnets = None
+
+        if subnets:
+            cache.set(
+                self.cache_key, subnets,
+                timeout=settings.GITHUB_HOOKS_REFRESH_INTERVAL,
+            )
+            cache.set(self.last_good_cache_key, subnets, timeout=None)
+        else:
+            subnets = cache.get(self.last_good_cache_key)
+
+        return subnets
+
+    def is_expired(self):
+        """
+        Helper method for checking if GitHub webhooks subnets index has to be
+        refreshed.
+
+        :returns: whether the index has to be refreshed
+        :rtype: bool
+        """
+        return (
+            self._refreshed_at is None or
+            time.monotonic() > self._refreshed_at +
+            settings.GITHUB_HOOKS_REFRESH_INTERVAL
+        )
+
+    def refresh(self):
+        """
+        Refresh GitHub webhooks subnets index. Current index is kept if we
+        couldn't get the subnets.
+        """
+        subnets = self._get_subnets()
+        if subnets:
+            self._index = SubnetIndex(subnets)
+
+        self._refreshed_at = time.monotonic()
+
+    def __contains__(self, ip):
+        """
+        Check if passed IP address belongs to GitHub webhooks subnets.
+
+        :param ip: IP address
+        :type ip: ipaddress.IPv4Address or ipaddress.IPv6Address
+        :returns: whether IP address belongs to GitHub webhooks subnets
+        :rtype: bool
+        """
+        if self.is_expired():
+            with self._lock:
+                # Someone else could have refreshed it while we were waiting
+                if self.is_expired():
+                    self.refresh()
+
+        return self._index is not None and ip in self._index
+
+
+github_hooks_allowlist = GitHubHooksAllowlist()
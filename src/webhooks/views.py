@@ -5,7 +5,7 @@ import hashlib
 import hmac
 import json
 from http import HTTPStatus
-from ipaddress import ip_address, ip_network
+from ipaddress import ip_address
 
 from django.conf import settings
 from django.http import (
@@ -20,8 +20,8 @@ from django.views.decorators.csrf import csrf_exempt
 
 from ipware.ip import get_ip
 
+from webhooks.allowlist import github_hooks_allowlist
 from webhooks.signals import github_event, zenhub_event
-from zenboard.utils import github_api
 
 
 class GitHubWebhookReceiverView(View):
@@ -39,13 +39,7 @@ class GitHubWebhookReceiverView(View):
         # Make sure request is from GitHub
         request_ip = ip_address(get_ip(request))
 
-        github_meta = github_api.meta()
-        whitelisted_subnets = [ip_network(n) for n in github_meta['hooks']]
-
-        for subnet in whitelisted_subnets:
-            if request_ip in subnet:
-                break
-        else:
+        if request_ip not in github_hooks_allowlist:
             return HttpResponseForbidden("Non whitelisted IP")
 
         # Check signature if GitHub webhook secret is set
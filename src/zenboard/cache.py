@@ -0,0 +1,164 @@
+"""
+zenboard cache related helpers
+
+Pluggable `django-redis` serializer and compressor, which can store cached
+values more compactly than the default ones. See
+`benchmarks/cache_serialization.py` for how they compare on board data.
+"""
+import pickle
+import zlib
+from datetime import datetime
+
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.dateparse import parse_datetime
+
+from django_redis.compressors.base import BaseCompressor
+from django_redis.exceptions import CompressorError
+from django_redis.serializers.base import BaseSerializer
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
+class MsgPackSerializer(BaseSerializer):
+    """
+    `django-redis` serializer based on MessagePack, with support for
+    datetimes and non string dictionary keys. Values that MessagePack can't
+    represent are pickled instead.
+
+    Serialized values are prefixed with a format marker, so values cached by
+    the default pickle serializer (i.e. before switching to this one) can
+    still be read.
+
+    Docs:
+        https://msgpack.org/
+    """
+    msgpack_marker = b'M'
+    pickle_marker = b'P'
+
+    datetime_ext_type = 1
+
+    def __init__(self, options):
+        """
+        Initializes the instance with passed cache options.
+
+        :param options: cache options
+        :type options: dict
+        """
+        if msgpack is None:
+            raise ImproperlyConfigured(
+                "'msgpack' package is required for using MsgPackSerializer"
+            )
+
+        self._pickle_version = options.get(
+            'PICKLE_VERSION', pickle.HIGHEST_PROTOCOL,
+        )
+
+    def _default(self, obj):
+        """
+        Helper method for serializing types that MessagePack doesn't support.
+        """
+        if isinstance(obj, datetime):
+            return msgpack.ExtType(
+                self.datetime_ext_type, obj.isoformat().encode(),
+            )
+
+        raise TypeError("Can't serialize {!r}".format(obj))
+
+    def _ext_hook(self, code, data):
+        """
+        Helper method for deserializing types that MessagePack doesn't
+        support.
+        """
+        if code == self.datetime_ext_type:
+            return parse_datetime(data.decode())
+
+        return msgpack.ExtType(code, data)
+
+    def dumps(self, value):
+        """
+        Serialize passed value.
+
+        :param value: value to serialize
+        :returns: serialized value
+        :rtype: bytes
+        """
+        try:
+            return self.msgpack_marker + msgpack.packb(
+                value, default=self._default, use_bin_type=True,
+            )
+        except (TypeError, ValueError, OverflowError):
+            return self.pickle_marker + pickle.dumps(
+                value, self._pickle_version,
+            )
+
+    def loads(self, value):
+        """
+        Deserialize passed value.
+
+        :param value: serialized value
+        :type value: bytes
+        :returns: deserialized value
+        """
+        marker, data = value[:1], value[1:]
+
+        if marker == self.msgpack_marker:
+            return msgpack.unpackb(
+                data, ext_hook=self._ext_hook, raw=False,
+                strict_map_key=False,
+            )
+        elif marker == self.pickle_marker:
+            return pickle.loads(data)
+
+        return pickle.loads(value)
+
+
+class ZlibCompressor(BaseCompressor):
+    """
+    `django-redis` zlib compressor, that only compresses values larger than
+    `COMPRESS_MIN_LENGTH` bytes (and only keeps the compressed value if it's
+    actually smaller).
+    """
+    def __init__(self, options):
+        """
+        Initializes the instance with passed cache options.
+
+        :param options: cache options
+        :type options: dict
+        """
+        super().__init__(options)
+        self.min_length = options.get('COMPRESS_MIN_LENGTH', 1024)
+        self.level = options.get('COMPRESS_LEVEL', 6)
+
+    def compress(self, value):
+        """
+        Compress passed value, if it's large enough.
+
+        :param value: serialized value
+        :type value: bytes
+        :returns: (possibly) compressed value
+        :rtype: bytes
+        """
+        if len(value) < self.min_length:
+            return value
+
+        compressed = zlib.compress(value, self.level)
+
+        return compressed if len(compressed) < len(value) else value
+
+    def decompress(self, value):
+        """
+        Decompress passed value. Uncompressed values raise `CompressorError`,
+        which `django-redis` handles by using them as they are.
+
+        :param value: (possibly) compressed value
+        :type value: bytes
+        :returns: decompressed value
+        :rtype: bytes
+        """
+        try:
+            return zlib.decompress(value)
+        except zlib.error as e:
+            raise CompressorError(e)
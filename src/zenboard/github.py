@@ -0,0 +1,162 @@
+"""
+zenboard GitHub API related helpers
+"""
+import hashlib
+
+from requests.adapters import HTTPAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+
+class ETagStore:
+    """
+    Persistent store of GitHub API responses, keyed by request URL (and
+    headers that could change the response), used for making conditional
+    requests.
+    """
+    key_prefix = 'github:etag'
+
+    # Headers that change the response body for the same URL
+    vary_headers = ('Accept', 'Authorization')
+
+    def __init__(self, cache, timeout=None):
+        """
+        Initializes the instance with passed cache backend.
+
+        :param cache: Django cache backend
+        :type cache: django.core.cache.backends.base.BaseCache
+        :param timeout: stored responses cache timeout
+        :type timeout: int
+        """
+        self._cache = cache
+        self._timeout = timeout
+
+    def get_cache_key(self, request):
+        """
+        Helper method for generating a request unique cache key.
+
+        :param request: prepared HTTP request
+        :type request: requests.PreparedRequest
+        :returns: request unique cache key
+        :rtype: str
+        """
+        request_hash = hashlib.sha1(request.url.encode())
+        for header in self.vary_headers:
+            request_hash.update(request.headers.get(header, '').encode())
+
+        return '{prefix}:{hash}'.format(
+            prefix=self.key_prefix,
+            hash=request_hash.hexdigest(),
+        )
+
+    def get(self, request):
+        """
+        Get stored response data for passed request.
+
+        :param request: prepared HTTP request
+        :type request: requests.PreparedRequest
+        :returns: stored response data (if available)
+        :rtype: dict or None
+        """
+        return self._cache.get(self.get_cache_key(request))
+
+    def set(self, request, response):
+        """
+        Store response data for passed request.
+
+        :param request: prepared HTTP request
+        :type request: requests.PreparedRequest
+        :param response: HTTP response
+        :type response: requests.Response
+        """
+        self._cache.set(
+            self.get_cache_key(request),
+            {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'headers': dict(response.headers),
+                'content': response.content,
+            },
+            timeout=self._timeout,
+        )
+
+
+class ConditionalRequestsAdapter(HTTPAdapter):
+    """
+    `requests` transport adapter that makes GET requests conditional, based on
+    `ETag` and `Last-Modified` headers of previously stored responses. On
+    '304 Not Modified' response, the stored response is returned instead.
+
+    GitHub doesn't count '304 Not Modified' responses against the rate limit,
+    so refreshing unchanged data is (almost) free.
+
+    Docs:
+        https://developer.github.com/v3/#conditional-requests
+    """
+    def __init__(self, store, *args, **kwargs):
+        """
+        Initializes the instance with passed ETag store.
+
+        :param store: ETag store
+        :type store: zenboard.github.ETagStore
+        """
+        self.store = store
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        """
+        Extend `HTTPAdapter.send` method and make GET requests conditional.
+        """
+        # Don't interfere with non GET or already conditional requests
+        if request.method != 'GET' or 'If-None-Match' in request.headers:
+            return super().send(request, **kwargs)
+
+        stored = self.store.get(request)
+        if stored:
+            if stored['etag']:
+                request.headers['If-None-Match'] = stored['etag']
+            if stored['last_modified']:
+                request.headers['If-Modified-Since'] = stored['last_modified']
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and stored:
+            return self.build_stored_response(request, response, stored)
+
+        if response.status_code == 200 and (
+                'ETag' in response.headers or
+                'Last-Modified' in response.headers):
+            self.store.set(request, response)
+
+        return response
+
+    def build_stored_response(self, request, response, stored):
+        """
+        Build a response from stored response data.
+
+        :param request: prepared HTTP request
+        :type request: requests.PreparedRequest
+        :param response: '304 Not Modified' HTTP response
+        :type response: requests.Response
+        :param stored: stored response data
+        :type stored: dict
+        :returns: stored HTTP response
+        :rtype: requests.Response
+        """
+        stored_response = Response()
+        stored_response.status_code = 200
+        stored_response.reason = 'OK'
+        stored_response.url = request.url
+        stored_response.request = request
+        stored_response.connection = self
+        stored_response.encoding = response.encoding
+        stored_response._content = stored['content']
+
+        # Fresh rate limit data is more useful than the stored one
+        stored_response.headers = CaseInsensitiveDict(stored['headers'])
+        stored_response.headers.update({
+            header: value for header, value in response.headers.items()
+            if header.lower().startswith('x-ratelimit')
+        })
+
+        return stored_response
@@ -106,6 +106,108 @@ BOARDS_CACHE_TIMEOUT = config(
     default=None,
 )
 
+# Board cache keys are versioned, so invalidated entries are never deleted
+# and have to expire on their own. This is their timeout if
+# 'BOARDS_CACHE_TIMEOUT' isn't set
+BOARDS_CACHE_MAX_TIMEOUT = config(
+    'BOARDS_CACHE_MAX_TIMEOUT',
+    default=60 * 60 * 24 * 7,  # 1 week
+    cast=int,
+)
+
+# After this many seconds cached board data is considered stale - it's still
+# served, but it's also refreshed in the background. Disabled if not set
+BOARDS_CACHE_SOFT_TIMEOUT = config(
+    'BOARDS_CACHE_SOFT_TIMEOUT',
+    default=None,
+    cast=lambda v: int(v) if v else None,
+)
+
+# Board issues are synced incrementally, but every this many seconds we do
+# a full sync, which also catches deleted issues
+BOARDS_FULL_SYNC_INTERVAL = config(
+    'BOARDS_FULL_SYNC_INTERVAL',
+    default=60 * 60 * 24,  # 1 day
+    cast=int,
+)
+
+# Webhook triggered board refreshes are delayed by this many seconds, so a
+# burst of events about the same resource results in a single refresh
+BOARDS_TASKS_DEBOUNCE = config(
+    'BOARDS_TASKS_DEBOUNCE',
+    default=5,
+    cast=int,
+)
+
+# How long (in seconds) can a single process hold the lock for rebuilding
+# a board cache value, before others stop waiting for it
+BOARDS_CACHE_LOCK_TIMEOUT = config(
+    'BOARDS_CACHE_LOCK_TIMEOUT',
+    default=60,
+    cast=int,
+)
+
+# Hot board cache entries are also cached in process, in an LRU cache bounded
+# by number of entries and their size in bytes. Disabled if set to 0
+BOARDS_LOCAL_CACHE_MAX_ENTRIES = config(
+    'BOARDS_LOCAL_CACHE_MAX_ENTRIES',
+    default=256,
+    cast=int,
+)
+
+BOARDS_LOCAL_CACHE_MAX_BYTES = config(
+    'BOARDS_LOCAL_CACHE_MAX_BYTES',
+    default=32 * 1024 * 1024,  # 32 MiB
+    cast=int,
+)
+
+# In process cache entries are invalidated through Redis pub/sub, but they
+# also expire after this many seconds, just to be safe
+BOARDS_LOCAL_CACHE_TIMEOUT = config(
+    'BOARDS_LOCAL_CACHE_TIMEOUT',
+    default=60,
+    cast=int,
+)
+
+# Rendered board pipelines and issue cards are cached for this many seconds.
+# They're keyed by their data version, so this only limits how outdated
+# relative times (i.e. '3 minutes ago') can get
+BOARDS_FRAGMENT_CACHE_TIMEOUT = config(
+    'BOARDS_FRAGMENT_CACHE_TIMEOUT',
+    default=60,
+    cast=int,
+)
+
+# Maximum number of board pipelines changes kept for the pipelines API delta
+# responses. Clients that are further behind get a full snapshot
+BOARDS_CHANGE_LOG_MAX_LENGTH = config(
+    'BOARDS_CHANGE_LOG_MAX_LENGTH',
+    default=1000,
+    cast=int,
+)
+
+# Board live updates streams are closed (and reopened by the browser) after
+# this many seconds, so they don't hold web server workers forever
+BOARDS_EVENTS_STREAM_TIMEOUT = config(
+    'BOARDS_EVENTS_STREAM_TIMEOUT',
+    default=300,
+    cast=int,
+)
+
+# Maximum number of threads used for concurrent GitHub and ZenHub API calls
+UPSTREAM_MAX_WORKERS = config(
+    'UPSTREAM_MAX_WORKERS',
+    default=8,
+    cast=int,
+)
+
+# How long (in seconds) should we wait for concurrent upstream API calls
+UPSTREAM_TIMEOUT = config(
+    'UPSTREAM_TIMEOUT',
+    default=30,
+    cast=int,
+)
+
 
 CACHES = {
     'default': {
@@ -116,6 +218,23 @@ CACHES = {
         'TIMEOUT': DEFAULT_CACHE_TIMEOUT,
         'OPTIONS': {
             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            # 'zenboard.cache.MsgPackSerializer' is also available (it
+            # requires 'msgpack' package), but on board data it's both
+            # bigger and slower than compressed pickle
+            'SERIALIZER': config(
+                'REDIS_CACHE_SERIALIZER',
+                default='django_redis.serializers.pickle.PickleSerializer',
+            ),
+            'COMPRESSOR': config(
+                'REDIS_CACHE_COMPRESSOR',
+                default='zenboard.cache.ZlibCompressor',
+            ),
+            # Only values larger than this many bytes are compressed
+            'COMPRESS_MIN_LENGTH': config(
+                'REDIS_CACHE_COMPRESS_MIN_LENGTH',
+                default=1024,
+                cast=int,
+            ),
         },
     }
 }
@@ -145,6 +264,42 @@ ZENHUB_API_TOKEN = config('ZENHUB_API_TOKEN', default='')
 
 GITHUB_WEBHOOK_SECRET = config('GITHUB_WEBHOOK_SECRET', default='')
 
+# How often (in seconds) should GitHub webhooks IP allowlist be refreshed
+GITHUB_HOOKS_REFRESH_INTERVAL = config(
+    'GITHUB_HOOKS_REFRESH_INTERVAL',
+    default=60 * 60,  # 1 hour
+    cast=int,
+)
+
+# How long (in seconds) should GitHub API responses be stored for making
+# conditional requests
+GITHUB_ETAG_CACHE_TIMEOUT = config(
+    'GITHUB_ETAG_CACHE_TIMEOUT',
+    default=60 * 60 * 24 * 7,  # 1 week
+    cast=int,
+)
+
+# ZenHub API read timeout (in seconds)
+ZENHUB_API_TIMEOUT = config(
+    'ZENHUB_API_TIMEOUT',
+    default=30,
+    cast=float,
+)
+
+# How many times should failed ZenHub API requests be retried
+ZENHUB_API_MAX_RETRIES = config(
+    'ZENHUB_API_MAX_RETRIES',
+    default=3,
+    cast=int,
+)
+
+# ZenHub API rate limit (requests per minute), shared between all processes
+ZENHUB_API_RATE_LIMIT = config(
+    'ZENHUB_API_RATE_LIMIT',
+    default=100,
+    cast=int,
+)
+
 
 # Misc
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
@@ -2,11 +2,18 @@
 zenboard utils
 """
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from django_redis import get_redis_connection
 from github3 import GitHub
 
-from zenhub_api import ZenHubAPI
+from zenboard.github import ConditionalRequestsAdapter, ETagStore
+from zenhub_api import RedisRateLimiter, ZenHubAPI
 
 
 logger = logging.getLogger(__name__)
@@ -30,10 +37,69 @@ github_api = GitHub(
     token=settings.GITHUB_TOKEN,
 )
 
+# Make GitHub API GET requests conditional
+github_api._session.mount(
+    'https://api.github.com',
+    ConditionalRequestsAdapter(
+        store=ETagStore(cache, timeout=settings.GITHUB_ETAG_CACHE_TIMEOUT),
+    ),
+)
+
 
 if not settings.GITHUB_TOKEN:
     logging.warning("ZenHub API token not found")
 
 zenhub_api = ZenHubAPI(
     token=settings.ZENHUB_API_TOKEN,
+    timeout=(3.05, settings.ZENHUB_API_TIMEOUT),
+    max_retries=settings.ZENHUB_API_MAX_RETRIES,
+    pool_maxsize=settings.UPSTREAM_MAX_WORKERS,
+    rate_limiter=RedisRateLimiter(
+        redis=get_redis_connection('default'),
+        limit=settings.ZENHUB_API_RATE_LIMIT,
+    ),
+    # Concurrent upstream calls are abandoned after `UPSTREAM_TIMEOUT`, so
+    # waiting for the rate limiter has to leave time for the request itself
+    # (instead of holding an upstream thread that no one waits for)
+    max_rate_limit_wait=settings.UPSTREAM_TIMEOUT / 3,
+)
+
+
+# Shared, bounded thread pool for concurrent upstream API calls
+upstream_executor = ThreadPoolExecutor(
+    max_workers=settings.UPSTREAM_MAX_WORKERS,
+    thread_name_prefix='upstream',
 )
+
+
+def call_concurrently(*functions):
+    """
+    Call passed functions concurrently, using the shared upstream thread
+    pool, and return their results. The first exception raised by any of
+    them (or `concurrent.futures.TimeoutError`, if they don't finish within
+    `UPSTREAM_TIMEOUT` seconds) is raised.
+
+    Functions called from the pool threads themselves are called one after
+    another, as waiting for other pool threads there could exhaust the pool.
+
+    :param functions: functions to call
+    :type functions: callable
+    :returns: functions results, in the same order
+    :rtype: list
+    """
+    if threading.current_thread().name.startswith('upstream'):
+        return [function() for function in functions]
+
+    def call(function):
+        try:
+            return function()
+        finally:
+            connection.close()
+
+    futures = [
+        upstream_executor.submit(call, function) for function in functions
+    ]
+
+    return [
+        future.result(timeout=settings.UPSTREAM_TIMEOUT) for future in futures
+    ]
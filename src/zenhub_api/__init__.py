@@ -1 +1,2 @@
 from zenhub_api.api import ZenHubAPI  # noqa
+from zenhub_api.ratelimit import RateLimiter, RedisRateLimiter  # noqa
@@ -1,14 +1,39 @@
 """
 ZenHub API wrapper
 """
-from collections import OrderedDict
+import logging
+import random
+import threading
+import time
+from collections import Counter, OrderedDict
 from urllib.parse import urljoin
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from zenhub_api.ratelimit import RateLimiter
+
+
+logger = logging.getLogger(__name__)
 
 
 class ZenHubAPIError(Exception):
     """Base ZenHub API error"""
+    def __init__(self, message, response=None):
+        """
+        Initializes the instance with passed error message and API response.
+
+        :param message: error message
+        :type message: str
+        :param response: API response (if there was one)
+        :type response: requests.Response
+        """
+        super().__init__(message)
+        self.response = response
+
+
+class ZenHubAPIRateLimitError(ZenHubAPIError):
+    """ZenHub API rate limit error"""
     pass
 
 
@@ -20,25 +45,124 @@ class ZenHubAPI(object):
     possibility of extending that functionality and possibly releasing as open
     source in the future.
 
+    Requests are made over a pooled connection, with timeouts, and throttled
+    to stay within the API rate limit. Connection errors, server errors and
+    rate limit errors of idempotent requests are retried, with jittered
+    exponential backoff.
+
     Docs:
         https://github.com/ZenHubIO/API
     """
     api_url = 'https://api.zenhub.io/p1/'
 
-    def __init__(self, token):
+    idempotent_methods = ('get', 'head', 'options')
+    retry_status_codes = (429, 500, 502, 503, 504)
+
+    def __init__(self, token, api_url=None, timeout=(3.05, 30), max_retries=3,
+                 backoff_factor=0.5, max_backoff=30, pool_maxsize=10,
+                 rate_limiter=None, max_rate_limit_wait=60):
         """
-        Initializes the instance with passed API token.
+        Initializes the instance with passed API token and options.
 
         :param token: ZenHub API token
         :type token: str
+        :param api_url: ZenHub API URL
+        :type api_url: str
+        :param timeout: connect and read timeouts (in seconds)
+        :type timeout: float or tuple
+        :param max_retries: maximum number of retries of failed requests
+        :type max_retries: int
+        :param backoff_factor: base of the exponential backoff (in seconds)
+        :type backoff_factor: float
+        :param max_backoff: maximum backoff between retries (in seconds)
+        :type max_backoff: float
+        :param pool_maxsize: maximum number of pooled connections
+        :type pool_maxsize: int
+        :param rate_limiter: rate limiter (in process one by default)
+        :type rate_limiter: zenhub_api.ratelimit.RateLimiter
+        :param max_rate_limit_wait: maximum time (in seconds) to wait for the
+            rate limiter
+        :type max_rate_limit_wait: float
         """
+        self.api_url = api_url or self.api_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_rate_limit_wait = max_rate_limit_wait
+
+        self._stats = Counter()
+        self._stats_lock = threading.Lock()
+
         self._session = requests.Session()
+        self._session.mount(self.api_url, HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_maxsize,
+        ))
 
         # See https://github.com/ZenHubIO/API#authentication
         self._session.headers.update({
             'X-Authentication-Token': token,
         })
 
+    @property
+    def stats(self):
+        """
+        Helper property that returns API usage counters - number of requests,
+        retries, errors, rate limit errors ('429 Too Many Requests' responses)
+        and time spent waiting for the rate limiter.
+
+        :returns: API usage counters
+        :rtype: dict
+        """
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _count(self, counter, value=1):
+        """
+        Helper method for incrementing API usage counters.
+
+        :param counter: counter name
+        :type counter: str
+        :param value: counter increment
+        :type value: int or float
+        """
+        with self._stats_lock:
+            self._stats[counter] += value
+
+    def _backoff(self, attempt):
+        """
+        Helper method for waiting before retrying a request.
+
+        :param attempt: number of the failed attempt (starting at 0)
+        :type attempt: int
+        """
+        delay = random.uniform(0, min(
+            self.max_backoff, self.backoff_factor * 2 ** attempt,
+        ))
+        time.sleep(delay)
+
+    @staticmethod
+    def _get_error_message(response):
+        """
+        Helper method for getting API error message, which isn't always JSON.
+
+        :param response: API response
+        :type response: requests.Response
+        :returns: error message
+        :rtype: str
+        """
+        try:
+            message = response.json()
+        except ValueError:
+            message = response.text[:200] or response.reason
+
+        return "{status}: {message}".format(
+            status=response.status_code,
+            message=message,
+        )
+
     def _get_response(self, method, endpoint, params=None):
         """
         Helper method to handle HTTP requests and catch API errors.
@@ -53,14 +177,69 @@ class ZenHubAPI(object):
         :rtype: Response
         """
         url = urljoin(self.api_url, endpoint)
-        response = getattr(self._session, method)(url, params=params)
+        retries = self.max_retries if method in self.idempotent_methods else 0
 
-        if response.status_code != requests.codes.ok:
-            raise ZenHubAPIError(
-                "Something went wrong: {}".format(response.json())
+        for attempt in range(retries + 1):
+            waited = self.rate_limiter.acquire(
+                max_wait=self.max_rate_limit_wait,
             )
+            if waited is None:
+                self._count('errors')
+                raise ZenHubAPIRateLimitError(
+                    "ZenHub API rate limit would be exceeded"
+                )
+            self._count('rate_limit_wait', waited)
+
+            self._count('requests')
+            try:
+                response = self._session.request(
+                    method, url, params=params, timeout=self.timeout,
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt < retries:
+                    logger.warning(
+                        "ZenHub API request failed, retrying: {}".format(e)
+                    )
+                    self._count('retries')
+                    self._backoff(attempt)
+                    continue
+
+                self._count('errors')
+                raise ZenHubAPIError(
+                    "Couldn't connect to ZenHub API: {}".format(e)
+                ) from e
+
+            self.rate_limiter.update(response.headers, response.status_code)
+
+            if response.status_code == requests.codes.ok:
+                return response
 
-        return response
+            if response.status_code == requests.codes.too_many_requests:
+                self._count('rate_limit_errors')
+
+            if (response.status_code in self.retry_status_codes and
+                    attempt < retries):
+                logger.warning(
+                    "ZenHub API request failed, retrying: {}".format(
+                        self._get_error_message(response),
+                    )
+                )
+                self._count('retries')
+                self._backoff(attempt)
+                continue
+
+            self._count('errors')
+            error_class = (
+                ZenHubAPIRateLimitError
+                if response.status_code == requests.codes.too_many_requests
+                else ZenHubAPIError
+            )
+            raise error_class(
+                "Something went wrong: {}".format(
+                    self._get_error_message(response),
+                ),
+                response=response,
+            )
 
     def get_board(self, repository_id):
         """
@@ -0,0 +1,298 @@
+"""
+ZenHub API rate limiting
+
+ZenHub allows 100 API requests per minute per token. Requests are throttled
+client side with a token bucket, which is also kept in sync with the
+`X-RateLimit-*` headers of ZenHub API responses, so we slow down before
+getting '429 Too Many Requests' responses.
+"""
+import logging
+import threading
+import time
+
+from redis.exceptions import RedisError
+
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    In process, thread safe token bucket rate limiter.
+
+    Docs:
+        https://github.com/ZenHubIO/API#api-rate-limit
+    """
+    def __init__(self, limit=100, period=60):
+        """
+        Initializes the instance with passed rate limit.
+
+        :param limit: number of requests allowed per period
+        :type limit: int
+        :param period: rate limit period in seconds
+        :type period: int
+        """
+        self.limit = limit
+        self.period = period
+
+        self._lock = threading.Lock()
+        self._tokens = limit
+        self._updated_at = time.time()
+        self._blocked_until = 0
+
+    @property
+    def rate(self):
+        """
+        Helper property that returns how many tokens are added per second.
+
+        :returns: tokens added per second
+        :rtype: float
+        """
+        return self.limit / self.period
+
+    def _refill(self, now):
+        """
+        Helper method for adding tokens for the time since last update.
+
+        :param now: current timestamp
+        :type now: float
+        """
+        self._tokens = min(
+            self.limit,
+            self._tokens + max(0, now - self._updated_at) * self.rate,
+        )
+        self._updated_at = now
+
+    def take(self, now):
+        """
+        Take a token, if one is available.
+
+        :param now: current timestamp
+        :type now: float
+        :returns: how long (in seconds) to wait before trying again, or 0 if
+            the token was taken
+        :rtype: float
+        """
+        with self._lock:
+            self._refill(now)
+
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            elif self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+
+            return (1 - self._tokens) / self.rate
+
+    def sync(self, now, remaining, reset_at):
+        """
+        Sync the bucket with ZenHub API rate limit state.
+
+        :param now: current timestamp
+        :type now: float
+        :param remaining: number of remaining requests (if known)
+        :type remaining: int or None
+        :param reset_at: timestamp when the rate limit resets (if known)
+        :type reset_at: float or None
+        """
+        with self._lock:
+            self._refill(now)
+
+            if remaining is not None:
+                self._tokens = min(self._tokens, remaining)
+            if remaining == 0 and reset_at:
+                self._blocked_until = max(self._blocked_until, reset_at)
+
+    def acquire(self, max_wait=None):
+        """
+        Wait until a request can be made.
+
+        :param max_wait: maximum time (in seconds) to wait
+        :type max_wait: float
+        :returns: how long (in seconds) we waited, or `None` if we would have
+            to wait for longer than `max_wait`
+        :rtype: float or None
+        """
+        waited = 0
+        while True:
+            wait = self.take(time.time())
+            if not wait:
+                return waited
+
+            if max_wait is not None and waited + wait > max_wait:
+                return None
+
+            time.sleep(wait)
+            waited += wait
+
+    def update(self, headers, status_code=None):
+        """
+        Update rate limit state based on ZenHub API response headers.
+
+        :param headers: response headers
+        :type headers: requests.structures.CaseInsensitiveDict
+        :param status_code: response status code
+        :type status_code: int
+        """
+        try:
+            limit = int(headers['X-RateLimit-Limit'])
+            remaining = limit - int(headers['X-RateLimit-Used'])
+        except (KeyError, ValueError):
+            remaining = None
+
+        try:
+            reset_at = float(headers['X-RateLimit-Reset'])
+        except (KeyError, ValueError):
+            reset_at = None
+
+        # We're over the limit, whatever the headers say
+        if status_code == 429:
+            remaining = 0
+            if reset_at is None and headers.get('Retry-After', '').isdigit():
+                reset_at = time.time() + int(headers['Retry-After'])
+
+        if remaining is not None or reset_at is not None:
+            self.sync(time.time(), remaining, reset_at)
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    Token bucket rate limiter shared between processes through Redis.
+
+    If Redis is unavailable, requests aren't throttled at all, as ZenHub
+    API still enforces the rate limit itself.
+    """
+    # Atomically refill the bucket and take a token, see `RateLimiter.take`
+    take_script = """
+        local limit = tonumber(ARGV[1])
+        local rate = tonumber(ARGV[2])
+        local now = tonumber(ARGV[3])
+
+        local state = redis.call(
+            'HMGET', KEYS[1], 'tokens', 'updated_at', 'blocked_until'
+        )
+        local tokens = tonumber(state[1]) or limit
+        local updated_at = tonumber(state[2]) or now
+        local blocked_until = tonumber(state[3]) or 0
+
+        tokens = math.min(limit, tokens + math.max(0, now - updated_at) * rate)
+
+        local wait = 0
+        if now < blocked_until then
+            wait = blocked_until - now
+        elseif tokens >= 1 then
+            tokens = tokens - 1
+        else
+            wait = (1 - tokens) / rate
+        end
+
+        redis.call(
+            'HMSET', KEYS[1], 'tokens', tostring(tokens),
+            'updated_at', tostring(now),
+            'blocked_until', tostring(blocked_until)
+        )
+        redis.call('EXPIRE', KEYS[1], ARGV[4])
+
+        return tostring(wait)
+    """
+
+    # Atomically refill the bucket and sync it, see `RateLimiter.sync`
+    sync_script = """
+        local limit = tonumber(ARGV[1])
+        local rate = tonumber(ARGV[2])
+        local now = tonumber(ARGV[3])
+        local remaining = tonumber(ARGV[5])
+        local reset_at = tonumber(ARGV[6])
+
+        local state = redis.call(
+            'HMGET', KEYS[1], 'tokens', 'updated_at', 'blocked_until'
+        )
+        local tokens = tonumber(state[1]) or limit
+        local updated_at = tonumber(state[2]) or now
+        local blocked_until = tonumber(state[3]) or 0
+
+        tokens = math.min(limit, tokens + math.max(0, now - updated_at) * rate)
+
+        if remaining >= 0 then
+            tokens = math.min(tokens, remaining)
+        end
+        if remaining == 0 and reset_at > blocked_until then
+            blocked_until = reset_at
+        end
+
+        redis.call(
+            'HMSET', KEYS[1], 'tokens', tostring(tokens),
+            'updated_at', tostring(now),
+            'blocked_until', tostring(blocked_until)
+        )
+        redis.call('EXPIRE', KEYS[1], ARGV[4])
+    """
+
+    def __init__(self, redis, key='zenhub_api:ratelimit', limit=100,
+                 period=60):
+        """
+        Initializes the instance with passed Redis client and rate limit.
+
+        :param redis: Redis client
+        :type redis: redis.StrictRedis
+        :param key: Redis key of the shared bucket
+        :type key: str
+        :param limit: number of requests allowed per period
+        :type limit: int
+        :param period: rate limit period in seconds
+        :type period: int
+        """
+        super().__init__(limit=limit, period=period)
+
+        self.key = key
+        self._take = redis.register_script(self.take_script)
+        self._sync = redis.register_script(self.sync_script)
+
+    def _get_args(self, now):
+        """
+        Helper method for getting scripts common arguments.
+
+        :param now: current timestamp
+        :type now: float
+        :returns: scripts arguments
+        :rtype: list
+        """
+        # Bucket is full again after a period, so it can then expire
+        return [self.limit, self.rate, now, self.period * 2]
+
+    def take(self, now):
+        """
+        Take a token from the shared bucket, if one is available.
+
+        :param now: current timestamp
+        :type now: float
+        :returns: how long (in seconds) to wait before trying again, or 0 if
+            the token was taken
+        :rtype: float
+        """
+        try:
+            return float(self._take(keys=[self.key], args=self._get_args(now)))
+        except RedisError:
+            logger.warning("Couldn't take ZenHub API rate limit token")
+            return 0
+
+    def sync(self, now, remaining, reset_at):
+        """
+        Sync the shared bucket with ZenHub API rate limit state.
+
+        :param now: current timestamp
+        :type now: float
+        :param remaining: number of remaining requests (if known)
+        :type remaining: int or None
+        :param reset_at: timestamp when the rate limit resets (if known)
+        :type reset_at: float or None
+        """
+        args = self._get_args(now) + [
+            -1 if remaining is None else remaining,
+            reset_at or 0,
+        ]
+
+        try:
+            self._sync(keys=[self.key], args=args)
+        except RedisError:
+            logger.warning("Couldn't sync ZenHub API rate limit")
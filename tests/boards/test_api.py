@@ -0,0 +1,182 @@
+"""
+Test 'boards.api' file
+"""
+from time import time
+
+from django.contrib.auth.models import User
+
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from boards.api import BoardViewSet
+from boards.issues import BoardIssue
+from boards.models import Board
+from boards.repositories import Repository
+
+
+class TestBoardViewSet:
+    """
+    Test 'boards.api.BoardViewSet'
+    """
+    def test_pipelines_etag(self, mocker, locmem_cache):
+        """Test unchanged pipelines aren't read or sent again"""
+        # Skip GitHub webhook creation
+        Board.objects.bulk_create([
+            Board(name='Board', slug='board', github_repository='owner/repo'),
+        ])
+        board = Board.objects.get(slug='board')
+        user = User.objects.create_superuser('admin', 'admin@example.com', '')
+        view = BoardViewSet.as_view({'get': 'pipelines'})
+        factory = APIRequestFactory()
+
+        get_pipelines = mocker.patch.object(
+            Board, '_get_pipelines', return_value=[{'name': 'Backlog'}],
+        )
+
+        request = factory.get('/')
+        force_authenticate(request, user)
+        response = view(request, pk=board.pk)
+        etag = response['ETag']
+
+        assert response.status_code == 200
+        assert response.data == [{'name': 'Backlog'}]
+
+        pipelines = mocker.spy(Board, 'pipelines')
+        request = factory.get('/', HTTP_IF_NONE_MATCH=etag)
+        force_authenticate(request, user)
+        response = view(request, pk=board.pk)
+
+        assert response.status_code == 304
+        assert response['ETag'] == etag
+        assert pipelines.call_count == 0
+        assert get_pipelines.call_count == 1
+
+        # Cached ETag is sent, without hashing the data again
+        make_etag = mocker.patch('boards.api.make_etag')
+        request = factory.get('/', HTTP_IF_NONE_MATCH='"other"')
+        force_authenticate(request, user)
+        response = view(request, pk=board.pk)
+
+        assert response.status_code == 200
+        assert response['ETag'] == etag
+        assert make_etag.call_count == 0
+
+    def test_pipelines_etag_stale(self, mocker, settings, locmem_cache):
+        """Test stale pipelines are refreshed even if they aren't sent"""
+        settings.BOARDS_CACHE_SOFT_TIMEOUT = 60
+        Board.objects.bulk_create([
+            Board(name='Board', slug='board', github_repository='owner/repo'),
+        ])
+        board = Board.objects.get(slug='board')
+        user = User.objects.create_superuser('admin', 'admin@example.com', '')
+        view = BoardViewSet.as_view({'get': 'pipelines'})
+        factory = APIRequestFactory()
+
+        mocker.patch.object(
+            Board, '_get_pipelines', return_value=[{'name': 'Backlog'}],
+        )
+        revalidate = mocker.patch('boards.caching.revalidate')
+
+        request = factory.get('/')
+        force_authenticate(request, user)
+        etag = view(request, pk=board.pk)['ETag']
+
+        request = factory.get('/', HTTP_IF_NONE_MATCH=etag)
+        force_authenticate(request, user)
+        assert view(request, pk=board.pk).status_code == 304
+        assert revalidate.call_count == 0
+
+        mocker.patch('boards.caching.time.time', return_value=time() + 120)
+        request = factory.get('/', HTTP_IF_NONE_MATCH=etag)
+        force_authenticate(request, user)
+        assert view(request, pk=board.pk).status_code == 304
+        assert revalidate.call_count == 1
+
+    def test_pipelines_since(self, mocker, locmem_cache):
+        """Test pipelines changes since passed version are returned"""
+        Board.objects.bulk_create([
+            Board(name='Board', slug='board', github_repository='owner/repo'),
+        ])
+        board = Board.objects.get(slug='board')
+        user = User.objects.create_superuser('admin', 'admin@example.com', '')
+        view = BoardViewSet.as_view({'get': 'pipelines'})
+        factory = APIRequestFactory()
+
+        mocker.patch.object(Board, '_get_pipelines', return_value=[
+            {'name': 'Backlog', 'issues': [{'number': 1}]},
+        ])
+
+        request = factory.get('/', {'since': 0})
+        force_authenticate(request, user)
+        response = view(request, pk=board.pk)
+        version = response.data['version']
+
+        assert response.status_code == 200
+        assert response.data['pipelines'] == [
+            {'name': 'Backlog', 'issues': [{'number': 1}]},
+        ]
+
+        board.invalidate_cache('pipelines')
+        Board._get_pipelines.return_value = [
+            {'name': 'Backlog', 'issues': []},
+        ]
+
+        request = factory.get('/', {'since': version})
+        force_authenticate(request, user)
+        response = view(request, pk=board.pk)
+
+        assert response.status_code == 200
+        assert response.data == {
+            'version': version + 2,
+            'changes': [
+                {'type': 'removed', 'number': 1, 'version': version + 1},
+                {'type': 'reordered', 'pipeline': 'Backlog', 'issues': [],
+                 'version': version + 2},
+            ],
+        }
+
+        request = factory.get('/', {'since': 'invalid'})
+        force_authenticate(request, user)
+        assert view(request, pk=board.pk).status_code == 400
+
+    def test_issues(self, mocker, locmem_cache):
+        """Test multiple board issues details are returned at once"""
+        Board.objects.bulk_create([
+            Board(name='Board', slug='board', github_repository='owner/repo'),
+        ])
+        board = Board.objects.get(slug='board')
+        user = User.objects.create_superuser('admin', 'admin@example.com', '')
+        view = BoardViewSet.as_view({'get': 'issues'})
+        factory = APIRequestFactory()
+
+        mocker.patch.object(Repository, 'gh_repo', mocker.Mock())
+        filtered_issues = mocker.patch.object(
+            Board, 'filtered_issues', return_value={1: {}, 2: {}, 3: {}},
+        )
+        get_details = mocker.patch.object(
+            BoardIssue, '_get_details', autospec=True,
+            side_effect=lambda issue: {'number': issue.issue_number},
+        )
+
+        request = factory.get('/', {'numbers': '1,2'})
+        force_authenticate(request, user)
+        response = view(request, pk=board.pk)
+
+        assert response.status_code == 200
+        assert response.data == {1: {'number': 1}, 2: {'number': 2}}
+        assert get_details.call_count == 2
+
+        # Only missing issues are fetched and other boards issues are skipped
+        request = factory.get('/', {'numbers': '1,2,3,4'})
+        force_authenticate(request, user)
+        response = view(request, pk=board.pk)
+
+        assert response.status_code == 200
+        assert list(response.data) == [1, 2, 3]
+        assert get_details.call_count == 3
+
+        # Access is checked against cached board issue numbers
+        assert filtered_issues.call_count == 1
+
+        request = factory.get('/', {'numbers': '1,a'})
+        force_authenticate(request, user)
+        assert view(request, pk=board.pk).status_code == 400
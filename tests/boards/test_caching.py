@@ -0,0 +1,114 @@
+"""
+Test 'boards.caching' file
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from boards.caching import (
+    bump_generation, get_etag, get_generation, get_or_set, get_or_set_many,
+    make_etag, pack, single_flight,
+)
+from boards.models import Board
+
+
+def test_get_or_set(locmem_cache):
+    """Test `get_or_set` only computes the value once when called at once"""
+    calls = list()
+
+    def default():
+        calls.append(1)
+        time.sleep(0.2)
+        return 'value'
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [
+            executor.submit(get_or_set, 'key', default) for _ in range(5)
+        ]
+        values = [future.result() for future in futures]
+
+    assert values == ['value'] * 5
+    assert len(calls) == 1
+    assert locmem_cache.get('key')['value'] == 'value'
+
+
+def test_get_or_set_stale(settings, mocker, locmem_cache):
+    """Test `get_or_set` returns stale value and refreshes it in background"""
+    settings.BOARDS_CACHE_SOFT_TIMEOUT = 60
+    mocker.patch('boards.caching.time.time', return_value=1000)
+    locmem_cache.set('key', pack('stale'))
+
+    # Not stale yet
+    mocker.patch('boards.caching.time.time', return_value=1050)
+    assert get_or_set('key', lambda: 'fresh') == 'stale'
+
+    mocker.patch('boards.caching.time.time', return_value=1061)
+    revalidate = mocker.patch('boards.caching.revalidate')
+    assert get_or_set('key', lambda: 'fresh') == 'stale'
+    assert revalidate.call_count == 1
+
+
+def test_get_or_set_many(mocker, locmem_cache):
+    """Test `get_or_set_many` only computes missing values"""
+    locmem_cache.set('a', pack(1))
+    get_many = mocker.spy(locmem_cache, 'get_many')
+    connection = mocker.patch('zenboard.utils.connection')
+
+    values = get_or_set_many(
+        defaults={'a': lambda: 10, 'b': lambda: 20, 'c': lambda: 30},
+    )
+
+    assert values == {'a': 1, 'b': 20, 'c': 30}
+    assert get_many.call_count == 1
+
+    # Database connections opened by pool threads are closed
+    assert connection.close.call_count == 2
+
+
+def test_get_or_set_etag(locmem_cache):
+    """Test `get_or_set` only caches ETags of served values"""
+    assert get_or_set('internal', lambda: 'value') == 'value'
+    assert get_etag('internal') is None
+
+    assert get_or_set('served', lambda: 'value', etag=True) == 'value'
+    assert get_etag('served') == make_etag('value')
+
+
+def test_single_flight(locmem_cache):
+    """Test `single_flight` lets only one caller through and waits for it"""
+    def refresh():
+        start = time.monotonic()
+        with single_flight('key') as acquired:
+            if acquired:
+                time.sleep(0.2)
+        return acquired, time.monotonic() - start
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(refresh) for _ in range(3)]
+        results = [future.result() for future in futures]
+
+    assert len([result for result in results if result[0]]) == 1
+
+    # Everyone else waited for the lock holder to finish
+    for result in results:
+        assert result[1] >= 0.2
+
+
+def test_generations(locmem_cache):
+    """Test bumping generation number invalidates all namespace keys"""
+    board = Board(pk=1)
+    key = board.get_cache_key('pipelines')
+    locmem_cache.set(key, pack('value'))
+
+    generation = get_generation(board.get_cache_namespace())
+    assert bump_generation(board.get_cache_namespace()) == generation + 1
+
+    # Invalidation is scoped to the namespace
+    other_board = Board(pk=2)
+    other_generation = other_board.cache_generation
+    board.invalidate_cache()
+
+    assert board.get_cache_key('pipelines') != key
+    assert Board(pk=2).cache_generation == other_generation
+    assert get_or_set(board.get_cache_key('pipelines'), lambda: 'new') == (
+        'new'
+    )
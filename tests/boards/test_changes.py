@@ -0,0 +1,86 @@
+"""
+Test 'boards.changes' file
+"""
+from boards import changes
+from boards.models import Board
+
+
+def get_pipelines(backlog, done, title='Issue'):
+    """Helper function for building board pipelines data"""
+    return [
+        {'name': 'Backlog', 'issues': [
+            {'number': n, 'title': title if n == 1 else 'Issue'}
+            for n in backlog
+        ]},
+        {'name': 'Done', 'issues': [
+            {'number': n, 'title': 'Issue'} for n in done
+        ]},
+    ]
+
+
+def test_diff_pipelines():
+    """Test `diff_pipelines` returns issue and pipeline changes"""
+    old = get_pipelines([1, 2, 3], [4])
+    new = get_pipelines([5, 1, 3], [2], title='Renamed')
+
+    assert changes.diff_pipelines(old, old) == []
+    assert changes.diff_pipelines(old, new) == [
+        {'type': 'removed', 'number': 4},
+        {'type': 'added', 'number': 5, 'pipeline': 'Backlog',
+         'issue': {'number': 5, 'title': 'Issue'}},
+        {'type': 'updated', 'number': 1,
+         'issue': {'number': 1, 'title': 'Renamed'}},
+        {'type': 'moved', 'number': 2,
+         'from_pipeline': 'Backlog', 'to_pipeline': 'Done'},
+        {'type': 'reordered', 'pipeline': 'Backlog', 'issues': [5, 1, 3]},
+        {'type': 'reordered', 'pipeline': 'Done', 'issues': [2]},
+    ]
+
+    # Changed pipelines can't be described with issue changes
+    assert changes.diff_pipelines(old, old[:1]) is None
+
+
+def test_change_log(settings, locmem_cache):
+    """Test recorded changes are returned until they're truncated"""
+    settings.BOARDS_CHANGE_LOG_MAX_LENGTH = 3
+    board = Board(pk=1)
+    assert changes.get_version(board) == 0
+
+    state = changes.record(board, get_pipelines([1, 2], []))
+    version = state['version']
+    assert changes.get_snapshot(board) == state
+    assert changes.get_version(board) == version
+    assert changes.get_changes(board, version) == {
+        'version': version, 'changes': [],
+    }
+
+    # Unknown versions aren't available
+    assert changes.get_changes(board, version - 1) is None
+    assert changes.get_changes(board, version + 1) is None
+
+    changes.record(board, get_pipelines([1], [2]))
+    assert changes.get_version(board) == version + 3
+    assert changes.get_changes(board, version) == {
+        'version': version + 3,
+        'changes': [
+            {'type': 'moved', 'number': 2, 'from_pipeline': 'Backlog',
+             'to_pipeline': 'Done', 'version': version + 1},
+            {'type': 'reordered', 'pipeline': 'Backlog', 'issues': [1],
+             'version': version + 2},
+            {'type': 'reordered', 'pipeline': 'Done', 'issues': [2],
+             'version': version + 3},
+        ],
+    }
+    assert changes.get_changes(board, version + 2)['changes'] == [
+        {'type': 'reordered', 'pipeline': 'Done', 'issues': [2],
+         'version': version + 3},
+    ]
+
+    # Clients that are too far behind need a full snapshot
+    changes.record(board, get_pipelines([1], [2], title='Renamed'))
+    assert changes.get_changes(board, version) is None
+    assert changes.get_changes(board, version + 1)['version'] == version + 4
+
+    # Log outlives board cache invalidations
+    board.invalidate_cache()
+    assert changes.get_snapshot(board)['version'] == version + 4
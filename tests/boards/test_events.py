@@ -0,0 +1,73 @@
+"""
+Test 'boards.events' file
+"""
+import json
+
+from django.contrib.auth.models import User
+
+from boards import events
+from boards.models import Board
+
+
+def test_publish(mocker):
+    """Test `publish` publishes board event on board channel"""
+    redis = mocker.patch('boards.events.get_redis_connection').return_value
+    board = Board(pk=1)
+
+    events.publish(board, 'issue', number=7)
+    redis.publish.assert_called_once_with(
+        'boards:events:1',
+        json.dumps({'event': 'issue', 'data': {'number': 7}}),
+    )
+
+    # Live updates failures don't affect the caller
+    redis.publish.side_effect = ConnectionError
+    events.publish(board, 'pipelines')
+
+
+class TestBoardEventsView:
+    """
+    Test 'boards.views.BoardEventsView'
+    """
+    def test_stream(self, client, mocker, settings, locmem_cache):
+        """Test board events are streamed in Server-Sent Events format"""
+        settings.BOARDS_EVENTS_STREAM_TIMEOUT = 60
+        Board.objects.bulk_create([
+            Board(name='Board', slug='board', github_repository='owner/repo'),
+        ])
+        User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        client.login(username='admin', password='pass')
+
+        redis = mocker.patch('boards.events.get_redis_connection').return_value
+        pubsub = redis.pubsub.return_value
+        connection = mocker.patch('boards.views.connection')
+        pubsub.get_message.side_effect = [
+            None,
+            {'data': json.dumps(
+                {'event': 'issue', 'data': {'number': 7}},
+            ).encode()},
+            {'data': b'invalid'},
+        ]
+
+        response = client.get('/boards/board/events/')
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'text/event-stream'
+        connection.close.assert_called_once_with()
+
+        content = response.streaming_content
+        assert next(content) == b'retry: 3000\n\n'
+        assert next(content) == b': heartbeat\n\n'
+        assert next(content) == (
+            b'event: issue\ndata: {"number": 7}\n\n'
+        )
+
+        response.close()
+        pubsub.subscribe.assert_called_once_with(
+            'boards:events:{}'.format(Board.objects.get().pk),
+        )
+        pubsub.close.assert_called_once_with()
+
+    def test_access(self, client, db):
+        """Test board events require login"""
+        response = client.get('/boards/board/events/')
+        assert response.status_code == 302
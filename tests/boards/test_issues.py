@@ -0,0 +1,88 @@
+"""
+Test 'boards.issues' file
+"""
+from boards.caching import pack
+from boards.issues import BoardIssue
+from boards.models import Board
+from boards.repositories import Repository
+
+
+class TestBoardIssue:
+    """
+    Test 'boards.issues.BoardIssue'
+    """
+    def test_details_many(self, mocker, locmem_cache):
+        """Test `BoardIssue.details_many` only fetches missing issues"""
+        board = Board(pk=1, github_repository='owner/repo')
+        board.repository.__dict__['gh_repo'] = mocker.Mock()
+
+        cache_key = BoardIssue(board, 1).get_cache_key()
+        locmem_cache.set(cache_key, pack({'number': 1, 'cached': True}))
+
+        get_details = mocker.patch.object(
+            BoardIssue, '_get_details', autospec=True,
+            side_effect=lambda issue: {'number': issue.issue_number},
+        )
+        get_many = mocker.spy(locmem_cache, 'get_many')
+
+        issues_details = BoardIssue.details_many(board, [1, 2, 3])
+
+        assert get_many.call_count == 1
+        assert get_details.call_count == 2
+        assert issues_details == {
+            1: {'number': 1, 'cached': True},
+            2: {'number': 2},
+            3: {'number': 3},
+        }
+
+        # Everything should be cached now
+        assert BoardIssue.details_many(board, [1, 2, 3]) == issues_details
+        assert get_details.call_count == 2
+
+    def test_details(self, mocker, locmem_cache):
+        """Test `BoardIssue.details` method"""
+        board = Board(pk=1, github_repository='owner/repo')
+        mocker.patch.object(
+            BoardIssue, '_get_details', return_value={'number': 7},
+        )
+
+        assert BoardIssue(board, 7).details() == {'number': 7}
+
+    def test_details_derived_from_raw_issue(self, mocker, locmem_cache):
+        """Test board issue details are derived from raw GitHub issue data"""
+        board = Board(pk=1, github_repository='owner/repo', filter_sign='🐙')
+        raw_issue = {
+            'number': 7,
+            'title': 'Issue #7',
+            'author': 'octocat',
+            'assignee': None,
+            'state': 'open',
+            'labels': ['client'],
+            'body': '🐙 Tasks:\n- [x] one\n- [ ] two',
+            'body_html': '<p>🐙 Tasks</p>',
+            'created_at': None,
+            'updated_at': None,
+            'closed_at': None,
+            'comments': [
+                {'id': 1, 'url': '', 'body': '🐙 Public', 'body_html': 'A🐙',
+                 'created_at': None, 'updated_at': None},
+                {'id': 2, 'url': '', 'body': '- [x] Private',
+                 'body_html': 'B', 'created_at': None, 'updated_at': None},
+            ],
+        }
+        get_issue = mocker.patch.object(
+            Repository, '_get_issue', return_value=raw_issue,
+        )
+
+        details = BoardIssue(board, 7).details()
+
+        assert details['body'] == '<p> Tasks</p>'
+        assert [c['body'] for c in details['comments']] == ['A']
+        assert details['progress'] == 2 / 3
+        assert 'assignee' not in details
+
+        # Raw issue data is shared between boards
+        other_board = Board(pk=2, github_repository='owner/repo',
+                            filter_sign='')
+        BoardIssue(other_board, 7).details()
+        assert get_issue.call_count == 1
@@ -0,0 +1,87 @@
+"""
+Test 'boards.local_cache' file
+"""
+import pytest
+
+from boards.caching import get_or_set, get_or_set_many
+from boards.local_cache import CHANNEL, LocalCache
+
+
+@pytest.fixture
+def local_cache(settings, mocker):
+    """Subscribed in process cache, with mocked Redis connection"""
+    settings.BOARDS_LOCAL_CACHE_MAX_ENTRIES = 2
+    settings.BOARDS_LOCAL_CACHE_MAX_BYTES = 1024
+    settings.BOARDS_LOCAL_CACHE_TIMEOUT = 60
+    mocker.patch('boards.local_cache.get_redis_connection')
+
+    local_cache = LocalCache()
+    local_cache._subscribed = True
+
+    return local_cache
+
+
+class TestLocalCache:
+    """
+    Test 'boards.local_cache.LocalCache'
+    """
+    def test_lru(self, settings, local_cache):
+        """Test least recently used entries are evicted first"""
+        for key in ['a', 'b']:
+            local_cache.set(key, key, local_cache.epoch)
+        local_cache.get('a')
+        local_cache.set('c', 'c', local_cache.epoch)
+
+        assert local_cache.get_many(['a', 'b', 'c']) == {'a': 'a', 'c': 'c'}
+
+        # Values that are too big aren't cached at all
+        local_cache.set('d', 'd' * 1024, local_cache.epoch)
+        assert local_cache.get('d') is None
+
+        # Neither are values read before an invalidation
+        epoch = local_cache.epoch
+        local_cache.invalidate('a')
+        local_cache.set('a', 'a', epoch)
+        assert local_cache.get('a') is None
+
+    def test_invalidate(self, mocker, local_cache):
+        """Test invalidations are published to other processes"""
+        redis = mocker.patch('boards.local_cache.get_redis_connection')
+
+        local_cache.set('a', 'a', local_cache.epoch)
+        local_cache.invalidate('a')
+
+        assert local_cache.get('a') is None
+        redis.return_value.publish.assert_called_once_with(CHANNEL, 'a')
+
+
+def test_get_or_set_local(locmem_cache, local_cache, mocker):
+    """Test `get_or_set` serves locally cached values without Redis"""
+    mocker.patch('boards.caching.local_cache', local_cache)
+    get_many = mocker.spy(locmem_cache, 'get_many')
+
+    assert get_or_set('key', lambda: 'value', local=True) == 'value'
+    assert get_or_set('key', lambda: 'other', local=True) == 'value'
+    assert get_many.call_count == 2
+
+    assert get_or_set('key', lambda: 'other', local=True) == 'value'
+    assert get_many.call_count == 2
+
+
+def test_get_or_set_many_local(locmem_cache, local_cache, mocker):
+    """Test `get_or_set_many` caches all the values locally"""
+    mocker.patch('boards.caching.local_cache', local_cache)
+
+    defaults = {key: lambda key=key: key for key in ['a', 'b']}
+    get_or_set_many(defaults, local=True)
+    assert get_or_set_many(defaults, local=True) == {'a': 'a', 'b': 'b'}
+    assert local_cache.get_many(['a', 'b']) == {
+        'a': {'value': 'a', 'stale_at': None},
+        'b': {'value': 'b', 'stale_at': None},
+    }
+
+    # LRU eviction doesn't affect values that are being cached
+    epoch = local_cache.epoch
+    local_cache.set('c', 'c', epoch)
+    local_cache.set('a', 'a', epoch)
+    assert local_cache.get_many(['a', 'b', 'c']) == {'a': 'a', 'c': 'c'}
@@ -0,0 +1,160 @@
+"""
+Test 'boards.models' file
+"""
+import threading
+import time
+
+from boards import issues
+from boards.models import Board
+from boards.repositories import Repository
+
+
+class TestBoard:
+    """
+    Test 'boards.models.Board'
+    """
+    def test_get_pipelines(self, mocker, db):
+        """Test pipelines are assembled without per issue lookups"""
+        board = Board(pk=1, github_repository='owner/repo')
+        mocker.patch.object(Repository, 'zenhub_board', return_value={
+            'version': 1,
+            'pipelines': [{'name': 'Backlog', 'issues': [
+                {'issue_number': 1, 'position': 0, 'is_epic': False},
+                {'issue_number': 2, 'position': 1, 'is_epic': True},
+                {'issue_number': 3, 'position': 2, 'is_epic': False},
+                {'issue_number': 4, 'position': 3, 'is_epic': False},
+            ]}],
+        })
+        filtered_issues = {
+            number: {'number': number, 'title': 'Issue', 'state': state}
+            for number, state in [(1, 'open'), (2, 'open'), (5, 'closed')]
+        }
+        mocker.patch.object(
+            Repository, 'filtered_issues', return_value=filtered_issues,
+        )
+        reverse = mocker.spy(issues, 'reverse')
+
+        url = 'https://example.com/api/boards/1/issue/{}/'
+        assert board._get_pipelines() == [
+            {'name': 'Backlog', 'issues': [
+                {'number': 1, 'title': 'Issue', 'state': 'open',
+                 'is_epic': False, 'details_url': url.format(1)},
+            ]},
+            {'name': 'Closed', 'issues': [
+                {'number': 5, 'title': 'Issue', 'state': 'closed',
+                 'is_epic': False, 'details_url': url.format(5)},
+            ]},
+        ]
+
+        # Issue API endpoint URL is resolved once and cached data is intact
+        assert reverse.call_count == 1
+        assert 'details_url' not in filtered_issues[1]
+
+    def test_get_pipelines_single_pass(self, mocker, db):
+        """Test pipelines are assembled in a single pass over the issues"""
+        class LookupsCounter(dict):
+            """Filtered issues that count lookups and scans"""
+            lookups = 0
+            scans = 0
+
+            def __contains__(self, key):
+                type(self).lookups += 1
+                return super().__contains__(key)
+
+            def __getitem__(self, key):
+                type(self).lookups += 1
+                return super().__getitem__(key)
+
+            def __iter__(self):
+                type(self).scans += 1
+                return super().__iter__()
+
+            def items(self):
+                type(self).scans += 1
+                return super().items()
+
+            def values(self):
+                type(self).scans += 1
+                return super().values()
+
+        board = Board(pk=1, github_repository='owner/repo')
+        mocker.patch.object(Repository, 'zenhub_board', return_value={
+            'version': 1,
+            'pipelines': [
+                {'name': name, 'issues': [
+                    {'issue_number': number, 'position': position}
+                    for position, number in enumerate(numbers)
+                ]}
+                for name, numbers in [
+                    ('Backlog', range(0, 100)),
+                    ('In Progress', range(100, 200)),
+                    ('Done', range(200, 300)),
+                ]
+            ],
+        })
+        mocker.patch.object(
+            Repository, 'filtered_issues', return_value=LookupsCounter({
+                number: {
+                    'number': number,
+                    'title': 'Issue',
+                    'state': 'closed' if number % 10 == 0 else 'open',
+                }
+                for number in range(0, 300, 2)
+            }),
+        )
+
+        pipelines = board._get_pipelines()
+        assert [len(pipeline['issues']) for pipeline in pipelines] == [
+            50, 50, 50, 30,
+        ]
+
+        # Filtered issues are only scanned once (for the closed issues) and
+        # every pipeline issue is looked up a constant number of times
+        assert LookupsCounter.scans == 1
+        assert LookupsCounter.lookups == (300 + 30) + (150 + 30)
+
+    def test_refresh_cache(self, mocker, locmem_cache):
+        """Test concurrent refreshes of the same board collapse into one"""
+        mocker.patch.object(Board, 'refresh_repository_cache')
+        pipelines = mocker.patch.object(
+            Board, 'pipelines', side_effect=lambda: time.sleep(0.3),
+        )
+
+        threads = list()
+        for _ in range(2):
+            # Every request has its own board instance
+            board = Board(pk=1, github_repository='owner/repo')
+            threads.append(threading.Thread(target=board.refresh_cache))
+            threads[-1].start()
+
+            # Second refresh starts after the first one invalidated the cache
+            time.sleep(0.1)
+
+        for thread in threads:
+            thread.join()
+
+        assert pipelines.call_count == 1
+
+    def test_refresh_repository_cache(self, mocker, locmem_cache):
+        """Test board refresh doesn't invalidate shared repository data"""
+        board = Board(
+            pk=1, github_repository='owner/repo',
+            github_repository_id='1234',
+        )
+        invalidate_cache = mocker.patch.object(Repository, 'invalidate_cache')
+        issues = mocker.patch.object(Repository, 'issues')
+        zenhub_board = mocker.patch.object(Repository, 'zenhub_board')
+        issue = mocker.patch.object(Repository, 'issue')
+        mocker.patch.object(Board, 'issue_numbers', return_value=[1, 2])
+
+        board.refresh_repository_cache('*')
+
+        # Snapshots are kept and only issues index is fully synced again
+        invalidate_cache.assert_called_once_with('issues:sync')
+        issues.assert_called_once_with(refresh=True)
+        zenhub_board.assert_called_once_with(
+            repository_id='1234', refresh=True,
+        )
+        assert sorted(issue.call_args_list) == [
+            mocker.call(1, refresh=True), mocker.call(2, refresh=True),
+        ]
@@ -0,0 +1,189 @@
+"""
+Test 'boards.payloads' file
+"""
+from datetime import datetime
+
+from django.utils.timezone import utc
+
+from boards.payloads import apply_github_event, apply_zenhub_event
+from boards.repositories import Repository
+
+
+def issue_payload(action, labels, state='open', **kwargs):
+    """Helper function for creating GitHub 'issues' event payloads"""
+    payload = {
+        'action': action,
+        'issue': {
+            'number': 1,
+            'title': 'Issue #1',
+            'state': state,
+            'labels': [{'name': label} for label in labels],
+            'updated_at': '2017-11-02T12:00:00Z',
+            'closed_at': None,
+        },
+        'repository': {'full_name': 'owner/repo'},
+    }
+    payload.update(kwargs)
+
+    return payload
+
+
+class TestApplyGitHubEvent:
+    """
+    Test 'boards.payloads.apply_github_event'
+    """
+    def setup_cache(self, repository, mocker):
+        """Cache repository issues index and raw issue data"""
+        repository.issues(refresh=True)
+        mocker.patch.object(repository, '_get_issue', return_value={
+            'number': 1,
+            'title': 'Issue #1',
+            'state': 'open',
+            'labels': ['Client'],
+            'comments': [{'id': 10}, {'id': 11}],
+        })
+        repository.issue(1)
+
+    def test_issues_event(self, mocker, locmem_cache):
+        """Test labels and state changes are applied without refetching"""
+        repository = Repository('owner/repo')
+        mocker.patch.object(repository, '_get_issues', return_value=(
+            Repository.build_issues_index({
+                1: {'number': 1, 'title': 'Issue #1', 'state': 'open',
+                    'labels': ['client']},
+            })
+        ))
+        self.setup_cache(repository, mocker)
+
+        payload = issue_payload('unlabeled', labels=[])
+        assert apply_github_event(repository, 'issues', payload) == []
+        assert repository.filtered_issues(labels=['client']) == {}
+
+        payload = issue_payload('labeled', labels=['Client'], state='closed')
+        assert apply_github_event(repository, 'issues', payload) == []
+        assert repository.filtered_issues(labels=['client']) == {
+            1: {'number': 1, 'title': 'Issue #1', 'state': 'closed'},
+        }
+
+        issue = repository.issue(1)
+        assert issue['state'] == 'closed'
+        assert issue['updated_at'].replace(tzinfo=None) == (
+            datetime(2017, 11, 2, 12)
+        )
+
+        assert repository._get_issues.call_count == 1
+        assert repository._get_issue.call_count == 1
+
+    def test_outdated_event(self, mocker, locmem_cache):
+        """Test payloads older than cached data are skipped"""
+        repository = Repository('owner/repo')
+        mocker.patch.object(repository, '_get_issues', return_value=(
+            Repository.build_issues_index({
+                1: {'number': 1, 'title': 'Issue #1', 'state': 'open',
+                    'labels': ['client'],
+                    'updated_at': datetime(2017, 11, 2, 13, tzinfo=utc)},
+            })
+        ))
+        repository.issues(refresh=True)
+        mocker.patch.object(repository, '_get_issue', return_value={
+            'number': 1,
+            'title': 'Issue #1',
+            'state': 'open',
+            'labels': ['Client'],
+            'comments': [],
+            'updated_at': datetime(2017, 11, 2, 13, tzinfo=utc),
+        })
+        repository.issue(1)
+
+        payload = issue_payload('closed', labels=[], state='closed')
+        assert apply_github_event(repository, 'issues', payload) == []
+        assert repository.filtered_issues(labels=['client']) == {
+            1: {'number': 1, 'title': 'Issue #1', 'state': 'open'},
+        }
+        assert repository.issue(1)['state'] == 'open'
+
+        payload['issue']['updated_at'] = '2017-11-02T14:00:00Z'
+        assert apply_github_event(repository, 'issues', payload) == []
+        assert repository.filtered_issues(labels=['client']) == {}
+        assert repository.issue(1)['state'] == 'closed'
+
+    def test_issue_comment_event(self, mocker, locmem_cache):
+        """Test deleted comments are applied, new ones need a refetch"""
+        repository = Repository('owner/repo')
+        mocker.patch.object(repository, '_get_issues', return_value=(
+            Repository.build_issues_index({})
+        ))
+        self.setup_cache(repository, mocker)
+
+        payload = issue_payload(
+            'deleted', labels=['Client'], comment={'id': 10},
+        )
+        assert apply_github_event(repository, 'issue_comment', payload) == []
+        assert repository.issue(1)['comments'] == [{'id': 11}]
+        assert set(repository.issues()['issues']) == {1}
+
+        payload = issue_payload(
+            'created', labels=['Client'], comment={'id': 12, 'body': '-'},
+        )
+        assert apply_github_event(repository, 'issue_comment', payload) == [
+            'issue:1',
+        ]
+        assert repository.issue(1)['comments'] == [{'id': 11}]
+
+
+class TestApplyZenHubEvent:
+    """
+    Test 'boards.payloads.apply_zenhub_event'
+    """
+    def test_issue_moves(self, mocker, locmem_cache):
+        """Test issue moves are applied, unless they're out of order"""
+        get_board = mocker.patch(
+            'boards.repositories.zenhub_api.get_board',
+            return_value=[
+                {'name': 'Backlog', 'issues': [
+                    {'issue_number': 1, 'position': 0},
+                    {'issue_number': 2, 'position': 1},
+                ]},
+                {'name': 'Done', 'issues': [
+                    {'issue_number': 3, 'position': 0},
+                ]},
+            ],
+        )
+        repository = Repository('owner/repo')
+        repository.zenhub_board('1234')
+
+        payload = {
+            'issue_number': '2',
+            'to_pipeline_name': 'Backlog',
+            'from_position': '1',
+            'to_position': '0',
+        }
+        assert apply_zenhub_event(
+            repository, 'issue_reprioritized', payload,
+        ) == []
+
+        payload = {
+            'issue_number': '1',
+            'from_pipeline_name': 'Backlog',
+            'to_pipeline_name': 'Done',
+        }
+        assert apply_zenhub_event(repository, 'issue_transfer', payload) == []
+
+        zenhub_board = repository.zenhub_board('1234')
+        assert zenhub_board['version'] == 3
+        assert zenhub_board['pipelines'] == [
+            {'name': 'Backlog', 'issues': [
+                {'issue_number': 2, 'position': 0, 'is_epic': False},
+            ]},
+            {'name': 'Done', 'issues': [
+                {'issue_number': 1, 'position': 0, 'is_epic': False},
+                {'issue_number': 3, 'position': 1, 'is_epic': False},
+            ]},
+        ]
+        assert get_board.call_count == 1
+
+        # The same delivery again doesn't match cached data anymore
+        assert apply_zenhub_event(repository, 'issue_transfer', payload) == [
+            'zenhub_board',
+        ]
+        assert repository.zenhub_board('1234') == zenhub_board
@@ -0,0 +1,166 @@
+"""
+Test 'boards.repositories' file
+"""
+from datetime import datetime, timedelta
+
+from boards.issues import BoardIssue
+from boards.models import Board, RepositorySnapshot
+from boards.repositories import Repository
+
+
+def gh_issue(mocker, number, labels, updated_at, state='open'):
+    """Helper function for creating GitHub issue mocks"""
+    issue = mocker.Mock(
+        number=number,
+        title='Issue #{}'.format(number),
+        state=state,
+        updated_at=updated_at,
+        labels=[mocker.Mock() for _ in labels],
+    )
+    for label, label_mock in zip(labels, issue.labels):
+        label_mock.name = label
+
+    return issue
+
+
+class TestRepository:
+    """
+    Test 'boards.repositories.Repository'
+    """
+    def test_gh_repo(self, mocker):
+        """Test `Repository.gh_repo` doesn't make any GitHub API calls"""
+        request = mocker.patch('requests.Session.request')
+        repository = Repository('owner/repo')
+
+        gh_repo = repository.gh_repo
+        assert gh_repo.full_name == 'owner/repo'
+        assert gh_repo.owner.login == 'owner'
+        assert gh_repo._build_url('issues', base_url=gh_repo._api) == (
+            'https://api.github.com/repos/owner/repo/issues'
+        )
+        assert request.call_count == 0
+
+    def test_issues_incremental_sync(self, mocker, locmem_cache):
+        """Test `Repository.issues` only fetches updated issues"""
+        repository = Repository('owner/repo')
+        gh_repo = repository.__dict__['gh_repo'] = mocker.Mock()
+        now = datetime(2017, 11, 1)
+
+        gh_repo.iter_issues.return_value = [
+            gh_issue(mocker, 1, ['client'], now),
+            gh_issue(mocker, 2, ['Client', 'bug'], now),
+        ]
+        index = repository.issues()
+        gh_repo.iter_issues.assert_called_with(state='all')
+        assert set(index['issues']) == {1, 2}
+        assert index['labels'] == {'client': [1, 2], 'bug': [2]}
+
+        # Issue 1 lost its label, issue 2 was closed and issue 3 was added
+        later = now + timedelta(hours=1)
+        gh_repo.iter_issues.return_value = [
+            gh_issue(mocker, 1, ['bug'], later),
+            gh_issue(mocker, 2, ['client'], later, state='closed'),
+            gh_issue(mocker, 3, ['client'], later),
+        ]
+        index = repository.issues(refresh=True)
+        gh_repo.iter_issues.assert_called_with(state='all', since=now)
+
+        assert index['issues'][2]['state'] == 'closed'
+        assert index['labels'] == {'client': [2, 3], 'bug': [1]}
+        assert repository.issues() == index
+
+        # High-water mark moved forward
+        repository.issues(refresh=True)
+        gh_repo.iter_issues.assert_called_with(state='all', since=later)
+
+    def test_filtered_issues(self, mocker, locmem_cache):
+        """Test `Repository.filtered_issues` filters issues by labels"""
+        repository = Repository('owner/repo')
+        gh_repo = repository.__dict__['gh_repo'] = mocker.Mock()
+        now = datetime(2017, 11, 1)
+
+        gh_repo.iter_issues.return_value = [
+            gh_issue(mocker, 1, ['client'], now),
+            gh_issue(mocker, 2, ['client', 'bug'], now),
+            gh_issue(mocker, 3, [], now),
+        ]
+
+        assert set(repository.filtered_issues([])) == {1, 2, 3}
+        assert set(repository.filtered_issues(['client'])) == {1, 2}
+        assert set(repository.filtered_issues(['client', 'bug'])) == {2}
+        assert repository.filtered_issues(['other']) == {}
+        assert repository.filtered_issues(['bug']) == {
+            2: {'number': 2, 'title': 'Issue #2', 'state': 'open'},
+        }
+        assert gh_repo.iter_issues.call_count == 1
+
+    def test_invalidate_dependents(self, mocker, locmem_cache):
+        """Test board data derived from passed resource is invalidated"""
+        Board.objects.bulk_create([
+            Board(name='Board', slug='board', github_repository='owner/repo'),
+        ])
+        board_invalidate_cache = mocker.patch.object(Board, 'invalidate_cache')
+        issue_invalidate_cache = mocker.patch.object(
+            BoardIssue, 'invalidate_cache',
+        )
+        repository = Repository('owner/repo')
+
+        repository.invalidate_dependents('zenhub_board')
+        board_invalidate_cache.assert_called_once_with('pipelines')
+
+        board_invalidate_cache.reset_mock()
+        repository.invalidate_dependents('issues')
+        assert board_invalidate_cache.call_args_list == [
+            mocker.call('issue_numbers'), mocker.call('pipelines'),
+        ]
+
+        repository.invalidate_dependents('issue:7')
+        assert issue_invalidate_cache.call_count == 1
+
+    def test_snapshot_restore(self, mocker, locmem_cache):
+        """Test lost cache is refilled from snapshot and then refreshed"""
+        repository = Repository('owner/repo')
+        index = Repository.build_issues_index({
+            1: {'number': 1, 'title': 'Issue #1', 'state': 'open',
+                'labels': []},
+        })
+        get_issues = mocker.patch.object(
+            Repository, '_get_issues', return_value=index,
+        )
+        revalidate = mocker.patch('boards.caching.revalidate')
+
+        assert repository.issues() == index
+        assert get_issues.call_count == 1
+
+        # Redis was flushed
+        locmem_cache.clear()
+
+        assert Repository('owner/repo').issues() == index
+        assert get_issues.call_count == 1
+        assert revalidate.call_count == 1
+
+        # Board pipelines derived from the restored value are invalidated
+        # once it's refreshed
+        invalidate_dependents = mocker.patch.object(
+            Repository, 'invalidate_dependents',
+        )
+        key, fetch = revalidate.call_args[0]
+        assert fetch() == index
+        invalidate_dependents.assert_called_once_with('issues')
+
+        # Explicit invalidation removes the snapshot as well
+        repository.invalidate_cache()
+        assert repository.issues() == index
+        assert get_issues.call_count == 3
+
+    def test_snapshot_resources(self, mocker, locmem_cache):
+        """Test only repository wide resources are saved as snapshots"""
+        repository = Repository('owner/repo')
+        mocker.patch.object(
+            Repository, '_get_issue', return_value={'number': 1},
+        )
+        save_value = mocker.patch.object(RepositorySnapshot, 'save_value')
+
+        assert repository.issue(1) == {'number': 1}
+        assert repository.issue(1, refresh=True) == {'number': 1}
+        assert save_value.call_count == 0
@@ -0,0 +1,74 @@
+"""
+Test 'boards.tasks' file
+"""
+import json
+
+from boards import tasks
+from boards.issues import BoardIssue
+from boards.models import Board
+from boards.repositories import Repository
+
+
+def test_schedule(settings, mocker):
+    """Test `schedule` doesn't overwrite already scheduled tasks"""
+    settings.BOARDS_TASKS_DEBOUNCE = 5
+    redis = mocker.patch('boards.tasks.get_redis_connection').return_value
+    mocker.patch('boards.tasks.time.time', return_value=1000)
+
+    tasks.schedule(Board(pk=1), 'issue:7')
+    redis.zadd.assert_called_with(
+        tasks.QUEUE_KEY, {json.dumps(['board', 1, 'issue:7']): 1005},
+        nx=True,
+    )
+
+    tasks.schedule(Repository('owner/repo'), 'issues')
+    redis.zadd.assert_called_with(
+        tasks.QUEUE_KEY,
+        {json.dumps(['repository', 'owner/repo', 'issues']): 1005},
+        nx=True,
+    )
+
+
+def test_process_due(mocker):
+    """Test `process_due` only runs tasks it managed to claim"""
+    redis = mocker.patch('boards.tasks.get_redis_connection').return_value
+    redis.zrangebyscore.return_value = [
+        json.dumps(['board', 1, 'pipelines']),
+        json.dumps(['board', 2, 'pipelines']),
+    ]
+    redis.zrem.side_effect = [1, 0]
+    mocker.patch('boards.tasks.close_old_connections')
+    run = mocker.patch('boards.tasks.run')
+
+    assert tasks.process_due() == 1
+    run.assert_called_once_with('board', 1, 'pipelines')
+
+
+def test_run(mocker):
+    """Test `run` refreshes passed board or repository resource"""
+    board = mocker.Mock(spec=Board)
+    mocker.patch.object(Board.objects, 'get', return_value=board)
+    issues = mocker.patch.object(Repository, 'issues')
+    issue = mocker.patch.object(Repository, 'issue')
+    zenhub_board = mocker.patch.object(Repository, 'zenhub_board')
+    invalidate_cache = mocker.patch.object(BoardIssue, 'invalidate_cache')
+    mocker.patch.object(Board.objects, 'filter', return_value=[board, board])
+    publish = mocker.patch('boards.events.publish')
+
+    tasks.run('repository', 'owner/repo', 'issues')
+    issues.assert_called_once_with(refresh=True)
+
+    tasks.run('repository', 'owner/repo', 'issue:7')
+    issue.assert_called_once_with(7, refresh=True)
+    assert invalidate_cache.call_count == 2
+    publish.assert_called_with(board, 'issue', number=7)
+
+    tasks.run('repository', 'owner/repo', 'zenhub_board')
+    zenhub_board.assert_called_once_with(
+        repository_id=board.github_repository_id, refresh=True,
+    )
+    board.invalidate_cache.assert_called_with('pipelines')
+
+    tasks.run('board', 1, 'pipelines')
+    board.pipelines.assert_called_once_with(refresh=True)
+    publish.assert_called_with(board, 'pipelines')
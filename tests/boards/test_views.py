@@ -0,0 +1,156 @@
+"""
+Test 'boards.views' file
+"""
+from django.contrib.auth.models import User
+
+from boards.issues import BoardIssue
+from boards.models import Board
+from boards.repositories import Repository
+
+
+class TestBoardDetailView:
+    """
+    Test 'boards.views.BoardDetailView'
+    """
+    def test_fragment_cache(self, client, mocker, locmem_cache):
+        """Test only issue cards that changed are rendered again"""
+        Board.objects.bulk_create([
+            Board(name='Board', slug='board', github_repository='owner/repo'),
+        ])
+        User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        client.login(username='admin', password='pass')
+
+        mocker.patch.object(Repository, 'gh_repo', mocker.Mock())
+        mocker.patch.object(Board, '_get_pipelines', return_value=[
+            {'name': 'Backlog', 'issues': [
+                {'number': 1, 'title': 'Issue #1'},
+                {'number': 2, 'title': 'Issue #2'},
+            ]},
+        ])
+        get_details = mocker.patch.object(
+            BoardIssue, '_get_details', autospec=True,
+            side_effect=lambda issue: {
+                'number': issue.issue_number, 'comments': [], 'progress': 1,
+            },
+        )
+        issue_details = mocker.spy(BoardIssue, 'details')
+
+        response = client.get('/boards/board/')
+        assert response.status_code == 200
+        assert response.content.count(b'>100%<') == 2
+        assert get_details.call_count == 2
+
+        # Everything is rendered from cache
+        response = client.get('/boards/board/')
+        assert response.content.count(b'>100%<') == 2
+        assert get_details.call_count == 2
+
+        # Only the changed issue is rendered again
+        board = Board.objects.get(slug='board')
+        BoardIssue(board, 2).invalidate_cache()
+        get_details.side_effect = lambda issue: {
+            'number': issue.issue_number, 'comments': [], 'progress': 0.5,
+        }
+
+        response = client.get('/boards/board/')
+        assert response.content.count(b'>100%<') == 1
+        assert response.content.count(b'>50%<') == 1
+        assert get_details.call_count == 3
+        assert issue_details.call_count == 0
+
+    def test_expired_fragments(self, client, mocker, locmem_cache):
+        """Test issue details of expired issue cards are fetched at once"""
+        Board.objects.bulk_create([
+            Board(name='Board', slug='board', github_repository='owner/repo'),
+        ])
+        User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        client.login(username='admin', password='pass')
+
+        mocker.patch.object(Repository, 'gh_repo', mocker.Mock())
+        mocker.patch.object(Board, '_get_pipelines', return_value=[
+            {'name': 'Backlog', 'issues': [
+                {'number': 1, 'title': 'Issue #1'},
+                {'number': 2, 'title': 'Issue #2'},
+            ]},
+        ])
+        mocker.patch.object(
+            BoardIssue, '_get_details', autospec=True,
+            side_effect=lambda issue: {
+                'number': issue.issue_number, 'comments': [], 'progress': 1,
+            },
+        )
+
+        response = client.get('/boards/board/')
+        assert response.content.count(b'>100%<') == 2
+
+        # Rendered fragments expire before the data they were rendered from
+        for key in list(locmem_cache._cache):
+            if 'template.cache.' in key:
+                locmem_cache.delete(key.split(':', 2)[2])
+
+        issue_details = mocker.spy(BoardIssue, 'details')
+        details_many = mocker.spy(BoardIssue, 'details_many')
+        fragment_cache = mocker.patch(
+            'boards.views.get_fragment_cache',
+        ).return_value = mocker.Mock(wraps=locmem_cache)
+
+        response = client.get('/boards/board/')
+        assert response.content.count(b'>100%<') == 2
+        assert issue_details.call_count == 0
+        assert details_many.call_count == 1
+        assert sorted(details_many.call_args[0][1]) == [1, 2]
+
+        # Fragments are only read and cached in batches (pipelines first)
+        assert [call[0] for call in fragment_cache.method_calls] == [
+            'get_many', 'get_many', 'set_many',
+        ]
+        assert len(fragment_cache.set_many.call_args[0][0]) == 3
+
+        # Nothing is fetched when everything is rendered from cache
+        fragment_cache.reset_mock()
+        response = client.get('/boards/board/')
+        assert response.content.count(b'>100%<') == 2
+        assert details_many.call_count == 1
+        assert [call[0] for call in fragment_cache.method_calls] == [
+            'get_many',
+        ]
+
+
+class TestBoardIssueCardView:
+    """
+    Test 'boards.views.BoardIssueCardView'
+    """
+    def test_issue_card(self, client, mocker, locmem_cache):
+        """Test a single issue card is rendered like on the board page"""
+        Board.objects.bulk_create([
+            Board(name='Board', slug='board', github_repository='owner/repo'),
+        ])
+        User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        client.login(username='admin', password='pass')
+
+        mocker.patch.object(Repository, 'gh_repo', mocker.Mock())
+        mocker.patch.object(Board, '_get_pipelines', return_value=[
+            {'name': 'Backlog', 'issues': [
+                {'number': 1, 'title': 'Issue #1'},
+                {'number': 2, 'title': 'Issue #2'},
+            ]},
+        ])
+        mocker.patch.object(
+            BoardIssue, '_get_details', autospec=True,
+            side_effect=lambda issue: {
+                'number': issue.issue_number, 'comments': [], 'progress': 1,
+            },
+        )
+
+        response = client.get('/boards/board/')
+        assert b'data-pipelines-version="' in response.content
+
+        response = client.get('/boards/board/issues/2/card/')
+        assert response.status_code == 200
+        assert response.content.count(b'data-issue-number="2"') == 1
+        assert b'Issue #2' in response.content
+        assert b'card issue mt-3' in response.content
+        assert b'>100%<' in response.content
+
+        response = client.get('/boards/board/issues/3/card/')
+        assert response.status_code == 404
@@ -0,0 +1,59 @@
+"""
+Shared pytest fixtures
+"""
+import time
+import uuid
+
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+import pytest
+
+
+class LocMemLock:
+    """
+    Minimal `redis.lock.Lock` imitation, backed by local memory cache.
+    """
+    def __init__(self, cache, name, timeout=None, sleep=0.1):
+        self.cache = cache
+        self.name = name
+        self.timeout = timeout
+        self.sleep = sleep
+        self.token = uuid.uuid4().hex
+
+    def acquire(self, blocking=True, blocking_timeout=None):
+        start = time.monotonic()
+        while not self.cache.add(self.name, self.token, self.timeout):
+            if not blocking:
+                return False
+            timed_out = time.monotonic() > start + (blocking_timeout or 0)
+            if blocking_timeout and timed_out:
+                return False
+            time.sleep(self.sleep)
+
+        return True
+
+    def release(self):
+        if self.cache.get(self.name) == self.token:
+            self.cache.delete(self.name)
+
+
+@pytest.fixture
+def locmem_cache(settings, monkeypatch, db):
+    """Use local memory cache (with Redis like locks) instead of Redis"""
+    # In process cache needs Redis pub/sub
+    settings.BOARDS_LOCAL_CACHE_MAX_ENTRIES = 0
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+    }
+    monkeypatch.setattr(
+        LocMemCache, 'lock',
+        lambda cache, name, **kwargs: LocMemLock(cache, name, **kwargs),
+        raising=False,
+    )
+
+    yield caches['default']
+
+    caches['default'].clear()
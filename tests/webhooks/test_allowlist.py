@@ -0,0 +1,77 @@
+"""
+Test 'webhooks.allowlist' file
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from ipaddress import ip_address
+
+import pytest
+
+from webhooks.allowlist import GitHubHooksAllowlist, SubnetIndex
+
+
+class TestSubnetIndex:
+    """
+    Test 'webhooks.allowlist.SubnetIndex'
+    """
+    @pytest.mark.parametrize('ip, expected', [
+        ('192.30.252.0', True),
+        ('192.30.255.255', True),
+        ('192.30.251.255', False),
+        ('185.199.108.1', True),
+        ('185.199.112.1', False),
+        ('140.82.112.7', True),
+        ('2620:112:3000::1', True),
+        ('2620:112:4000::1', False),
+        ('::ffff:c01e:fc00', False),
+    ])
+    def test_contains(self, ip, expected):
+        """Test `SubnetIndex` IP addresses lookup"""
+        index = SubnetIndex([
+            '192.30.252.0/22', '185.199.108.0/22', '140.82.112.0/20',
+            '140.82.112.7/32', '2620:112:3000::/44',
+        ])
+
+        assert (ip_address(ip) in index) is expected
+
+
+class TestGitHubHooksAllowlist:
+    """
+    Test 'webhooks.allowlist.GitHubHooksAllowlist'
+    """
+    def test_contains(self, mocker, locmem_cache):
+        """Test GitHub meta API endpoint is called only once"""
+        meta = mocker.patch('webhooks.allowlist.github_api.meta')
+        meta.return_value = {'hooks': ['192.30.252.0/22']}
+        allowlist = GitHubHooksAllowlist()
+
+        assert ip_address('192.30.252.1') in allowlist
+        assert ip_address('127.0.0.1') not in allowlist
+        assert meta.call_count == 1
+
+    def test_concurrent_refresh(self, mocker, locmem_cache):
+        """Test concurrent refreshes of expired subnets collapse into one"""
+        meta = mocker.patch(
+            'webhooks.allowlist.github_api.meta',
+            side_effect=lambda: time.sleep(0.2) or {'hooks': []},
+        )
+        allowlist = GitHubHooksAllowlist()
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(executor.map(
+                lambda ip: ip in allowlist, [ip_address('192.30.252.1')] * 3,
+            ))
+
+        assert results == [False] * 3
+        assert meta.call_count == 1
+
+    def test_last_good_copy(self, settings, mocker, locmem_cache):
+        """Test last good copy is used when GitHub API call fails"""
+        settings.GITHUB_HOOKS_REFRESH_INTERVAL = 0
+        meta = mocker.patch('webhooks.allowlist.github_api.meta')
+        meta.return_value = {'hooks': ['192.30.252.0/22']}
+        assert ip_address('192.30.252.1') in GitHubHooksAllowlist()
+
+        meta.side_effect = Exception
+        locmem_cache.delete(GitHubHooksAllowlist.cache_key)
+        assert ip_address('192.30.252.1') in GitHubHooksAllowlist()
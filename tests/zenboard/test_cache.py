@@ -0,0 +1,47 @@
+"""
+Test 'zenboard.cache' file
+"""
+import pickle
+from datetime import datetime, timezone
+
+from zenboard.cache import MsgPackSerializer, ZlibCompressor
+
+
+class TestMsgPackSerializer:
+    """
+    Test 'zenboard.cache.MsgPackSerializer'
+    """
+    def test_round_trip(self):
+        """Test board cache values survive serialization"""
+        serializer = MsgPackSerializer({})
+        value = {
+            'value': {
+                7: {'number': 7, 'labels': ['client']},
+                'updated_at': datetime(2017, 11, 1, tzinfo=timezone.utc),
+            },
+            'stale_at': None,
+        }
+
+        assert serializer.loads(serializer.dumps(value)) == value
+
+        # Unsupported types are pickled
+        assert serializer.dumps({1, 2})[:1] == serializer.pickle_marker
+        assert serializer.loads(serializer.dumps({1, 2})) == {1, 2}
+
+        # Values cached with the pickle serializer can still be read
+        assert serializer.loads(pickle.dumps(value)) == value
+
+
+class TestZlibCompressor:
+    """
+    Test 'zenboard.cache.ZlibCompressor'
+    """
+    def test_min_length(self):
+        """Test only values above the size threshold are compressed"""
+        compressor = ZlibCompressor({'COMPRESS_MIN_LENGTH': 100})
+
+        assert compressor.compress(b'a' * 99) == b'a' * 99
+
+        compressed = compressor.compress(b'a' * 100)
+        assert len(compressed) < 100
+        assert compressor.decompress(compressed) == b'a' * 100
@@ -0,0 +1,120 @@
+"""
+Test 'zenboard.github' file
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from github3 import GitHub
+from github3.repos import Repository
+
+import pytest
+
+from zenboard.github import ConditionalRequestsAdapter, ETagStore
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    """
+    Minimal GitHub API imitation that serves a paginated issue list and
+    supports conditional requests.
+    """
+    issues = [
+        {
+            'number': number,
+            'title': 'Issue #{}'.format(number),
+            'html_url': 'https://github.com/owner/repo/issues/{}'.format(
+                number,
+            ),
+            'labels_url': '',
+            'labels': [],
+            'user': {'login': 'octocat'},
+        }
+        for number in range(1, 4)
+    ]
+
+    def do_GET(self):
+        self.server.requests.append(self.headers)
+
+        query = parse_qs(urlparse(self.path).query)
+        page = int(query.get('page', [1])[0])
+        etag = '"page-{}"'.format(page)
+
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('X-RateLimit-Remaining', '5000')
+            self.end_headers()
+            return
+
+        self.server.full_responses += 1
+
+        body = json.dumps(self.issues[page - 1:page]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('X-RateLimit-Remaining', '4999')
+        if page < len(self.issues):
+            self.send_header(
+                'Link', '<http://{}:{}/repos/owner/repo/issues?page={}>; '
+                        'rel="next"'.format(*self.server.server_address,
+                                            page + 1),
+            )
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_github():
+    """Run a fake GitHub API server in a background thread"""
+    server = HTTPServer(('127.0.0.1', 0), FakeGitHubHandler)
+    server.requests = list()
+    server.full_responses = 0
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+class TestConditionalRequestsAdapter:
+    """
+    Test 'zenboard.github.ConditionalRequestsAdapter'
+    """
+    def test_conditional_requests(self, fake_github, locmem_cache):
+        """Test unchanged responses are reused on '304 Not Modified'"""
+        github_api = GitHub()
+        github_api._session.mount(
+            'http://', ConditionalRequestsAdapter(ETagStore(locmem_cache)),
+        )
+        gh_repo = Repository(
+            {'url': 'http://{}:{}/repos/owner/repo'.format(
+                *fake_github.server_address
+            )},
+            github_api,
+        )
+
+        issues = [issue.title for issue in gh_repo.iter_issues()]
+        assert issues == ['Issue #1', 'Issue #2', 'Issue #3']
+        assert fake_github.full_responses == 3
+        assert not any(r.get('If-None-Match') for r in fake_github.requests)
+
+        # Everything is reused, including pagination
+        iterator = gh_repo.iter_issues()
+        assert [issue.title for issue in iterator] == issues
+        assert fake_github.full_responses == 3
+        assert all(
+            r.get('If-None-Match') for r in fake_github.requests[3:]
+        )
+        assert len(fake_github.requests) == 6
+
+        # Fresh rate limit data is used
+        assert iterator.last_response.headers['X-RateLimit-Remaining'] == (
+            '5000'
+        )
@@ -0,0 +1,50 @@
+"""
+Test 'zenboard.utils' file
+"""
+import threading
+import time
+from concurrent import futures
+
+import pytest
+
+from django.conf import settings
+
+from zenboard.utils import call_concurrently, upstream_executor, zenhub_api
+
+
+def test_call_concurrently():
+    """Test `call_concurrently` calls functions concurrently"""
+    barrier = threading.Barrier(2, timeout=1)
+
+    def wait(value):
+        barrier.wait()
+        return value
+
+    # Both functions have to be running at the same time to pass the barrier
+    assert call_concurrently(lambda: wait(1), lambda: wait(2)) == [1, 2]
+
+    with pytest.raises(ZeroDivisionError):
+        call_concurrently(lambda: 1, lambda: 1 / 0)
+
+
+def test_call_concurrently_timeout(settings):
+    """Test `call_concurrently` doesn't wait for too long"""
+    settings.UPSTREAM_TIMEOUT = 0.1
+
+    with pytest.raises(futures.TimeoutError):
+        call_concurrently(lambda: time.sleep(1))
+
+
+def test_call_concurrently_nested():
+    """Test nested `call_concurrently` calls don't wait for pool threads"""
+    def nested():
+        return call_concurrently(threading.current_thread, lambda: 2)
+
+    current_thread, value = upstream_executor.submit(nested).result(1)
+    assert current_thread.name.startswith('upstream')
+    assert value == 2
+
+
+def test_zenhub_api_rate_limit_wait():
+    """Test ZenHub API rate limit waits end before upstream calls time out"""
+    assert zenhub_api.max_rate_limit_wait < settings.UPSTREAM_TIMEOUT
@@ -0,0 +1,200 @@
+"""
+Test 'zenhub_api.api' file
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+import pytest
+import redis
+
+from zenhub_api.api import ZenHubAPI, ZenHubAPIError, ZenHubAPIRateLimitError
+from zenhub_api.ratelimit import RateLimiter, RedisRateLimiter
+
+
+class StubZenHubHandler(BaseHTTPRequestHandler):
+    """
+    Minimal ZenHub API imitation that serves queued responses.
+    """
+    def do_GET(self):
+        self.server.requests.append(time.time())
+
+        status, headers, body = self.server.responses.pop(0)
+        if status is None:
+            # Never respond in time
+            time.sleep(body)
+            return
+
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        for header, value in headers.items():
+            self.send_header(header, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubZenHubServer(ThreadingMixIn, HTTPServer):
+    """
+    Stub ZenHub API server, which handles each request in a separate thread.
+    """
+    daemon_threads = True
+
+
+@pytest.fixture
+def stub_zenhub():
+    """Run a stub ZenHub API server in a background thread"""
+    server = StubZenHubServer(('127.0.0.1', 0), StubZenHubHandler)
+    server.requests = list()
+    server.responses = list()
+    server.api_url = 'http://{}:{}/p1/'.format(*server.server_address)
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+BOARD = {'pipelines': [{'name': 'Backlog', 'issues': []}]}
+
+
+class TestZenHubAPI:
+    """
+    Test 'zenhub_api.api.ZenHubAPI'
+    """
+    def test_retries(self, stub_zenhub):
+        """Test server errors are retried and non JSON errors are handled"""
+        zenhub_api = ZenHubAPI(
+            token='token', api_url=stub_zenhub.api_url, max_retries=2,
+            backoff_factor=0.01,
+        )
+
+        stub_zenhub.responses = [
+            (502, {}, b'<html>Bad Gateway</html>'),
+            (503, {}, {'message': 'Unavailable'}),
+            (200, {}, BOARD),
+        ]
+        assert zenhub_api.get_board(1) == BOARD['pipelines']
+
+        stub_zenhub.responses = [(500, {}, b'<html>Oops</html>')] * 3
+        with pytest.raises(ZenHubAPIError, match='500: <html>Oops</html>'):
+            zenhub_api.get_board(1)
+
+        # Client errors aren't retried
+        stub_zenhub.responses = [(404, {}, {'message': 'Not found'})]
+        with pytest.raises(ZenHubAPIError, match='Not found'):
+            zenhub_api.get_board(1)
+
+        assert len(stub_zenhub.requests) == 7
+        assert zenhub_api.stats == {
+            'requests': 7, 'retries': 4, 'errors': 2, 'rate_limit_wait': 0,
+        }
+
+    def test_timeout(self, stub_zenhub):
+        """Test requests that time out are retried"""
+        zenhub_api = ZenHubAPI(
+            token='token', api_url=stub_zenhub.api_url, timeout=0.1,
+            max_retries=1, backoff_factor=0.01,
+        )
+
+        stub_zenhub.responses = [(None, {}, 0.5), (200, {}, BOARD)]
+        assert zenhub_api.get_board(1) == BOARD['pipelines']
+
+        stub_zenhub.responses = [(None, {}, 0.5), (None, {}, 0.5)]
+        with pytest.raises(ZenHubAPIError, match="Couldn't connect"):
+            zenhub_api.get_board(1)
+
+    def test_rate_limit(self, stub_zenhub):
+        """Test requests wait for ZenHub API rate limit reset"""
+        zenhub_api = ZenHubAPI(
+            token='token', api_url=stub_zenhub.api_url, backoff_factor=0.01,
+            max_rate_limit_wait=1,
+        )
+
+        reset_at = time.time() + 0.3
+        stub_zenhub.responses = [
+            (429, {
+                'X-RateLimit-Limit': '100',
+                'X-RateLimit-Used': '100',
+                'X-RateLimit-Reset': str(reset_at),
+            }, {'message': 'API Rate limit exceeded'}),
+            (200, {}, BOARD),
+        ]
+        assert zenhub_api.get_board(1) == BOARD['pipelines']
+        assert stub_zenhub.requests[1] >= reset_at
+        assert zenhub_api.stats['rate_limit_errors'] == 1
+        assert zenhub_api.stats['rate_limit_wait'] > 0
+
+        # We don't wait for longer than allowed
+        stub_zenhub.responses = [
+            (200, {
+                'X-RateLimit-Limit': '100',
+                'X-RateLimit-Used': '100',
+                'X-RateLimit-Reset': str(time.time() + 60),
+            }, BOARD),
+        ]
+        zenhub_api.get_board(1)
+        with pytest.raises(ZenHubAPIRateLimitError):
+            zenhub_api.get_board(1)
+        assert len(stub_zenhub.requests) == 3
+
+
+class TestRateLimiter:
+    """
+    Test 'zenhub_api.ratelimit.RateLimiter'
+    """
+    def test_acquire(self):
+        """Test requests are throttled after using up the limit"""
+        rate_limiter = RateLimiter(limit=10, period=1)
+
+        assert all(rate_limiter.acquire() == 0 for _ in range(10))
+        assert rate_limiter.acquire(max_wait=0.01) is None
+        assert 0 < rate_limiter.acquire() <= 0.1
+
+        # Bucket is synced with ZenHub API rate limit state
+        rate_limiter = RateLimiter(limit=10, period=1)
+        rate_limiter.update({
+            'X-RateLimit-Limit': '10', 'X-RateLimit-Used': '9',
+        })
+        assert rate_limiter.take(time.time()) == 0
+        assert rate_limiter.take(time.time()) > 0
+
+
+class TestRedisRateLimiter:
+    """
+    Test 'zenhub_api.ratelimit.RedisRateLimiter'
+    """
+    def test_shared_bucket(self):
+        """Test rate limit is shared between rate limiter instances"""
+        client = redis.StrictRedis()
+        try:
+            client.ping()
+        except redis.ConnectionError:
+            pytest.skip("Redis isn't available")
+
+        key = 'test:zenhub_api:ratelimit'
+        client.delete(key)
+        rate_limiters = [
+            RedisRateLimiter(client, key=key, limit=10, period=1)
+            for _ in range(2)
+        ]
+
+        assert all(
+            rate_limiters[i % 2].acquire() == 0 for i in range(10)
+        )
+        assert rate_limiters[0].take(time.time()) > 0
+
+        rate_limiters[1].sync(time.time(), 0, time.time() + 60)
+        assert rate_limiters[0].take(time.time()) > 59
+
+        client.delete(key)